@@ -6,9 +6,15 @@ from tkinter import ttk
 from tkinter import messagebox
 from typing import Protocol
 
+from launcher_state import LauncherState
+
+
 LARGE_FONT = ("Verdana", 12)
 DEFAULT_APPLICATION_DIRNAME = ".temp_github_app"
 DEFAULT_CONFIG_FILENAME = "config.json"
+DEFAULT_CACHE_DIRNAME = ".launcher_cache"
+# Own launcher state record, app.py signs its record with the install slots as well
+STATE_VARIANT = "views"
 
 
 class ApplicationControllerProtocol(Protocol):
@@ -168,6 +174,13 @@ class ApplicationController(tk.Tk):
         self.root_dir = os.path.dirname(os.path.abspath(__file__))
         self.application_dir = os.path.join(self.root_dir, DEFAULT_APPLICATION_DIRNAME)
         self.config_path = os.path.join(self.application_dir, DEFAULT_CONFIG_FILENAME)
+        self.state = LauncherState(
+            LauncherState.get_state_path(
+                cache_dir=os.path.join(self.root_dir, DEFAULT_CACHE_DIRNAME),
+                application_dir=self.application_dir,
+                variant=STATE_VARIANT,
+            )
+        )
 
         self.current_view_class: AbstractView | None = None
 
@@ -219,11 +232,12 @@ class ApplicationController(tk.Tk):
 
         try:
             with open(self.config_path, "r") as f:
-                return json.load(f)
+                data = json.load(f)
         except (json.JSONDecodeError, FileNotFoundError, PermissionError, IOError):
             return {}
 
-        return {}
+        # A config that is valid JSON but not an object counts as missing
+        return data if isinstance(data, dict) else {}
 
     def get_initial_view_class(self) -> AbstractView:
 
@@ -235,19 +249,19 @@ class ApplicationController(tk.Tk):
         available_views: list[AbstractView] = list(self.available_views_dict.keys())
 
         # Conditional checks to determine initial page
-        app_dir_exists = os.path.exists(self.config_path)  # ./.app/config.json
-        local_config_dict = self.get_local_config_dict()
-        local_config_file_exists = os.path.exists(self.config_path)
-        local_config_is_empty = not local_config_dict
-        local_config_has_url = "github_url" in local_config_dict
+        # The state record answers them with a single stat of ./.app/config.json, the config is only read when it changed
+        state_sources = {"config": self.config_path}
+        state_record = self.state.load()
+        if not self.state.is_valid(state_record, state_sources):
+            local_config_dict = self.get_local_config_dict()
+            state_record = self.state.save(
+                state_sources,
+                github_url=local_config_dict.get("github_url"),
+                installed_version=local_config_dict.get("version"),
+            )
 
         # Note that 'needs_user_url' and 'ready_to_load' are symmetrical.
-        needs_user_url = (
-            not app_dir_exists
-            or not local_config_file_exists
-            or local_config_is_empty
-            or not local_config_has_url
-        )
+        needs_user_url = not state_record.get("github_url")
         ready_to_load = not needs_user_url
 
         # Selection of initial view
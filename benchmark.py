@@ -0,0 +1,2008 @@
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+import platform
+import py_compile
+import random
+import shutil
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import (
+    BaseHTTPRequestHandler,
+    SimpleHTTPRequestHandler,
+    ThreadingHTTPServer,
+)
+from collections import deque
+from pathlib import Path
+from typing import Callable
+
+from startup_profiler import PROFILE_ENV_VAR
+from launcher import (
+    APPLICATION_DIR,
+    BUILD_MODES,
+    CLONE_STRATEGIES,
+    DEFAULT_BRANCH,
+    DEFAULT_CONFIG_FILENAME,
+    DEFAULT_MANIFEST_FILENAME,
+    FINAL_PHASES,
+    ApplicationModel,
+    BackgroundWorker,
+    BuildCacheClient,
+    HttpTransport,
+    PipelineCancelled,
+    RangeDownloader,
+    SourceEnvironments,
+    Wheelhouse,
+    is_shallow_repo,
+    read_json_file,
+)
+
+BENCHMARK_NAMES = [
+    "clone",
+    "fast_path",
+    "imports",
+    "e2e",
+    "builds",
+    "wheelhouse",
+    "rollback",
+    "range_download",
+    "transport",
+    "manifest",
+    "build_cache",
+    "mirror",
+]
+LAUNCHER_MODULES = [
+    "app.py",
+    "launcher.py",
+    "launcher_window.py",
+    "launcher_state.py",
+    "startup_profiler.py",
+    "tracing.py",
+]
+FAST_PATH_TARGET_MS = 100
+
+# Import cost budget of the no-build launch path, heavy modules must not be imported at all
+IMPORT_BUDGET_MS = 60
+HEAVY_MODULES = ["PyInstaller", "requests", "urllib3", "tkinter", "_tkinter"]
+# Must not be in sys.modules once an up to date launch returns, checked without the profiler so it doesn't depend on timings
+FAST_PATH_EXCLUDED_MODULES = [*HEAVY_MODULES, "launcher_window"]
+# Runs app.py in the launcher copy like `python app.py` does, then writes the names of all loaded modules to argv[2]
+ENTRY_MODULES_SCRIPT = (
+    "import json, runpy, sys\n"
+    "app_path, modules_path = sys.argv[1:]\n"
+    "sys.argv = [app_path]\n"
+    "runpy.run_path(app_path, run_name='__main__')\n"
+    "with open(modules_path, 'w') as f:\n"
+    "    json.dump(sorted(sys.modules), f)\n"
+)
+
+# Range downloads, every range takes several responses when connections drop after RANGE_BENCH_DROP_AFTER bytes
+RANGE_BENCH_SIZE = 4 * 1024 * 1024
+RANGE_BENCH_PART_SIZE = 512 * 1024
+RANGE_BENCH_DROP_AFTER = 100 * 1024
+RANGE_BENCH_MAX_RETRIES = 2
+
+# HTTP transport retries, measured waits may exceed the expected ones by TRANSPORT_BENCH_SLACK_S
+TRANSPORT_BENCH_MAX_RETRIES = 3
+TRANSPORT_BENCH_BACKOFF_BASE_S = 0.05
+TRANSPORT_BENCH_BACKOFF_MAX_S = 3
+TRANSPORT_BENCH_READ_TIMEOUT_S = 0.3
+TRANSPORT_BENCH_SLACK_S = 0.25
+
+# Manifest delta updates, a sample app whose later versions only change its app file and config
+MANIFEST_BENCH_FILES = {
+    "lib/utils.py": "def greet(name):\n    return f'Hello {name}'\n",
+    "assets/data.bin": os.urandom(256 * 1024),
+}
+MANIFEST_BENCH_GITHUB_URL = "https://github.com/bench/bench_app"
+MANIFEST_BENCH_TTL_S = 300
+
+# Build cache, a small dist folder uploaded to and fetched from a local build_cache_server.py
+BUILD_CACHE_BENCH_FILES = {
+    "app": b"#!/bin/sh\necho bench app\n",
+    "_internal/data.bin": os.urandom(256 * 1024),
+}
+BUILD_CACHE_BENCH_TOKEN = "bench-token"
+BUILD_CACHE_BENCH_KEY = "bench-key"
+BUILD_CACHE_BENCH_MAX_BUILD_SIZE_MB = 1
+
+# End to end launch scenarios, run in order against the same install
+E2E_SCENARIOS = [
+    "first_install",
+    "up_to_date",
+    "version_bump",
+    "corrupt_config",
+    "missing_dist",
+    "offline",
+]
+E2E_GITHUB_URL = "https://github.com/bench/bench_app"
+E2E_RESULT_MARKER = "E2E_RESULT "
+
+# Sample app for the build benchmark, its dependencies (requests, tkinter and parts of the stdlib) dominate the build
+BUILD_BENCH_APP_FILES = {
+    "bench_app.py": "import bench_pkg.core\n\nprint(bench_pkg.core.describe())\n",
+    "bench_pkg/__init__.py": "",
+    "bench_pkg/core.py": (
+        "import asyncio, decimal, email.message, json, sqlite3, tkinter, xml.dom.minidom\n"
+        "import requests\n\n"
+        "from . import version\n\n\n"
+        "def describe():\n"
+        "    return f'bench app {version.VERSION} requests {requests.__version__}'\n"
+    ),
+    "bench_pkg/version.py": "VERSION = 1\n",
+}
+
+# Synthetic packages served by the local package index, {name: (requirements, payload size)}
+WHEELHOUSE_BENCH_PACKAGES = {
+    "bench-core": ([], 4 * 1024 * 1024),
+    "bench-net": (["bench-core"], 1024 * 1024),
+    "bench-ui": (["bench-core"], 2 * 1024 * 1024),
+    "bench-extra": ([], 1024 * 1024),
+}
+# Environments created in order, (scenario, requirements, whether the index is reachable, wheels it should download)
+WHEELHOUSE_SCENARIOS = [
+    ("cold", ["bench-net", "bench-ui"], True, 3),
+    ("new_requirement", ["bench-net", "bench-ui", "bench-extra"], True, 1),
+    ("offline", ["bench-net"], False, 0),
+]
+
+
+#! --- Helpers ---
+def create_synthetic_repo(
+    bare_dir: str, commits: int, blob_size: int, start_commit: int = 1
+):
+    """Create (or extend) a bare repo with a long synthetic history using `git fast-import`.
+
+    Every commit rewrites `src/app.py` and a random binary asset, which is the worst case for a full clone.
+
+    Args:
+        bare_dir (str): Path of the bare repo, it is created when it doesn't exist.
+        commits (int): Number of commits to add.
+        blob_size (int): Size in bytes of the binary asset written by every commit.
+        start_commit (int, optional): Number of the first commit, used when extending an existing repo. Defaults to 1.
+    """
+
+    if not os.path.isdir(bare_dir):
+        subprocess.run(
+            ["git", "init", "-q", "--bare", "-b", DEFAULT_BRANCH, bare_dir], check=True
+        )
+        # Like github.com, allow partial clones (--filter=blob:none)
+        subprocess.run(
+            ["git", "-C", bare_dir, "config", "uploadpack.allowFilter", "true"],
+            check=True,
+        )
+
+    stream = bytearray()
+    for number in range(start_commit, start_commit + commits):
+        message = f"Commit {number}".encode()
+        app_source = f"print('version {number}')\n".encode()
+        asset = os.urandom(blob_size)
+
+        stream += f"commit refs/heads/{DEFAULT_BRANCH}\n".encode()
+        stream += f"committer Bench <bench@example.com> {1700000000 + number} +0000\n".encode()
+        stream += f"data {len(message)}\n".encode() + message + b"\n"
+        if number > 1 and number == start_commit:
+            stream += f"from refs/heads/{DEFAULT_BRANCH}^0\n".encode()
+        stream += f"M 644 inline src/app.py\ndata {len(app_source)}\n".encode()
+        stream += app_source + b"\n"
+        stream += f"M 644 inline assets/data.bin\ndata {len(asset)}\n".encode()
+        stream += asset + b"\n"
+
+    subprocess.run(
+        ["git", "-C", bare_dir, "fast-import", "--quiet"],
+        input=bytes(stream),
+        check=True,
+    )
+
+
+def get_dir_size(path: str) -> int:
+    total = 0
+    for dir_path, _, filenames in os.walk(path):
+        for filename in filenames:
+            file_path = os.path.join(dir_path, filename)
+            if not os.path.islink(file_path):
+                total += os.path.getsize(file_path)
+    return total
+
+
+def print_results(title: str, results: list[dict]):
+    print(f"\n{title}")
+    columns = list(results[0].keys())
+    print(" | ".join(f"{c:>14}" for c in columns))
+    for result in results:
+        print(" | ".join(f"{str(result[c]):>14}" for c in columns))
+
+
+class RawGitHubServer:
+    """Local stand-in for raw.githubusercontent.com, serving files of the bare repos in `remotes_dir` and counting the bytes sent.
+
+    `/<owner>/<repo>/<branch>/<path>` is served from `git show <branch>:<path>` of `<remotes_dir>/<owner>/<repo>`, with the blob id as ETag.
+    """
+
+    def __init__(self, remotes_dir: str):
+        self.remotes_dir = remotes_dir
+        self.bytes_sent = 0
+        self.requests = 0
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                server.handle(self)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def start(self) -> str:
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        if self._thread.is_alive():
+            self.httpd.shutdown()
+            self.httpd.server_close()
+
+    def handle(self, request: BaseHTTPRequestHandler):
+        # i.e "/owner/repo/refs/heads/master/config.json" or "/owner/repo/master/config.json"
+        parts = request.path.split("?")[0].lstrip("/").split("/")
+        if parts[2:4] == ["refs", "heads"]:
+            parts = parts[:2] + parts[4:]
+
+        body = b""
+        status = 404
+        etag = None
+        if len(parts) >= 4:
+            owner, repo, branch = parts[:3]
+            path = "/".join(parts[3:])
+            git_dir = os.path.join(self.remotes_dir, owner, repo)
+            blob = subprocess.run(
+                ["git", "--git-dir", git_dir, "rev-parse", f"{branch}:{path}"],
+                capture_output=True,
+                text=True,
+            )
+            if blob.returncode == 0:
+                etag = f'"{blob.stdout.strip()}"'
+                if request.headers.get("If-None-Match") == etag:
+                    status = 304
+                else:
+                    status = 200
+                    body = subprocess.run(
+                        [
+                            "git",
+                            "--git-dir",
+                            git_dir,
+                            "cat-file",
+                            "blob",
+                            etag.strip('"'),
+                        ],
+                        capture_output=True,
+                        check=True,
+                    ).stdout
+
+        # Count before responding, the client may measure as soon as it has the response
+        with self._lock:
+            self.requests += 1
+            self.bytes_sent += len(body)
+
+        request.send_response(status)
+        if etag:
+            request.send_header("ETag", etag)
+        request.send_header("Content-Length", str(len(body)))
+        request.end_headers()
+        request.wfile.write(body)
+
+
+class PackageIndexServer:
+    """Local stand-in for a PEP 503 package index, serving `<index_dir>/simple/<name>/` and the wheels in `<index_dir>/files/`.
+
+    Like PyPI it publishes the metadata of every wheel separately (PEP 658), so resolving doesn't download wheels.
+    """
+
+    def __init__(self, index_dir: str):
+        self.index_dir = index_dir
+        self.files_sent = 0
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(SimpleHTTPRequestHandler):
+            def __init__(self, *args, **kwargs):
+                super().__init__(*args, directory=index_dir, **kwargs)
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                if self.path.endswith(".whl"):
+                    with server._lock:
+                        server.files_sent += 1
+                super().do_GET()
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.index_url = f"http://127.0.0.1:{self.httpd.server_address[1]}/simple"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def start(self) -> str:
+        self._thread.start()
+        return self.index_url
+
+    def stop(self):
+        if self._thread.is_alive():
+            self.httpd.shutdown()
+            self.httpd.server_close()
+
+
+class FaultyFileServer:
+    """Local HTTP server for in-memory files with ETag and Range support, injecting faults into its responses.
+
+    Like raw.githubusercontent.com a request with the current ETag in `If-None-Match` gets a 304. `faults` holds the faults
+    of the next requests, one per request: `("status", code, headers)` answers with that status
+    and no body, `("delay", seconds)` waits before answering normally. With `drop_after` set every response closes its
+    connection after that many bytes of its body. Every request is logged with its path, Range header, status and arrival
+    time, and the body bytes actually sent are counted.
+    """
+
+    def __init__(self, files: dict[str, bytes]):
+        self.files = files
+        self.faults: deque[tuple] = deque()
+        self.drop_after: int | None = None
+        self.log: list[dict] = []
+        self.bytes_sent = 0
+        self._lock = threading.Lock()
+
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                server.handle(self)
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def start(self) -> str:
+        self._thread.start()
+        return self.base_url
+
+    def stop(self):
+        if self._thread.is_alive():
+            self.httpd.shutdown()
+            self.httpd.server_close()
+
+    def handle(self, request: BaseHTTPRequestHandler):
+        entry = {
+            "path": request.path,
+            "range": request.headers.get("Range"),
+            "time": time.perf_counter(),
+        }
+        with self._lock:
+            fault = self.faults.popleft() if self.faults else None
+
+        if fault and fault[0] == "delay":
+            time.sleep(fault[1])
+        if fault and fault[0] == "status":
+            _, status, headers = fault
+            self.respond(request, entry, status, b"", headers)
+            return
+
+        body = self.files.get(request.path)
+        if body is None:
+            self.respond(request, entry, 404, b"")
+            return
+
+        etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+        if request.headers.get("If-None-Match") == etag:
+            self.respond(request, entry, 304, b"", {"ETag": etag})
+            return
+
+        headers = {"ETag": etag, "Accept-Ranges": "bytes"}
+        range_header = entry["range"]
+        if_range = request.headers.get("If-Range")
+        if range_header and (if_range is None or if_range == etag):
+            # Only the single "bytes=<start>-<end>" ranges the launcher sends
+            start, _, end = range_header.removeprefix("bytes=").partition("-")
+            start, end = int(start), min(int(end or len(body) - 1), len(body) - 1)
+            headers["Content-Range"] = f"bytes {start}-{end}/{len(body)}"
+            self.respond(request, entry, 206, body[start : end + 1], headers)
+        else:
+            self.respond(request, entry, 200, body, headers)
+
+    def respond(
+        self,
+        request: BaseHTTPRequestHandler,
+        entry: dict,
+        status: int,
+        body: bytes,
+        headers: dict[str, str] | None = None,
+    ):
+        sent = body if self.drop_after is None else body[: self.drop_after]
+        with self._lock:
+            self.log.append({**entry, "status": status})
+            self.bytes_sent += len(sent)
+
+        try:
+            request.send_response(status)
+            for name, value in (headers or {}).items():
+                request.send_header(name, value)
+            request.send_header("Content-Length", str(len(body)))
+            request.end_headers()
+            request.wfile.write(sent)
+            if len(sent) < len(body):
+                # The client sees the connection close before Content-Length bytes arrived
+                request.wfile.flush()
+                request.connection.shutdown(socket.SHUT_RDWR)
+                request.close_connection = True
+        except (BrokenPipeError, ConnectionResetError):
+            # The client already gave up on a delayed response
+            request.close_connection = True
+
+
+def create_package_index(index_dir: str, packages: dict[str, tuple[list[str], int]]):
+    """Write a pure Python wheel and its metadata file per package, with incompressible payloads of the given sizes, and a simple index of them."""
+
+    import hashlib
+    import zipfile
+
+    files_dir = os.path.join(index_dir, "files")
+    os.makedirs(files_dir)
+    for name, (requirements, size) in packages.items():
+        module = name.replace("-", "_")
+        dist_info = f"{module}-1.0.dist-info"
+        wheel_name = f"{module}-1.0-py3-none-any.whl"
+        metadata = f"Metadata-Version: 2.1\nName: {name}\nVersion: 1.0\n"
+        metadata += "".join(f"Requires-Dist: {r}\n" for r in requirements)
+        files = {
+            f"{module}/__init__.py": "VERSION = '1.0'\n",
+            f"{module}/payload.bin": os.urandom(size),
+            f"{dist_info}/METADATA": metadata,
+            f"{dist_info}/WHEEL": "Wheel-Version: 1.0\nGenerator: benchmark\nRoot-Is-Purelib: true\nTag: py3-none-any\n",
+        }
+        files[f"{dist_info}/RECORD"] = "".join(f"{path},,\n" for path in files)
+        files[f"{dist_info}/RECORD"] += f"{dist_info}/RECORD,,\n"
+
+        wheel_path = os.path.join(files_dir, wheel_name)
+        with zipfile.ZipFile(wheel_path, "w") as wheel:
+            for path, content in files.items():
+                wheel.writestr(path, content)
+        with open(wheel_path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        with open(f"{wheel_path}.metadata", "w") as f:
+            f.write(metadata)
+        metadata_digest = hashlib.sha256(metadata.encode()).hexdigest()
+
+        project_dir = os.path.join(index_dir, "simple", name)
+        os.makedirs(project_dir)
+        with open(os.path.join(project_dir, "index.html"), "w") as f:
+            f.write(
+                f'<a href="../../files/{wheel_name}#sha256={digest}" '
+                f'data-dist-info-metadata="sha256={metadata_digest}">{wheel_name}</a>\n'
+            )
+
+
+def publish_bench_app_version(work_dir: str, bare_dir: str, version: int):
+    """Commit a new version of a tiny app to `work_dir` and push it to the bare repo, creating both on the first call."""
+
+    if not os.path.isdir(work_dir):
+        subprocess.run(
+            ["git", "init", "-q", "--bare", "-b", DEFAULT_BRANCH, bare_dir], check=True
+        )
+        subprocess.run(
+            ["git", "init", "-q", "-b", DEFAULT_BRANCH, work_dir], check=True
+        )
+        subprocess.run(
+            ["git", "-C", work_dir, "remote", "add", "origin", bare_dir], check=True
+        )
+
+    config = {
+        "version": version,
+        "app_file": "bench_app.py",
+        "github_url": E2E_GITHUB_URL,
+    }
+    with open(os.path.join(work_dir, DEFAULT_CONFIG_FILENAME), "w") as f:
+        json.dump(config, f)
+    with open(os.path.join(work_dir, "bench_app.py"), "w") as f:
+        f.write(f"print('bench app version {version}')\n")
+
+    git = [
+        "git",
+        "-C",
+        work_dir,
+        "-c",
+        "user.name=Bench",
+        "-c",
+        "user.email=bench@example.com",
+    ]
+    subprocess.run([*git, "add", "-A"], check=True)
+    subprocess.run([*git, "commit", "-q", "-m", f"Version {version}"], check=True)
+    subprocess.run([*git, "push", "-q", "origin", DEFAULT_BRANCH], check=True)
+
+
+def get_git_remote_env(remotes_dir: str) -> dict:
+    """Environment that makes git fetch `https://github.com/<owner>/<repo>` from `<remotes_dir>/<owner>/<repo>` instead."""
+    return {
+        **os.environ,
+        "GIT_CONFIG_COUNT": "1",
+        "GIT_CONFIG_KEY_0": f"url.{Path(remotes_dir).as_uri()}/.insteadOf",
+        "GIT_CONFIG_VALUE_0": "https://github.com/",
+        "GIT_TERMINAL_PROMPT": "0",
+    }
+
+
+def get_launcher_commit() -> str | None:
+    result = subprocess.run(
+        ["git", "-C", os.path.dirname(os.path.abspath(__file__)), "rev-parse", "HEAD"],
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+def run_pipeline_headless(application_dir: str, raw_base_url: str) -> dict:
+    """Run the update pipeline the way `ApplicationController` does, on a `BackgroundWorker` draining its events, without Tk.
+
+    Runs in a child process started by `benchmark_e2e`, so CPU time, peak RSS and subprocess count belong to this launch only.
+    """
+
+    import resource
+
+    subprocess_count = [0]
+    popen_init = subprocess.Popen.__init__
+
+    def counting_popen_init(self, *args, **kwargs):
+        subprocess_count[0] += 1
+        popen_init(self, *args, **kwargs)
+
+    subprocess.Popen.__init__ = counting_popen_init
+
+    model = ApplicationModel(
+        application_dir=application_dir,
+        github_url=E2E_GITHUB_URL,
+        raw_base_url=raw_base_url,
+        config_cache_ttl=0,
+    )
+    worker = BackgroundWorker(target=lambda w: model.run_update_pipeline(worker=w))
+
+    start = time.perf_counter()
+    worker.start()
+    progress_events = 0
+    while True:
+        event = worker.events.get()
+        progress_events += 1
+        if event.phase in FINAL_PHASES:
+            break
+    worker.join()
+    wall_s = time.perf_counter() - start
+
+    usage_self = resource.getrusage(resource.RUSAGE_SELF)
+    usage_children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    cpu_s = sum(
+        [
+            usage_self.ru_utime,
+            usage_self.ru_stime,
+            usage_children.ru_utime,
+            usage_children.ru_stime,
+        ]
+    )
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    rss_unit = 1024 if platform.system() == "Darwin" else 1
+    peak_rss = max(usage_self.ru_maxrss, usage_children.ru_maxrss) / rss_unit
+
+    return {
+        "outcome": "ok" if worker.error is None else f"error: {worker.error}",
+        "wall_s": round(wall_s, 3),
+        "cpu_s": round(cpu_s, 3),
+        "peak_rss_mib": round(peak_rss / 1024, 1),
+        "subprocesses": subprocess_count[0],
+        "progress_events": progress_events,
+    }
+
+
+#! --- Benchmarks ---
+def benchmark_clone_strategies(
+    commits: int = 500, blob_size: int = 64 * 1024, update_commits: int = 5
+) -> list[dict]:
+    """Time `_clone_github_repo` and `_pull_github_repo` for every clone strategy against a local bare repo.
+
+    Returns:
+        list[dict]: One result per strategy with the clone/pull wall times and resulting disk usage.
+    """
+
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        bare_dir = os.path.join(temp_dir, "remote.git")
+        create_synthetic_repo(bare_dir, commits=commits, blob_size=blob_size)
+
+        # file:// is required, git ignores --depth and --filter for plain local paths
+        url = Path(bare_dir).as_uri()
+        variants = [(strategy, None) for strategy in CLONE_STRATEGIES]
+        variants.append((CLONE_STRATEGIES[1], ["src"]))
+
+        clone_dirs = []
+        for strategy, sparse_paths in variants:
+            save_dir = os.path.join(temp_dir, f"clone_{len(clone_dirs)}")
+            start = time.perf_counter()
+            ApplicationModel._clone_github_repo(
+                url=url, save_dir=save_dir, strategy=strategy, sparse_paths=sparse_paths
+            )
+            clone_time = time.perf_counter() - start
+            clone_dirs.append(save_dir)
+
+            results.append(
+                {
+                    "strategy": strategy + (" + sparse" if sparse_paths else ""),
+                    "clone_s": round(clone_time, 3),
+                    "clone_mib": round(get_dir_size(save_dir) / 1024**2, 2),
+                }
+            )
+
+        # Publish a small update and pull it into every clone
+        create_synthetic_repo(
+            bare_dir,
+            commits=update_commits,
+            blob_size=blob_size,
+            start_commit=commits + 1,
+        )
+        for result, save_dir in zip(results, clone_dirs):
+            start = time.perf_counter()
+            ApplicationModel._pull_github_repo(url=url, save_dir=save_dir)
+            result["pull_s"] = round(time.perf_counter() - start, 3)
+            result["pull_mib"] = round(get_dir_size(save_dir) / 1024**2, 2)
+            result["shallow"] = is_shallow_repo(save_dir)
+
+    return results
+
+
+def write_build_bench_app(app_dir: str, files: dict[str, str]):
+    for rel_path, content in files.items():
+        path = os.path.join(app_dir, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            f.write(content)
+
+
+def benchmark_builds() -> list[dict]:
+    """Time full and incremental PyInstaller builds of a sample app with heavy dependencies, through `build_application_executable`.
+
+    Every build mode builds the app from scratch, then after a change to app code only, then after a change to its imports.
+    A warm up build first fills PyInstaller's global cache, so the first mode measured isn't penalised.
+
+    Returns:
+        list[dict]: Wall times per build mode and whether the executable of the app code change printed the new version.
+    """
+
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+
+        def build(app_dir: str, build_mode: str) -> float:
+            model = ApplicationModel(application_dir=app_dir)
+            model.refresh_local_config()
+            start = time.perf_counter()
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                model.build_application_executable()
+            return round(time.perf_counter() - start, 3)
+
+        for build_mode in ["warm_up", *BUILD_MODES]:
+            app_dir = os.path.join(temp_dir, build_mode, APPLICATION_DIR)
+            config = {
+                "version": 1,
+                "app_file": "bench_app.py",
+                "github_url": E2E_GITHUB_URL,
+                "build_mode": build_mode if build_mode in BUILD_MODES else "full",
+            }
+            write_build_bench_app(
+                app_dir,
+                {
+                    **BUILD_BENCH_APP_FILES,
+                    DEFAULT_CONFIG_FILENAME: json.dumps(config),
+                },
+            )
+
+            cold_s = build(app_dir, build_mode)
+            if build_mode not in BUILD_MODES:
+                continue
+
+            # PyInstaller compares whole second mtimes, a change within a second of the previous build would go unnoticed
+            time.sleep(1)
+            write_build_bench_app(app_dir, {"bench_pkg/version.py": "VERSION = 2\n"})
+            app_change_s = build(app_dir, build_mode)
+
+            model = ApplicationModel(application_dir=app_dir)
+            model.refresh_local_config()
+            output = subprocess.run(
+                [model.get_executable_path()], capture_output=True, text=True
+            ).stdout
+
+            time.sleep(1)
+            core = BUILD_BENCH_APP_FILES["bench_pkg/core.py"]
+            write_build_bench_app(
+                app_dir, {"bench_pkg/core.py": f"import csv, ctypes\n{core}"}
+            )
+            dependency_change_s = build(app_dir, build_mode)
+
+            results.append(
+                {
+                    "build_mode": build_mode,
+                    "cold_s": cold_s,
+                    "app_change_s": app_change_s,
+                    "dependency_change_s": dependency_change_s,
+                    "app_change_applied": "bench app 2" in output,
+                }
+            )
+
+    return results
+
+
+def benchmark_wheelhouse() -> list[dict]:
+    """Time the creation of source environments through the wheelhouse, against a local package index.
+
+    Every scenario in WHEELHOUSE_SCENARIOS creates a new environment, sharing one wheelhouse. pip only sees the local index,
+    the pip configuration of this machine is ignored. A wheel the wheelhouse already holds must never be downloaded again.
+
+    Returns:
+        list[dict]: Wall time per scenario, the number of wheels downloaded from the index against the expected number and
+        whether all packages import.
+    """
+
+    results = []
+    pip_env = {
+        key: value for key, value in os.environ.items() if not key.startswith("PIP_")
+    }
+    with tempfile.TemporaryDirectory() as temp_dir:
+        index_dir = os.path.join(temp_dir, "index")
+        create_package_index(index_dir, WHEELHOUSE_BENCH_PACKAGES)
+        server = PackageIndexServer(index_dir)
+        index_url = server.start()
+
+        source_envs = SourceEnvironments(
+            os.path.join(temp_dir, "envs"),
+            wheelhouse=Wheelhouse(os.path.join(temp_dir, "wheels")),
+        )
+        saved_env = dict(os.environ)
+        os.environ.clear()
+        os.environ.update(pip_env, PIP_CONFIG_FILE=os.devnull, PIP_INDEX_URL=index_url)
+        try:
+            for (
+                scenario,
+                requirements,
+                online,
+                expected_downloads,
+            ) in WHEELHOUSE_SCENARIOS:
+                if not online:
+                    server.stop()
+                requirements_path = os.path.join(temp_dir, f"{scenario}.txt")
+                with open(requirements_path, "w") as f:
+                    f.write("\n".join(requirements) + "\n")
+
+                files_sent = server.files_sent
+                key = source_envs.get_key(
+                    source_envs.read_requirements(requirements_path)
+                )
+                start = time.perf_counter()
+                with (
+                    open(os.devnull, "w") as devnull,
+                    contextlib.redirect_stdout(devnull),
+                ):
+                    interpreter = source_envs.ensure(key, requirements_path)
+                wall_s = round(time.perf_counter() - start, 3)
+
+                modules = [name.replace("-", "_") for name in requirements]
+                imports = subprocess.run(
+                    [interpreter, "-c", f"import {', '.join(modules)}"],
+                    capture_output=True,
+                )
+                wheels_downloaded = server.files_sent - files_sent
+                results.append(
+                    {
+                        "name": scenario,
+                        "wall_s": wall_s,
+                        "wheels_downloaded": wheels_downloaded,
+                        "expected_downloads": expected_downloads,
+                        "installed": imports.returncode == 0,
+                        "ok": imports.returncode == 0
+                        and wheels_downloaded == expected_downloads,
+                    }
+                )
+        finally:
+            os.environ.clear()
+            os.environ.update(saved_env)
+            server.stop()
+
+    return results
+
+
+def benchmark_rollback() -> list[dict]:
+    """Check that a rollback survives background revalidation and relaunches, and that only a newer remote version ends it.
+
+    Versions are published to a local bare repo and built through the update pipeline. Revalidations run the pipeline with
+    `activate=False` like `revalidate_app`, relaunches run it like the launcher window does.
+
+    Returns:
+        list[dict]: Per step, the installed version, the expected one and whether they match.
+    """
+
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        remotes_dir = os.path.join(temp_dir, "remotes")
+        bare_dir = os.path.join(remotes_dir, "bench", "bench_app")
+        work_dir = os.path.join(temp_dir, "bench_app_source")
+        application_dir = os.path.join(temp_dir, "install", APPLICATION_DIR)
+        os.makedirs(os.path.dirname(application_dir))
+
+        server = RawGitHubServer(remotes_dir)
+        raw_base_url = server.start()
+        saved_env = dict(os.environ)
+        os.environ.update(get_git_remote_env(remotes_dir))
+
+        def run_pipeline(activate: bool = True):
+            model = ApplicationModel(
+                application_dir=application_dir,
+                github_url=E2E_GITHUB_URL,
+                raw_base_url=raw_base_url,
+                config_cache_ttl=0,
+            )
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                model.run_update_pipeline(activate=activate)
+
+        def record(step: str, expected_version: int):
+            slots = ApplicationModel(application_dir).install_slots
+            index = slots.load_index()
+            version = index["slots"].get(index["current"], {}).get("version")
+            results.append(
+                {
+                    "name": step,
+                    "installed_version": version,
+                    "expected_version": expected_version,
+                    "ok": str(version) == str(expected_version),
+                }
+            )
+
+        # Everything in `app.py --rollback` except the registry lookup
+        def rollback():
+            ApplicationModel(application_dir).install_slots.rollback()
+
+        try:
+            for version in [1, 2]:
+                publish_bench_app_version(work_dir, bare_dir, version)
+                run_pipeline()
+            record("installed", 2)
+
+            rollback()
+            record("rollback", 1)
+            run_pipeline(activate=False)
+            record("revalidate", 1)
+            run_pipeline()
+            record("relaunch", 1)
+
+            publish_bench_app_version(work_dir, bare_dir, 3)
+            run_pipeline(activate=False)
+            record("newer_revalidate", 1)
+            run_pipeline()
+            record("newer_relaunch", 3)
+        finally:
+            os.environ.clear()
+            os.environ.update(saved_env)
+            server.stop()
+
+    return results
+
+
+def benchmark_range_download() -> list[dict]:
+    """Check that `RangeDownloader` resumes through connections dropped mid-body and after an interrupted download.
+
+    Every scenario downloads RANGE_BENCH_SIZE random bytes from a `FaultyFileServer` with a transport allowing
+    RANGE_BENCH_MAX_RETRIES retries, and checks the sha256 of the result:
+    - drops: every response is cut after RANGE_BENCH_DROP_AFTER bytes, so each range needs more responses than retries are allowed.
+    - resume: the download is cancelled once half its ranges are done, the next download only fetches the others.
+    - no_progress: every response is cut before its first byte, the download has to give up after its retries.
+
+    Returns:
+        list[dict]: Per scenario the number of requests, the body bytes sent and whether the outcome was the expected one.
+    """
+
+    import requests
+
+    content = random.Random(0).randbytes(RANGE_BENCH_SIZE)
+    sha256 = hashlib.sha256(content).hexdigest()
+    num_parts = -(-RANGE_BENCH_SIZE // RANGE_BENCH_PART_SIZE)
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        server = FaultyFileServer({"/bundle.tar": content})
+        url = server.start() + "/bundle.tar"
+        transport = HttpTransport(
+            max_retries=RANGE_BENCH_MAX_RETRIES, backoff_base=0.01, backoff_max=0.05
+        )
+
+        def download(
+            name: str, check_cancelled: Callable[[], None] | None = None
+        ) -> str | None:
+            downloader = RangeDownloader(
+                transport,
+                url,
+                os.path.join(temp_dir, name),
+                size=len(content),
+                sha256=sha256,
+                part_size=RANGE_BENCH_PART_SIZE,
+                check_cancelled=check_cancelled,
+            )
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                try:
+                    downloader.download()
+                except PipelineCancelled:
+                    return "cancelled"
+                except requests.RequestException:
+                    return "failed"
+                except ValueError:
+                    return "corrupt"
+            with open(downloader.dest_path, "rb") as f:
+                return "ok" if f.read() == content else "corrupt"
+
+        def record(name: str, outcome: str, expected_outcome: str, **extra):
+            results.append(
+                {
+                    "name": name,
+                    "requests": len(server.log),
+                    "bytes_sent": server.bytes_sent,
+                    "outcome": outcome,
+                    "ok": outcome == expected_outcome and all(extra.values()),
+                }
+            )
+            server.log.clear()
+            server.bytes_sent = 0
+
+        def cancel_halfway():
+            state = read_json_file(os.path.join(temp_dir, "resume.part.json"))
+            if len(state.get("done", [])) >= num_parts // 2:
+                raise PipelineCancelled()
+
+        try:
+            server.drop_after = RANGE_BENCH_DROP_AFTER
+            record("drops", download("drops"), "ok")
+
+            server.drop_after = None
+            outcome = download("resume", check_cancelled=cancel_halfway)
+            record("resume_cancelled", outcome, "cancelled")
+            outcome = download("resume")
+            record(
+                "resume", outcome, "ok", partial=server.bytes_sent < RANGE_BENCH_SIZE
+            )
+
+            server.drop_after = 0
+            outcome = download("no_progress")
+            # The probe, then at most every range with all its retries
+            max_requests = 1 + num_parts * (RANGE_BENCH_MAX_RETRIES + 1)
+            record(
+                "no_progress",
+                outcome,
+                "failed",
+                gave_up=len(server.log) <= max_requests,
+            )
+        finally:
+            transport.close()
+            server.stop()
+
+    return results
+
+
+def benchmark_transport() -> list[dict]:
+    """Check the retries, backoff and `Retry-After` handling of `HttpTransport` against a `FaultyFileServer`.
+
+    Every scenario queues faults for the next requests and checks the number of requests the transport sends, the status
+    it returns and the waits between its attempts, as measured by the server: backoff stays within its exponential bound,
+    `Retry-After` (in seconds or as a date) is honoured up to TRANSPORT_BENCH_BACKOFF_MAX_S, and a read timeout is retried.
+
+    Returns:
+        list[dict]: Per scenario the requests sent against the expected number, the final status, the waits and whether all matched.
+    """
+
+    from email.utils import formatdate
+
+    def backoff_bound(attempt: int) -> tuple[float, float]:
+        return 0, min(
+            TRANSPORT_BENCH_BACKOFF_MAX_S, TRANSPORT_BENCH_BACKOFF_BASE_S * 2**attempt
+        )
+
+    # name, faults (or a function returning them), expected requests, expected status, (min, max) wait before every retry
+    scenarios = [
+        ("ok", [], 1, 200, []),
+        ("latency", [("delay", TRANSPORT_BENCH_READ_TIMEOUT_S / 3)], 1, 200, []),
+        ("not_retryable", [("status", 404, {})], 1, 404, []),
+        (
+            "server_errors",
+            [("status", code, {}) for code in [500, 502, 503]],
+            4,
+            200,
+            [backoff_bound(attempt) for attempt in range(3)],
+        ),
+        (
+            "exhausted",
+            [("status", 503, {})] * (TRANSPORT_BENCH_MAX_RETRIES + 1),
+            TRANSPORT_BENCH_MAX_RETRIES + 1,
+            503,
+            [backoff_bound(attempt) for attempt in range(TRANSPORT_BENCH_MAX_RETRIES)],
+        ),
+        ("retry_after", [("status", 429, {"Retry-After": "1"})], 2, 200, [(1, 1)]),
+        (
+            "retry_after_date",
+            # Dated when the scenario runs, HTTP dates have whole seconds so the wait is between 1 and 2 seconds
+            lambda: [
+                (
+                    "status",
+                    503,
+                    {"Retry-After": formatdate(time.time() + 2, usegmt=True)},
+                )
+            ],
+            2,
+            200,
+            [(1, 2)],
+        ),
+        (
+            "retry_after_capped",
+            [("status", 429, {"Retry-After": "3600"})],
+            2,
+            200,
+            [(TRANSPORT_BENCH_BACKOFF_MAX_S, TRANSPORT_BENCH_BACKOFF_MAX_S)],
+        ),
+        (
+            "timeout",
+            [("delay", TRANSPORT_BENCH_READ_TIMEOUT_S * 3)],
+            2,
+            200,
+            [
+                (
+                    TRANSPORT_BENCH_READ_TIMEOUT_S,
+                    TRANSPORT_BENCH_READ_TIMEOUT_S + backoff_bound(0)[1],
+                )
+            ],
+        ),
+    ]
+
+    results = []
+    server = FaultyFileServer({"/config.json": b'{"version": 1}'})
+    url = server.start() + "/config.json"
+    transport = HttpTransport(
+        read_timeout=TRANSPORT_BENCH_READ_TIMEOUT_S,
+        max_retries=TRANSPORT_BENCH_MAX_RETRIES,
+        backoff_base=TRANSPORT_BENCH_BACKOFF_BASE_S,
+        backoff_max=TRANSPORT_BENCH_BACKOFF_MAX_S,
+    )
+    try:
+        for name, faults, expected_requests, expected_status, wait_bounds in scenarios:
+            if callable(faults):
+                faults = faults()
+            server.log.clear()
+            server.faults.extend(faults)
+
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                with transport.get(url) as response:
+                    status = response.status_code
+
+            # A timed out request is only logged once its delayed response is written
+            time.sleep(max([f[1] for f in faults if f[0] == "delay"], default=0))
+            arrivals = sorted(entry["time"] for entry in server.log)
+            waits = [later - earlier for earlier, later in zip(arrivals, arrivals[1:])]
+            results.append(
+                {
+                    "name": name,
+                    "requests": len(arrivals),
+                    "expected_requests": expected_requests,
+                    "status": status,
+                    "waits_s": ", ".join(f"{wait:.2f}" for wait in waits) or "-",
+                    "ok": len(arrivals) == expected_requests
+                    and status == expected_status
+                    and len(waits) == len(wait_bounds)
+                    and all(
+                        low <= wait <= high + TRANSPORT_BENCH_SLACK_S
+                        for wait, (low, high) in zip(waits, wait_bounds)
+                    ),
+                }
+            )
+    finally:
+        transport.close()
+        server.stop()
+
+    return results
+
+
+def publish_manifest_app_version(server: FaultyFileServer, version: int) -> dict:
+    """Publish a version of the manifest sample app on a `FaultyFileServer` standing in for raw.githubusercontent.com.
+
+    Returns:
+        dict: The published files by path.
+    """
+
+    config = {
+        "version": version,
+        "app_file": "bench_app.py",
+        "github_url": MANIFEST_BENCH_GITHUB_URL,
+        "update_mode": "manifest",
+    }
+    files = {
+        DEFAULT_CONFIG_FILENAME: json.dumps(config),
+        "bench_app.py": f"print('bench app version {version}')\n",
+        **MANIFEST_BENCH_FILES,
+    }
+    files = {
+        path: content if isinstance(content, bytes) else content.encode()
+        for path, content in files.items()
+    }
+    manifest = {
+        "files": [
+            {
+                "path": path,
+                "size": len(content),
+                "sha256": hashlib.sha256(content).hexdigest(),
+            }
+            for path, content in files.items()
+        ]
+    }
+
+    owner, repo = MANIFEST_BENCH_GITHUB_URL.split("/")[-2:]
+    prefix = f"/{owner}/{repo}/refs/heads/{DEFAULT_BRANCH}/"
+    server.files = {prefix + path: content for path, content in files.items()}
+    server.files[prefix + DEFAULT_MANIFEST_FILENAME] = json.dumps(manifest).encode()
+    return files
+
+
+def benchmark_manifest() -> list[dict]:
+    """Check the remote config cache (TTL and ETag/304) and manifest delta updates against a local raw file server.
+
+    An install of version 1 goes through a cold config check, a check within the TTL and one revalidated with a 304.
+    Then version 2 is published, which is noticed, delta updated and checked again, and a repeated delta update downloads nothing.
+
+    Returns:
+        list[dict]: Per step the config statuses, manifest and file requests, whether an update was required and whether all matched.
+    """
+
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        server = FaultyFileServer({})
+        raw_base_url = server.start()
+        application_dir = os.path.join(temp_dir, APPLICATION_DIR)
+
+        # Version 1 as left behind by the first install
+        for path, content in publish_manifest_app_version(server, 1).items():
+            file_path = os.path.join(application_dir, *path.split("/"))
+            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            with open(file_path, "wb") as f:
+                f.write(content)
+
+        def get_model(config_cache_ttl: float) -> ApplicationModel:
+            return ApplicationModel(
+                application_dir=application_dir,
+                github_url=MANIFEST_BENCH_GITHUB_URL,
+                raw_base_url=raw_base_url,
+                config_cache_ttl=config_cache_ttl,
+            )
+
+        def record(
+            name: str,
+            update_required: bool | None,
+            expected: dict,
+            expected_files: dict | None = None,
+        ):
+            config_statuses = [
+                entry["status"]
+                for entry in server.log
+                if entry["path"].endswith(f"/{DEFAULT_CONFIG_FILENAME}")
+            ]
+            manifest_requests = sum(
+                entry["path"].endswith(f"/{DEFAULT_MANIFEST_FILENAME}")
+                for entry in server.log
+            )
+            step = {
+                "config_statuses": config_statuses,
+                "manifest_requests": manifest_requests,
+                "file_requests": len(server.log)
+                - len(config_statuses)
+                - manifest_requests,
+                "update_required": update_required,
+            }
+            installed = all(
+                Path(application_dir, *path.split("/")).read_bytes() == content
+                for path, content in (expected_files or {}).items()
+            )
+            results.append(
+                {
+                    "name": name,
+                    **step,
+                    "config_statuses": ", ".join(map(str, config_statuses)) or "-",
+                    "ok": installed
+                    and all(step[key] == value for key, value in expected.items()),
+                }
+            )
+            server.log.clear()
+
+        try:
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                model = get_model(MANIFEST_BENCH_TTL_S)
+                update_required = model.check_app_updates()
+                model.mark_github_config_verified()
+                record(
+                    "cold_check",
+                    update_required,
+                    {"config_statuses": [200], "update_required": False},
+                )
+
+                update_required = get_model(MANIFEST_BENCH_TTL_S).check_app_updates()
+                record(
+                    "within_ttl",
+                    update_required,
+                    {"config_statuses": [], "update_required": False},
+                )
+
+                update_required = get_model(0).check_app_updates()
+                record(
+                    "revalidated",
+                    update_required,
+                    {"config_statuses": [304], "update_required": False},
+                )
+
+                files = publish_manifest_app_version(server, 2)
+                model = get_model(0)
+                update_required = model.check_app_updates()
+                record(
+                    "new_version",
+                    update_required,
+                    {"config_statuses": [200], "update_required": True},
+                )
+
+                model.perform_manifest_update(MANIFEST_BENCH_GITHUB_URL)
+                # Only the app file and the config changed
+                record(
+                    "delta_update",
+                    None,
+                    {
+                        "config_statuses": [200],
+                        "manifest_requests": 1,
+                        "file_requests": 1,
+                    },
+                    expected_files=files,
+                )
+
+                update_required = get_model(0).check_app_updates()
+                record(
+                    "updated_check",
+                    update_required,
+                    {"config_statuses": [304], "update_required": False},
+                )
+
+                get_model(0).perform_manifest_update(MANIFEST_BENCH_GITHUB_URL)
+                record(
+                    "repeat_delta_update",
+                    None,
+                    {"config_statuses": [], "manifest_requests": 1, "file_requests": 0},
+                    expected_files=files,
+                )
+        finally:
+            server.stop()
+
+    return results
+
+
+def benchmark_build_cache() -> list[dict]:
+    """Check the signed round trip through a local build_cache_server.py, and that tampered builds and bad uploads are refused.
+
+    A build is uploaded and fetched back by `BuildCacheClient`. Then the stored build is swapped for another archive with a
+    matching sha256 but no valid signature, and for a signed archive with a member outside the slot, which must never be unpacked.
+    Raw PUT requests check that the server refuses uploads without the token or with a missing, invalid or too large Content-Length.
+
+    Returns:
+        list[dict]: Per scenario, the outcome (fetch hit or HTTP status), the expected one and whether they match.
+    """
+
+    import http.client
+    import io
+    import tarfile
+
+    import build_cache_server
+
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        dist_dir = os.path.join(temp_dir, "dist")
+        downloads_dir = os.path.join(temp_dir, "downloads")
+        store_dir = os.path.join(temp_dir, "store")
+        for path, content in BUILD_CACHE_BENCH_FILES.items():
+            os.makedirs(os.path.dirname(os.path.join(dist_dir, path)), exist_ok=True)
+            with open(os.path.join(dist_dir, path), "wb") as f:
+                f.write(content)
+
+        server = build_cache_server.create_server(
+            host="127.0.0.1",
+            port=0,
+            store_dir=store_dir,
+            token=BUILD_CACHE_BENCH_TOKEN,
+            max_build_size_mb=BUILD_CACHE_BENCH_MAX_BUILD_SIZE_MB,
+        )
+        server.RequestHandlerClass.log_message = lambda *args: None
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        host, port = server.server_address
+        client = BuildCacheClient(
+            f"http://{host}:{port}",
+            HttpTransport(max_retries=0),
+            token=BUILD_CACHE_BENCH_TOKEN,
+            key=BUILD_CACHE_BENCH_KEY,
+        )
+        fingerprint = hashlib.sha256(b"bench build").hexdigest()
+
+        def fetch() -> str:
+            """Fetch into a new slot, describing the hit or miss and anything left behind."""
+            dest_dir = tempfile.mkdtemp(dir=temp_dir)
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                hit = client.fetch(fingerprint, dest_dir, downloads_dir)
+            files = {
+                path.relative_to(dest_dir).as_posix(): path.read_bytes()
+                for path in Path(dest_dir).rglob("*")
+                if path.is_file()
+            }
+            outcome = ["hit" if hit else "miss"]
+            if hit and files != BUILD_CACHE_BENCH_FILES:
+                outcome.append("files differ")
+            if not hit and os.listdir(dest_dir):
+                outcome.append("slot not empty")
+            if os.listdir(downloads_dir):
+                outcome.append("download left")
+            if os.path.exists(os.path.join(temp_dir, "outside")):
+                outcome.append("escaped")
+            return ", ".join(outcome)
+
+        def replace_stored_build(members: dict[str, bytes], signed: bool):
+            """Swap the stored archive like a compromised server would, with a digest that matches the new archive."""
+            buffer = io.BytesIO()
+            with tarfile.open(fileobj=buffer, mode="w:gz") as archive:
+                for name, content in members.items():
+                    member = tarfile.TarInfo(name)
+                    member.size = len(content)
+                    archive.addfile(member, io.BytesIO(content))
+            body = buffer.getvalue()
+            digest = hashlib.sha256(body).hexdigest()
+            archive_path, digest_path, signature_path = (
+                server.RequestHandlerClass.store.get_paths(fingerprint)
+            )
+            with open(archive_path, "wb") as f:
+                f.write(body)
+            with open(digest_path, "w") as f:
+                f.write(digest)
+            if signed:
+                with open(signature_path, "w") as f:
+                    f.write(client.sign(fingerprint, digest))
+
+        def put(headers: dict[str, str], body: bytes = b"") -> int:
+            connection = http.client.HTTPConnection(host, port, timeout=10)
+            try:
+                connection.putrequest("PUT", f"/builds/{fingerprint}")
+                for name, value in headers.items():
+                    connection.putheader(name, value)
+                connection.endheaders(body or None)
+                return connection.getresponse().status
+            finally:
+                connection.close()
+
+        def record(name: str, outcome, expected):
+            results.append(
+                {
+                    "name": name,
+                    "outcome": outcome,
+                    "expected": expected,
+                    "ok": outcome == expected,
+                }
+            )
+
+        try:
+            with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+                client.upload(fingerprint, dist_dir, downloads_dir)
+            record("signed_round_trip", fetch(), "hit")
+
+            replace_stored_build({"app": b"not the uploaded build"}, signed=False)
+            record("tampered_build", fetch(), "miss")
+
+            replace_stored_build({"../outside": b"escaped"}, signed=True)
+            record("member_outside_slot", fetch(), "miss")
+
+            body = b"x" * 1024
+            valid_headers = {
+                "X-Content-SHA256": hashlib.sha256(body).hexdigest(),
+                "X-Build-Signature": client.sign(
+                    fingerprint, hashlib.sha256(body).hexdigest()
+                ),
+            }
+            record(
+                "unauthenticated_put",
+                put({**valid_headers, "Content-Length": str(len(body))}, body),
+                401,
+            )
+            authorized_headers = {
+                **valid_headers,
+                "Authorization": f"Bearer {BUILD_CACHE_BENCH_TOKEN}",
+            }
+            record(
+                "wrong_token_put",
+                put(
+                    {
+                        **authorized_headers,
+                        "Authorization": "Bearer wrong",
+                        "Content-Length": str(len(body)),
+                    },
+                    body,
+                ),
+                401,
+            )
+            record("missing_content_length", put(authorized_headers), 411)
+            record(
+                "invalid_content_length",
+                put({**authorized_headers, "Content-Length": "-1"}),
+                400,
+            )
+            record(
+                "too_large_put",
+                put(
+                    {
+                        **authorized_headers,
+                        "Content-Length": str(
+                            BUILD_CACHE_BENCH_MAX_BUILD_SIZE_MB * 1024**2 + 1
+                        ),
+                    }
+                ),
+                413,
+            )
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    return results
+
+
+def benchmark_mirror() -> list[dict]:
+    """Check the LAN mirror (mirror_server.py) against local upstreams: raw file caching with ETags, git clones through `git http-backend` and name checks.
+
+    `RawGitHubServer` stands in for raw.githubusercontent.com and a folder of bare repos for github.com. The mirror revalidates
+    every raw request upstream, so a matching ETag has to be answered with a 304 from both of them.
+
+    Returns:
+        list[dict]: Per step, the outcome, the expected one and whether they match.
+    """
+
+    import http.client
+
+    import mirror_server
+
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        remotes_dir = os.path.join(temp_dir, "remotes")
+        bare_dir = os.path.join(remotes_dir, "bench", "bench_app")
+        work_dir = os.path.join(temp_dir, "bench_app_source")
+        clone_dir = os.path.join(temp_dir, "clone")
+        publish_bench_app_version(work_dir, bare_dir, 1)
+
+        upstream = RawGitHubServer(remotes_dir)
+        upstream_raw_url = upstream.start()
+        server = mirror_server.create_server(
+            host="127.0.0.1",
+            port=0,
+            cache_dir=os.path.join(temp_dir, "mirror_cache"),
+            upstream_raw_url=upstream_raw_url,
+            upstream_git_url=remotes_dir,
+            raw_revalidate=0,
+            git_refresh=0,
+        )
+        server.RequestHandlerClass.log_message = lambda *args: None
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        host, port = server.server_address
+        mirror_url = f"http://{host}:{port}"
+        config_path = f"/raw/bench/bench_app/refs/heads/{DEFAULT_BRANCH}/{DEFAULT_CONFIG_FILENAME}"
+
+        def get(path: str, headers: dict[str, str] | None = None) -> tuple:
+            connection = http.client.HTTPConnection(host, port, timeout=30)
+            try:
+                connection.request("GET", path, headers=headers or {})
+                response = connection.getresponse()
+                return response.status, response.read(), response.getheader("ETag")
+            finally:
+                connection.close()
+
+        def read_version(body: bytes) -> int | None:
+            try:
+                return json.loads(body)["version"]
+            except (ValueError, KeyError):
+                return None
+
+        def get_head(git_dir: str) -> str:
+            return subprocess.run(
+                ["git", "--git-dir", git_dir, "rev-parse", DEFAULT_BRANCH],
+                capture_output=True,
+                text=True,
+            ).stdout.strip()
+
+        def record(name: str, outcome, expected):
+            results.append(
+                {
+                    "name": name,
+                    "outcome": outcome,
+                    "expected": expected,
+                    "ok": outcome == expected,
+                }
+            )
+
+        try:
+            status, body, etag = get(config_path)
+            record("raw_first", (status, read_version(body)), (200, 1))
+
+            upstream_requests = upstream.requests
+            status, _, _ = get(config_path, {"If-None-Match": etag or ""})
+            record(
+                "raw_not_modified",
+                (status, upstream.requests - upstream_requests),
+                (304, 1),
+            )
+
+            publish_bench_app_version(work_dir, bare_dir, 2)
+            status, body, _ = get(config_path, {"If-None-Match": etag or ""})
+            record("raw_changed", (status, read_version(body)), (200, 2))
+
+            git_env = {**os.environ, "GIT_TERMINAL_PROMPT": "0"}
+            clone = subprocess.run(
+                [
+                    "git",
+                    "clone",
+                    "-q",
+                    f"{mirror_url}/git/bench/bench_app.git",
+                    clone_dir,
+                ],
+                capture_output=True,
+                env=git_env,
+            )
+            record(
+                "git_clone",
+                clone.returncode == 0
+                and get_head(os.path.join(clone_dir, ".git")) == get_head(bare_dir),
+                True,
+            )
+
+            publish_bench_app_version(work_dir, bare_dir, 3)
+            pull = subprocess.run(
+                ["git", "-C", clone_dir, "pull", "-q", "--ff-only"],
+                capture_output=True,
+                env=git_env,
+            )
+            record(
+                "git_pull",
+                pull.returncode == 0
+                and get_head(os.path.join(clone_dir, ".git")) == get_head(bare_dir),
+                True,
+            )
+
+            names = ["bench_app", "my.app", ".", "..", "...", "a/b", ""]
+            record(
+                "name_pattern",
+                [name for name in names if mirror_server.NAME_PATTERN.match(name)],
+                ["bench_app", "my.app"],
+            )
+            record(
+                "dot_names_refused",
+                [
+                    get(path)[0]
+                    for path in [
+                        "/git/../bench_app.git/info/refs",
+                        "/git/bench/...git/info/refs",
+                        "/git/.../bench_app.git/info/refs",
+                    ]
+                ],
+                [400, 400, 400],
+            )
+        finally:
+            server.shutdown()
+            server.server_close()
+            upstream.stop()
+
+    return results
+
+
+def create_up_to_date_install(root_dir: str) -> str:
+    """Create a launcher install whose app is built and whose remote check is cached and verified.
+
+    Returns:
+        str: Path to the fake application executable.
+    """
+
+    app_dir = os.path.join(root_dir, APPLICATION_DIR)
+    os.makedirs(app_dir)
+
+    config = {
+        "version": 1,
+        "app_file": "bench_app.py",
+        "github_url": "https://github.com/bench/bench_app",
+    }
+    config_body = json.dumps(config)
+    with open(os.path.join(app_dir, DEFAULT_CONFIG_FILENAME), "w") as f:
+        f.write(config_body)
+
+    model = ApplicationModel(application_dir=app_dir)
+    model.local_app_file = config["app_file"]
+    exec_path = model.get_executable_path()
+    os.makedirs(os.path.dirname(exec_path))
+    with open(exec_path, "w") as f:
+        f.write("#!/bin/sh\nexit 0\n")
+    os.chmod(exec_path, 0o755)
+
+    config_url = model.get_github_config_url(config["github_url"])
+    model.http_cache.store(config_url, body=config_body, etag=None, last_modified=None)
+    model.http_cache.mark_verified(config_url, config["version"])
+    return exec_path
+
+
+def copy_launcher(root_dir: str):
+    """app.py resolves its install relative to itself, so benchmarks run a copy of the launcher inside a temp dir.
+
+    The copy is byte-compiled like an installed launcher, so timings don't depend on PYTHONDONTWRITEBYTECODE.
+    """
+    for module_name in LAUNCHER_MODULES:
+        module_path = shutil.copy(
+            os.path.join(os.path.dirname(__file__), module_name), root_dir
+        )
+        py_compile.compile(module_path, doraise=True)
+
+
+def benchmark_fast_path(runs: int = 10) -> list[dict]:
+    """Time the headless up-to-date launch path, in-process and as a full `python app.py` run.
+
+    Returns:
+        list[dict]: Median and best wall times of the fast path check and of the whole launcher process.
+    """
+
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        copy_launcher(temp_dir)
+        create_up_to_date_install(temp_dir)
+
+        model = ApplicationModel(
+            application_dir=os.path.join(temp_dir, APPLICATION_DIR)
+        )
+        timings = []
+        for _ in range(runs):
+            start = time.perf_counter()
+            if not model.get_up_to_date_executable():
+                raise RuntimeError("Fast path was not taken for an up to date install.")
+            timings.append((time.perf_counter() - start) * 1000)
+        results.append(summarise_timings("fast path check", timings))
+
+        if platform.system() != "Windows":
+            timings = []
+            for _ in range(runs):
+                start = time.perf_counter()
+                subprocess.run(
+                    [sys.executable, os.path.join(temp_dir, "app.py")], check=True
+                )
+                timings.append((time.perf_counter() - start) * 1000)
+            results.append(summarise_timings("launcher process", timings))
+
+    return results
+
+
+def benchmark_import_cost(runs: int = 5) -> list[dict]:
+    """Measure the import cost of the no-build (up to date) launch with the launcher's own startup profiler.
+
+    Before timing anything, the launch runs once without the profiler to list the FAST_PATH_EXCLUDED_MODULES left in
+    `sys.modules`, a check that doesn't depend on timings or on what the profiler records.
+
+    Returns:
+        list[dict]: The excluded modules that were loaded, and the median import time against IMPORT_BUDGET_MS with any
+        heavy modules the profiler saw imported.
+    """
+
+    if platform.system() == "Windows":
+        return []
+
+    import_timings = []
+    heavy_modules = set()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        copy_launcher(temp_dir)
+        create_up_to_date_install(temp_dir)
+
+        modules_path = os.path.join(temp_dir, "modules.json")
+        subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                ENTRY_MODULES_SCRIPT,
+                os.path.join(temp_dir, "app.py"),
+                modules_path,
+            ],
+            cwd=temp_dir,
+            check=True,
+            timeout=60,
+        )
+        with open(modules_path) as f:
+            loaded_modules = {name.split(".")[0] for name in json.load(f)}
+        excluded_modules = sorted(loaded_modules & set(FAST_PATH_EXCLUDED_MODULES))
+
+        profile_path = os.path.join(temp_dir, "startup_profile.json")
+        env = {**os.environ, PROFILE_ENV_VAR: profile_path}
+        for _ in range(runs):
+            subprocess.run(
+                [sys.executable, os.path.join(temp_dir, "app.py")], env=env, check=True
+            )
+            with open(profile_path) as f:
+                profile = json.load(f)
+
+            import_timings.append(profile["import_ms"])
+            heavy_modules.update(
+                i["module"]
+                for i in profile["imports"]
+                if i["module"].split(".")[0] in HEAVY_MODULES
+            )
+
+    import_ms = statistics.median(import_timings)
+    return [
+        {
+            "name": "no-build path imports",
+            "excluded_modules": ", ".join(excluded_modules) or "-",
+            "modules_ok": not excluded_modules,
+            "import_ms": round(import_ms, 2),
+            "budget_ms": IMPORT_BUDGET_MS,
+            "heavy_modules": ", ".join(sorted(heavy_modules)) or "-",
+            "within_budget": import_ms < IMPORT_BUDGET_MS and not heavy_modules,
+        }
+    ]
+
+
+def benchmark_e2e() -> dict:
+    """Time complete launches through every scenario in E2E_SCENARIOS against local GitHub stand-ins.
+
+    A local HTTP server replaces raw.githubusercontent.com and git's `insteadOf` redirects github.com to local bare repos.
+    Every scenario runs in its own child process (see `run_pipeline_headless`) against the install left by the previous one.
+
+    Returns:
+        dict: {"meta": {...}, "scenarios": [...]} with wall time, CPU time, peak RSS, bytes transferred and subprocess count per scenario.
+    """
+
+    if platform.system() == "Windows":
+        return {}
+
+    results = []
+    with tempfile.TemporaryDirectory() as temp_dir:
+        remotes_dir = os.path.join(temp_dir, "remotes")
+        bare_dir = os.path.join(remotes_dir, "bench", "bench_app")
+        work_dir = os.path.join(temp_dir, "bench_app_source")
+        install_dir = os.path.join(temp_dir, "install")
+        application_dir = os.path.join(install_dir, APPLICATION_DIR)
+        os.makedirs(install_dir)
+
+        version = 1
+        publish_bench_app_version(work_dir, bare_dir, version)
+        server = RawGitHubServer(remotes_dir)
+        raw_base_url = server.start()
+        git_env = get_git_remote_env(remotes_dir)
+
+        try:
+            for scenario in E2E_SCENARIOS:
+                match scenario:
+                    case "version_bump":
+                        version += 1
+                        publish_bench_app_version(work_dir, bare_dir, version)
+                    case "corrupt_config":
+                        with open(
+                            os.path.join(application_dir, DEFAULT_CONFIG_FILENAME), "w"
+                        ) as f:
+                            f.write("{not json")
+                    case "missing_dist":
+                        slots_dir = ApplicationModel(
+                            application_dir
+                        ).install_slots.slots_dir
+                        shutil.rmtree(slots_dir, ignore_errors=True)
+                        shutil.rmtree(
+                            os.path.join(application_dir, "dist"), ignore_errors=True
+                        )
+                    case "offline":
+                        server.stop()
+                        git_env = get_git_remote_env(os.path.join(temp_dir, "offline"))
+
+                http_bytes = server.bytes_sent
+                git_bytes = get_dir_size(os.path.join(application_dir, ".git"))
+
+                # The build writes its .spec file to the working directory
+                child = subprocess.run(
+                    [
+                        sys.executable,
+                        os.path.abspath(__file__),
+                        "--e2e-child",
+                        application_dir,
+                        raw_base_url,
+                    ],
+                    cwd=install_dir,
+                    env=git_env,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    text=True,
+                )
+                result_lines = [
+                    line
+                    for line in child.stdout.splitlines()
+                    if line.startswith(E2E_RESULT_MARKER)
+                ]
+                if not result_lines:
+                    raise RuntimeError(
+                        f"Scenario '{scenario}' did not report a result."
+                    )
+
+                result = json.loads(result_lines[-1][len(E2E_RESULT_MARKER) :])
+                git_received = (
+                    get_dir_size(os.path.join(application_dir, ".git")) - git_bytes
+                )
+                results.append(
+                    {
+                        "name": scenario,
+                        **result,
+                        "http_bytes": server.bytes_sent - http_bytes,
+                        "git_bytes": max(0, git_received),
+                    }
+                )
+        finally:
+            server.stop()
+
+    return {
+        "meta": {
+            "commit": get_launcher_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "timestamp": time.time(),
+        },
+        "scenarios": results,
+    }
+
+
+def summarise_timings(name: str, timings_ms: list[float]) -> dict:
+    median_ms = statistics.median(timings_ms)
+    return {
+        "name": name,
+        "median_ms": round(median_ms, 2),
+        "best_ms": round(min(timings_ms), 2),
+        "within_target": median_ms < FAST_PATH_TARGET_MS,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Application launcher benchmarks.")
+    parser.add_argument(
+        "--only",
+        action="append",
+        choices=BENCHMARK_NAMES,
+        help="Only run this benchmark, can be given more than once.",
+    )
+    parser.add_argument("--commits", type=int, default=500)
+    parser.add_argument("--blob-size", type=int, default=64 * 1024)
+    parser.add_argument(
+        "--json", dest="json_path", help="Write results to a JSON file."
+    )
+    parser.add_argument("--e2e-child", nargs=2, help=argparse.SUPPRESS)
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Exit with an error when a benchmark is over its budget.",
+    )
+    args = parser.parse_args()
+    selected = set(args.only or BENCHMARK_NAMES)
+
+    if args.e2e_child:
+        application_dir, raw_base_url = args.e2e_child
+        result = run_pipeline_headless(application_dir, raw_base_url)
+        print(E2E_RESULT_MARKER + json.dumps(result))
+        return
+
+    if not shutil.which("git"):
+        raise SystemExit("git is required to run the benchmarks.")
+
+    results = {}
+    if "clone" in selected:
+        results["clone"] = benchmark_clone_strategies(
+            commits=args.commits, blob_size=args.blob_size
+        )
+        print_results("Clone strategies", results["clone"])
+
+    if "fast_path" in selected:
+        results["fast_path"] = benchmark_fast_path()
+        print_results(
+            f"Up to date launch (target < {FAST_PATH_TARGET_MS} ms)",
+            results["fast_path"],
+        )
+
+    if "imports" in selected:
+        results["imports"] = benchmark_import_cost()
+        if results["imports"]:
+            print_results("Import cost", results["imports"])
+
+    if "e2e" in selected:
+        results["e2e"] = benchmark_e2e()
+        if results["e2e"]:
+            print_results("End to end launches", results["e2e"]["scenarios"])
+
+    if "builds" in selected:
+        results["builds"] = benchmark_builds()
+        print_results("Full and incremental builds", results["builds"])
+
+    if "wheelhouse" in selected:
+        results["wheelhouse"] = benchmark_wheelhouse()
+        print_results("Source environments from the wheelhouse", results["wheelhouse"])
+
+    if "rollback" in selected:
+        results["rollback"] = benchmark_rollback()
+        print_results("Rollback pinning", results["rollback"])
+
+    if "range_download" in selected:
+        results["range_download"] = benchmark_range_download()
+        print_results("Range downloads", results["range_download"])
+
+    if "transport" in selected:
+        results["transport"] = benchmark_transport()
+        print_results("HTTP transport retries", results["transport"])
+
+    if "manifest" in selected:
+        results["manifest"] = benchmark_manifest()
+        print_results("Config cache and manifest delta updates", results["manifest"])
+
+    if "build_cache" in selected:
+        results["build_cache"] = benchmark_build_cache()
+        print_results("Build cache signatures and uploads", results["build_cache"])
+
+    if "mirror" in selected:
+        results["mirror"] = benchmark_mirror()
+        print_results("LAN mirror", results["mirror"])
+
+    if args.json_path:
+        with open(args.json_path, "w") as f:
+            json.dump(results, f, indent=2)
+
+    # Deterministic, checked before the timing budgets
+    loaded = [
+        result["excluded_modules"]
+        for result in results.get("imports", [])
+        if not result["modules_ok"]
+    ]
+    if args.check and loaded:
+        raise SystemExit(f"Loaded on the fast path: {', '.join(loaded)}")
+
+    over_budget = [
+        result["name"]
+        for result in results.get("imports", [])
+        if not result["within_budget"]
+    ] + [
+        result["name"]
+        for result in results.get("fast_path", [])
+        if not result["within_target"]
+    ]
+    if args.check and over_budget:
+        raise SystemExit(f"Over budget: {', '.join(over_budget)}")
+
+    for benchmark_name, message in [
+        ("rollback", "Rollback not kept"),
+        ("range_download", "Range downloads failed"),
+        ("transport", "Unexpected transport retries"),
+        ("manifest", "Unexpected config or manifest requests"),
+        ("wheelhouse", "Unexpected wheel downloads or failed installs"),
+        ("build_cache", "Build cache accepted a bad build or upload"),
+        ("mirror", "Unexpected mirror responses"),
+    ]:
+        failed = [
+            result["name"]
+            for result in results.get(benchmark_name, [])
+            if not result["ok"]
+        ]
+        if args.check and failed:
+            raise SystemExit(f"{message}: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    main()
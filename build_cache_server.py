@@ -0,0 +1,320 @@
+import argparse
+import hashlib
+import hmac
+import os
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# Shared build cache, so an app is built with PyInstaller once instead of once per machine.
+# Start it with `python build_cache_server.py` and point the launchers at it with `python app.py --set-build-cache http://<host>:8081`
+# GET/HEAD /builds/<fingerprint> -> gzipped tar of a dist folder, its sha256 and uploader signature in the X-Content-SHA256 and X-Build-Signature headers
+# PUT /builds/<fingerprint>      -> store a build, needs `Authorization: Bearer <token>` and a Content-Length up to --max-build-size-mb,
+#                                   and is rejected unless the body matches its X-Content-SHA256 header
+# The signature is opaque to the server, launchers sign builds with a key the server never sees, so it can't forge or swap them.
+DEFAULT_HOST = "0.0.0.0"
+DEFAULT_PORT = 8081
+DEFAULT_STORE_DIR = ".build_cache"
+DEFAULT_MAX_SIZE_GB = 20
+# Larger uploads are refused with 413 before their body is read
+DEFAULT_MAX_BUILD_SIZE_MB = 2048
+BUILDS_PREFIX = "/builds/"
+DIGEST_HEADER = "X-Content-SHA256"
+SIGNATURE_HEADER = "X-Build-Signature"
+COPY_CHUNK_SIZE = 64 * 1024
+
+# Uploads are refused unless a token is set with --token or in this environment variable
+TOKEN_ENV_VAR = "BUILD_CACHE_TOKEN"
+
+FINGERPRINT_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+
+#! --- Build Store ---
+class BuildStore:
+    """Builds on disk as `<fingerprint>.tar.gz` with their sha256 in `<fingerprint>.sha256` and signature in `<fingerprint>.sig`, evicted least recently used first.
+
+    The mtime of an archive is its last use, it is bumped on every hit, so eviction needs no separate index.
+    """
+
+    def __init__(self, store_dir: str, max_size: int):
+        self.store_dir = store_dir
+        self.max_size = max_size
+
+        self._lock = threading.Lock()
+        os.makedirs(store_dir, exist_ok=True)
+
+    def get_paths(self, fingerprint: str) -> tuple[str, str, str]:
+        return (
+            os.path.join(self.store_dir, f"{fingerprint}.tar.gz"),
+            os.path.join(self.store_dir, f"{fingerprint}.sha256"),
+            os.path.join(self.store_dir, f"{fingerprint}.sig"),
+        )
+
+    def open(self, fingerprint: str) -> tuple[int, str, str] | None:
+        """Size, sha256 and signature of a stored build, marking it as recently used.
+
+        Returns:
+            tuple[int, str, str] | None: None when the build isn't stored.
+        """
+
+        archive_path, digest_path, signature_path = self.get_paths(fingerprint)
+        with self._lock:
+            try:
+                with open(digest_path) as f:
+                    digest = f.read().strip()
+                with open(signature_path) as f:
+                    signature = f.read().strip()
+                os.utime(archive_path)
+                return os.path.getsize(archive_path), digest, signature
+            except OSError:
+                return None
+
+    def put(self, fingerprint: str, digest: str, signature: str, body, size: int):
+        """Store a build read from `body`.
+
+        Raises:
+            ValueError: If the body doesn't match `digest` or is larger than the store.
+        """
+
+        if size > self.max_size:
+            raise ValueError(f"Build of {size} bytes is larger than the store")
+
+        archive_path, digest_path, signature_path = self.get_paths(fingerprint)
+        temp_path = f"{archive_path}.{threading.get_ident()}.tmp"
+        content_hash = hashlib.sha256()
+        try:
+            with open(temp_path, "wb") as f:
+                remaining = size
+                while remaining:
+                    chunk = body.read(min(COPY_CHUNK_SIZE, remaining))
+                    if not chunk:
+                        raise ValueError("Upload ended early")
+                    content_hash.update(chunk)
+                    f.write(chunk)
+                    remaining -= len(chunk)
+
+            if content_hash.hexdigest() != digest:
+                raise ValueError(
+                    f"Hash mismatch, expected {digest} got {content_hash.hexdigest()}"
+                )
+
+            with self._lock:
+                with open(digest_path, "w") as f:
+                    f.write(digest)
+                with open(signature_path, "w") as f:
+                    f.write(signature)
+                os.replace(temp_path, archive_path)
+                self.evict()
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+    def evict(self):
+        """Remove the least recently used builds until the store fits in `max_size`, the caller holds the lock."""
+
+        archives = []
+        for name in os.listdir(self.store_dir):
+            if not name.endswith(".tar.gz"):
+                continue
+            stat = os.stat(os.path.join(self.store_dir, name))
+            archives.append((stat.st_mtime, stat.st_size, name.removesuffix(".tar.gz")))
+
+        total_size = sum(size for _, size, _ in archives)
+        for _, size, fingerprint in sorted(archives):
+            if total_size <= self.max_size:
+                break
+            for path in self.get_paths(fingerprint):
+                if os.path.exists(path):
+                    os.remove(path)
+            total_size -= size
+            print(f"Evicted build {fingerprint[:12]}")
+
+
+#! --- Request Handler ---
+class BuildCacheRequestHandler(BaseHTTPRequestHandler):
+    store: BuildStore
+    token: str | None = None
+    max_build_size: int = DEFAULT_MAX_BUILD_SIZE_MB * 1024**2
+
+    def is_authorized(self) -> bool:
+        """Check the bearer token of an upload, answering 403 when uploads are disabled and 401 when the token is wrong."""
+
+        if not self.token:
+            self.send_error(403, f"Uploads are disabled, set {TOKEN_ENV_VAR}")
+            return False
+
+        scheme, _, token = self.headers.get("Authorization", "").partition(" ")
+        if scheme.lower() != "bearer" or not hmac.compare_digest(
+            token.strip().encode(), self.token.encode()
+        ):
+            self.send_response(401)
+            self.send_header("WWW-Authenticate", "Bearer")
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return False
+        return True
+
+    def get_fingerprint(self) -> str | None:
+        path = self.path.split("?")[0]
+        fingerprint = path[len(BUILDS_PREFIX) :]
+        if not path.startswith(BUILDS_PREFIX) or not FINGERPRINT_PATTERN.match(
+            fingerprint
+        ):
+            self.send_error(404)
+            return None
+        return fingerprint
+
+    def get_content_length(self) -> int | None:
+        """The size of an upload, answering 411 without a Content-Length, 400 when it is invalid and 413 when it is over `max_build_size`."""
+
+        content_length = self.headers.get("Content-Length")
+        if content_length is None:
+            self.send_error(411)
+            return None
+        if not content_length.strip().isdigit():
+            self.send_error(400, f"Invalid Content-Length: '{content_length}'")
+            return None
+
+        size = int(content_length)
+        if size > self.max_build_size:
+            self.send_error(
+                413, f"Build of {size} bytes is over {self.max_build_size} bytes"
+            )
+            return None
+        return size
+
+    def do_HEAD(self):
+        self.send_build(send_body=False)
+
+    def do_GET(self):
+        self.send_build(send_body=True)
+
+    def send_build(self, send_body: bool):
+        fingerprint = self.get_fingerprint()
+        if fingerprint is None:
+            return
+
+        build = self.store.open(fingerprint)
+        if build is None:
+            self.send_error(404)
+            return
+
+        size, digest, signature = build
+        archive_path = self.store.get_paths(fingerprint)[0]
+        try:
+            # Keeps an archive being evicted meanwhile readable until it is sent
+            f = open(archive_path, "rb")
+        except OSError:
+            self.send_error(404)
+            return
+
+        with f:
+            self.send_response(200)
+            self.send_header("Content-Type", "application/gzip")
+            self.send_header("Content-Length", str(size))
+            self.send_header(DIGEST_HEADER, digest)
+            self.send_header(SIGNATURE_HEADER, signature)
+            self.end_headers()
+            if send_body:
+                while chunk := f.read(COPY_CHUNK_SIZE):
+                    self.wfile.write(chunk)
+
+    def do_PUT(self):
+        # The body of a refused upload is never read
+        self.close_connection = True
+        fingerprint = self.get_fingerprint()
+        if fingerprint is None or not self.is_authorized():
+            return
+
+        digest = self.headers.get(DIGEST_HEADER, "").lower()
+        if not FINGERPRINT_PATTERN.match(digest):
+            self.send_error(400, f"Missing {DIGEST_HEADER} header")
+            return
+        signature = self.headers.get(SIGNATURE_HEADER, "").lower()
+        if not FINGERPRINT_PATTERN.match(signature):
+            self.send_error(400, f"Missing {SIGNATURE_HEADER} header")
+            return
+        size = self.get_content_length()
+        if size is None:
+            return
+
+        try:
+            self.store.put(fingerprint, digest, signature, self.rfile, size)
+        except ValueError as e:
+            self.send_error(400, str(e))
+            return
+
+        self.close_connection = False
+        self.send_response(201)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+#! --- Main Logic ---
+def create_server(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    store_dir: str = DEFAULT_STORE_DIR,
+    max_size_gb: float = DEFAULT_MAX_SIZE_GB,
+    token: str | None = None,
+    max_build_size_mb: float = DEFAULT_MAX_BUILD_SIZE_MB,
+) -> ThreadingHTTPServer:
+    class Handler(BuildCacheRequestHandler):
+        store = BuildStore(store_dir, int(max_size_gb * 1024**3))
+        max_build_size = int(max_build_size_mb * 1024**2)
+
+    Handler.token = token
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Shared build cache for the application launcher."
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--store-dir", default=DEFAULT_STORE_DIR)
+    parser.add_argument(
+        "--max-size-gb",
+        type=float,
+        default=DEFAULT_MAX_SIZE_GB,
+        help="Size of the store, least recently used builds are evicted beyond it.",
+    )
+    parser.add_argument(
+        "--max-build-size-mb",
+        type=float,
+        default=DEFAULT_MAX_BUILD_SIZE_MB,
+        help="Largest build accepted, larger uploads are refused before they are read.",
+    )
+    parser.add_argument(
+        "--token",
+        default=os.environ.get(TOKEN_ENV_VAR),
+        help=f"Bearer token uploads must send, defaults to {TOKEN_ENV_VAR}. Without it the cache is read-only.",
+    )
+    args = parser.parse_args()
+
+    server = create_server(
+        host=args.host,
+        port=args.port,
+        store_dir=args.store_dir,
+        max_size_gb=args.max_size_gb,
+        token=args.token,
+        max_build_size_mb=args.max_build_size_mb,
+    )
+    print(f"Build cache serving on http://{args.host}:{args.port}")
+    if not args.token:
+        print(
+            f"No upload token set with --token or {TOKEN_ENV_VAR}, uploads are refused."
+        )
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,4936 @@
+import queue
+import shutil
+import subprocess
+import threading
+import time
+import re
+import os
+import json
+import random
+import sys
+from collections import deque
+from typing import Callable, NamedTuple
+
+import startup_profiler
+import tracing
+from launcher_state import LauncherState
+
+
+# NOTE: Heavy dependencies (PyInstaller, requests, tkinter) are imported lazily on the code
+# paths that use them, so an up to date launch never pays for importing them.
+# The launcher window lives in launcher_window.py for the same reason.
+
+
+# `python app.py` runs the launcher, see app.py
+ENTRY_SCRIPT = "app.py"
+
+# APPLICATION_DIR = ".app"
+APPLICATION_DIR = ".temp_github_app"
+DEFAULT_CONFIG_FILENAME = "config.json"
+GITHUB_RAW_BASE_URL = "https://raw.githubusercontent.com"
+
+# A LAN mirror (see mirror_server.py) serves raw files under /raw and git repos under /git
+MIRROR_RAW_PATH = "/raw"
+MIRROR_GIT_PATH = "/git"
+REQUIRED_CONFIG_FIELDS = ["version", "app_file", "github_url"]
+
+# Multi-application registry, the default app keeps living in APPLICATION_DIR
+REGISTRY_FILENAME = "apps.json"
+APPS_DIR = ".launcher_apps"
+DEFAULT_APP_NAME = "default"
+MAX_CONCURRENT_UPDATE_CHECKS = 8
+APP_NAME_PATTERN = re.compile(r"^[A-Za-z0-9_.-]+$")
+
+# Launcher caches live next to APPLICATION_DIR
+CACHE_DIR = ".launcher_cache"
+HTTP_CACHE_FILENAME = "http_cache.json"
+CONFIG_CACHE_TTL_S = 5 * 60
+
+# HTTP transport shared by all remote calls
+HTTP_CONNECT_TIMEOUT_S = 5
+HTTP_READ_TIMEOUT_S = 30
+HTTP_MAX_RETRIES = 4
+HTTP_BACKOFF_BASE_S = 0.5
+HTTP_BACKOFF_MAX_S = 30
+HTTP_POOL_CONNECTIONS = 4
+HTTP_POOL_MAXSIZE = 16
+HTTP_RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+# The headless fast path checks the remote once with this timeout and no retries, an unreachable
+# remote opens the launcher window (which retries with the full policy) instead of blocking unseen
+REMOTE_PROBE_TIMEOUT_S = 2
+
+# Clone strategies, we only ever build the HEAD of DEFAULT_BRANCH
+DEFAULT_BRANCH = "master"
+CLONE_STRATEGY_FULL = "full"  # Complete history
+CLONE_STRATEGY_SHALLOW = "shallow"  # --depth 1, only the latest commit
+CLONE_STRATEGY_BLOBLESS = (
+    "blobless"  # --filter=blob:none, history without old file contents
+)
+CLONE_STRATEGIES = [
+    CLONE_STRATEGY_FULL,
+    CLONE_STRATEGY_SHALLOW,
+    CLONE_STRATEGY_BLOBLESS,
+]
+DEFAULT_CLONE_STRATEGY = CLONE_STRATEGY_SHALLOW
+
+# Update modes, selected with "update_mode" in the app's config.json
+UPDATE_MODE_GIT = "git"  # git fetch + reset of the whole repo
+UPDATE_MODE_MANIFEST = (
+    "manifest"  # Only download files that changed according to the remote manifest
+)
+# Change detection, selected with "change_detection" in the app's config.json
+CHANGE_DETECTION_VERSION = (
+    "version"  # Compare the "version" field of the remote config.json
+)
+CHANGE_DETECTION_COMMIT = "commit"  # Compare the tip commit of DEFAULT_BRANCH from `git ls-remote`, no download at all
+CHANGE_DETECTION_MODES = [CHANGE_DETECTION_VERSION, CHANGE_DETECTION_COMMIT]
+DEFAULT_CHANGE_DETECTION = CHANGE_DETECTION_VERSION
+GIT_LS_REMOTE_TIMEOUT_S = 15
+
+# Set "speculative_fetch": true in the app's config.json to git fetch while the remote config is downloaded.
+# The fetch only writes objects and origin/<branch>, the working tree is only reset when the version check asks for an update.
+DEFAULT_SPECULATIVE_FETCH = False
+DEFAULT_MANIFEST_FILENAME = "manifest.json"
+APPLIED_MANIFEST_FILENAME = ".launcher_manifest.json"
+OBJECT_STORE_DIRNAME = "objects"
+MANIFEST_DOWNLOAD_WORKERS = 8
+
+# Versioned install slots, one PyInstaller dist folder per built version
+SLOTS_DIR = ".launcher_slots"
+SLOTS_INDEX_FILENAME = "slots.json"
+MAX_INSTALL_SLOTS = 3
+PYINSTALLER_BUILD_OPTIONS = ["--onedir", "--windowed"]
+
+# Prebuilt release artifacts, advertised per platform with "artifacts" in the app's config.json
+ARTIFACT_CHUNK_SIZE = 256 * 1024
+
+# Parallel range downloads, used for artifacts of at least DOWNLOAD_RANGE_MIN_SIZE
+DOWNLOADS_DIRNAME = "downloads"
+DOWNLOAD_RANGE_MIN_SIZE = 16 * 1024 * 1024
+DOWNLOAD_PART_SIZE = 4 * 1024 * 1024
+DOWNLOAD_WORKERS = 4
+DOWNLOAD_PROGRESS_INTERVAL_S = 0.2
+# Ranges are read in small chunks, a dropped connection only loses the chunk in flight
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Background prefetch agent (--agent), prepares the next version between launches
+AGENT_INTERVAL_S = 30 * 60
+AGENT_JITTER = 0.2
+AGENT_NICENESS = 10
+
+# Launch policies, selected with --policy or "launch_policy" in the app's config.json
+LAUNCH_POLICY_BLOCKING = "blocking"  # Check and update before launching
+LAUNCH_POLICY_STALE_WHILE_REVALIDATE = (
+    "stale-while-revalidate"  # Launch the installed build, update in the background
+)
+LAUNCH_POLICIES = [LAUNCH_POLICY_BLOCKING, LAUNCH_POLICY_STALE_WHILE_REVALIDATE]
+DEFAULT_LAUNCH_POLICY = LAUNCH_POLICY_BLOCKING
+DEFAULT_MAX_STALE_VERSIONS = 3
+DEFAULT_MAX_STALE_DAYS = 14
+SECURITY_UPDATE_FIELD = "security_update"
+# Locks are held until their process exits, the timeout only applies to a lock whose PID can't be read
+REVALIDATE_LOCK_TIMEOUT_S = 60 * 60
+# Windows process queries, used to check whether the holder of a lock file still runs
+PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+STILL_ACTIVE = 259
+
+# PyInstaller stages, parsed from its log output, i.e. "8230 INFO: Building PYZ (ZlibArchive) ..."
+PYINSTALLER_STAGES = ["Analysis", "PYZ", "PKG", "EXE", "COLLECT"]
+PYINSTALLER_LOG_PATTERN = re.compile(r"^\d+ (?P<level>[A-Z]+): (?P<message>.*)$")
+PYINSTALLER_STAGE_PATTERN = re.compile(
+    r"^(?:checking|Building) (?P<stage>Analysis|PYZ|PKG|EXE|COLLECT)\b"
+)
+
+# PyInstaller runs in its own process, limits can be overridden with "build_limits" in the app's config.json
+DEFAULT_BUILD_TIMEOUT_S = 30 * 60
+DEFAULT_BUILD_MEMORY_MB = 0  # 0 = unlimited, enforced with RLIMIT_AS (Linux only)
+DEFAULT_BUILD_CPU_S = 0  # 0 = unlimited, enforced with RLIMIT_CPU (Linux only)
+DEFAULT_BUILD_NICENESS = 5
+BUILD_OUTPUT_TAIL_LINES = 20
+BUILD_WATCHDOG_INTERVAL_S = 0.1
+
+# Build modes, selected with "build_mode" in the app's config.json
+BUILD_MODE_FULL = "full"  # PyInstaller analyses the app and all of its dependencies again when any app module changes
+BUILD_MODE_INCREMENTAL = "incremental"  # Dependencies are only analysed again when the app's imports from outside its source change
+BUILD_MODES = [BUILD_MODE_FULL, BUILD_MODE_INCREMENTAL]
+DEFAULT_BUILD_MODE = BUILD_MODE_FULL
+BUILD_DEPENDENCIES_FILENAME = "dependencies.json"
+PYINSTALLER_PYZ_TOC = "PYZ-00.toc"
+BUILD_REQUIREMENTS_PATTERN = re.compile(r"^requirements.*\.txt$")
+INCREMENTAL_SPEC_TEMPLATE = """# Generated by the application launcher, see IncrementalBuild in launcher.py
+import os
+
+app_modules = {app_modules!r}
+
+# Only the stub of the app's external imports is analysed, so app changes never invalidate the cached Analysis
+a = Analysis(
+    [{stub_path!r}],
+    pathex=[{source_dir!r}],
+    binaries=[],
+    datas=[],
+    hiddenimports=[],
+    hookspath=[],
+    hooksconfig={{}},
+    runtime_hooks=[],
+    excludes=[],
+    noarchive=False,
+    optimize=0,
+)
+
+# The app's own script runs in place of the stub, and its own modules go straight into the PYZ
+scripts = [entry for entry in a.scripts if os.path.normpath(entry[1]) != os.path.normpath({stub_path!r})]
+scripts.append(({script_name!r}, {main_script!r}, "PYSOURCE"))
+pure = [entry for entry in a.pure if entry[0] not in app_modules]
+pure += [(name, path, "PYMODULE") for name, path in sorted(app_modules.items())]
+pyz = PYZ(pure)
+
+exe = EXE(
+    pyz,
+    scripts,
+    [],
+    exclude_binaries=True,
+    name={name!r},
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=True,
+    console=False,
+    disable_windowed_traceback=False,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+)
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=True,
+    upx_exclude=[],
+    name={name!r},
+)
+"""
+
+# Launch modes, selected with "launch_mode" in the app's config.json
+LAUNCH_MODE_EXECUTABLE = (
+    "executable"  # Freeze the app with PyInstaller and launch the executable
+)
+LAUNCH_MODE_SOURCE = "source"  # Run the app's source with the interpreter of a virtualenv made for its requirements, nothing is built
+LAUNCH_MODES = [LAUNCH_MODE_EXECUTABLE, LAUNCH_MODE_SOURCE]
+DEFAULT_LAUNCH_MODE = LAUNCH_MODE_EXECUTABLE
+DEFAULT_REQUIREMENTS_FILENAME = (
+    "requirements.txt"  # Overridden with "requirements" in the app's config.json
+)
+
+# Virtualenvs of source launches, shared by every app and version with the same requirements and interpreter
+ENVS_DIRNAME = "envs"
+ENV_MARKER_FILENAME = "launcher_env.json"
+MAX_SOURCE_ENVS = 4
+ENV_LOCK_TIMEOUT_S = 30 * 60
+ENV_LOCK_POLL_INTERVAL_S = 0.5
+SOURCE_COMPILE_EXCLUDE_PATTERN = r"[/\\](build|dist|\.git)[/\\]"
+
+# Wheels installed into source environments, downloaded or built once and shared by every app
+WHEELHOUSE_DIRNAME = "wheels"
+WHEELHOUSE_MAX_SIZE = 2 * 1024**3
+
+# Shared build cache (see build_cache_server.py), archives of dist folders keyed by build fingerprint
+BUILD_CACHE_PATH = "/builds"
+BUILD_CACHE_DIGEST_HEADER = "X-Content-SHA256"
+BUILD_CACHE_SIGNATURE_HEADER = "X-Build-Signature"
+# Uploads need the server's token, builds are signed and verified with a key shared by the launchers only.
+# Both can also be set with --set-build-cache, the environment takes precedence.
+BUILD_CACHE_TOKEN_ENV_VAR = "LAUNCHER_BUILD_CACHE_TOKEN"
+BUILD_CACHE_KEY_ENV_VAR = "LAUNCHER_BUILD_CACHE_KEY"
+# Saved next to REGISTRY_FILENAME but readable by the owner only, apps.json never holds them
+BUILD_CACHE_SECRETS_FILENAME = "build_cache_secrets.json"
+SECRETS_FILE_MODE = 0o600
+
+# Build fingerprinting
+BUILD_MANIFEST_FILENAME = "build_manifest.json"
+FINGERPRINT_EXCLUDED_ROOT_DIRS = ["build", "dist"]
+FINGERPRINT_EXCLUDED_DIRS = [".git", "__pycache__"]
+HASH_CHUNK_SIZE = 1024 * 1024
+HASH_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+# Background worker
+WORKER_POLL_INTERVAL_MS = 100
+WORKER_SHUTDOWN_TIMEOUT_S = 5
+
+# Progress phases reported by the background worker
+PHASE_CHECK = "check"
+PHASE_CLONE = "clone"
+PHASE_PULL = "pull"
+PHASE_DOWNLOAD = "download"
+PHASE_BUILD = "build"
+PHASE_DONE = "done"
+PHASE_ERROR = "error"
+PHASE_CANCELLED = "cancelled"
+FINAL_PHASES = (PHASE_DONE, PHASE_ERROR, PHASE_CANCELLED)
+
+# i.e "Receiving objects:  45% (450/1000), 1.20 MiB | 1.10 MiB/s"
+GIT_PROGRESS_PATTERN = re.compile(
+    r"^(?:remote:\s*)?(?P<stage>[A-Za-z ]+):\s+(?P<percent>\d{1,3})%"
+    r"(?:[^,]*,\s*(?P<size>[\d.]+)\s*(?P<unit>bytes|KiB|MiB|GiB))?"
+)
+BYTE_UNITS = {"bytes": 1, "KiB": 1024, "MiB": 1024**2, "GiB": 1024**3}
+
+
+#! --- Background Worker ---
+class ProgressEvent(NamedTuple):
+    """A single progress update sent from the background worker to the Tk main loop.
+
+    Attributes:
+        phase (str): The pipeline phase this event belongs to, i.e. one of the `PHASE_*` constants.
+        percent (float | None): Progress of the current phase from 0 to 100. None when the progress is unknown.
+        bytes_transferred (int | None): Bytes transferred so far in the current phase. None when unknown.
+        message (str): Human readable status message to display on the loading screen.
+        bytes_per_second (float | None): Current transfer rate. None when unknown.
+    """
+
+    phase: str
+    percent: float | None = None
+    bytes_transferred: int | None = None
+    message: str = ""
+    bytes_per_second: float | None = None
+
+
+class PipelineCancelled(Exception):
+    """Raised inside the background worker once the user has cancelled in-flight work."""
+
+
+class BackgroundWorker:
+    """Runs a target callable on a daemon thread and passes `ProgressEvent`s back through a queue.
+
+    The Tk main loop is expected to drain `events` with `after()` since Tk widgets must only be touched from the main thread.
+    """
+
+    def __init__(self, target: Callable[["BackgroundWorker"], object]):
+        self.target = target
+        self.events: queue.Queue[ProgressEvent] = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.result = None
+        self.error: Exception | None = None
+
+        self._process: subprocess.Popen | None = None
+        self._process_lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._run, name="launcher-worker", daemon=True
+        )
+
+    def start(self):
+        self._thread.start()
+
+    def join(self, timeout: float | None = None):
+        self._thread.join(timeout)
+
+    def is_alive(self) -> bool:
+        return self._thread.is_alive()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.cancel_event.is_set()
+
+    def _run(self):
+        try:
+            self.result = self.target(self)
+        except PipelineCancelled:
+            self.report(PHASE_CANCELLED, message="Cancelled.")
+        except Exception as e:
+            self.error = e
+            self.report(PHASE_ERROR, message=str(e))
+        else:
+            self.report(PHASE_DONE, percent=100, message="Ready to launch.")
+
+    def report(
+        self,
+        phase: str,
+        percent: float | None = None,
+        bytes_transferred: int | None = None,
+        message: str = "",
+        bytes_per_second: float | None = None,
+    ):
+        self.events.put(
+            ProgressEvent(phase, percent, bytes_transferred, message, bytes_per_second)
+        )
+
+    def cancel(self):
+        """Request cancellation and kill any subprocess that is currently running."""
+        self.cancel_event.set()
+        with self._process_lock:
+            if self._process and self._process.poll() is None:
+                self._process.kill()
+
+    def check_cancelled(self):
+        if self.cancelled:
+            raise PipelineCancelled()
+
+    def run_command(self, command: list[str], phase: str) -> int:
+        """Run a subprocess, reporting any git style progress lines as events of the supplied phase.
+
+        Args:
+            command (list[str]): The command and its arguments.
+            phase (str): The phase the reported progress events belong to.
+
+        Returns:
+            int: The return code of the command.
+        """
+        self.check_cancelled()
+
+        # Text mode uses universal newlines, so git's '\r' progress updates arrive as separate lines
+        process = subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            errors="replace",
+        )
+        with self._process_lock:
+            self._process = process
+
+        try:
+            for line in process.stdout:
+                line = line.rstrip()
+                if not line:
+                    continue
+
+                progress = parse_git_progress(line)
+                if progress:
+                    stage, percent, size = progress
+                    self.report(phase, percent, size, message=stage)
+                else:
+                    print(line)
+            return_code = process.wait()
+        finally:
+            with self._process_lock:
+                self._process = None
+
+        self.check_cancelled()
+        return return_code
+
+
+#! --- HTTP Transport ---
+class HttpTransport:
+    """A long-lived `requests.Session` with a tuned connection pool, timeouts and retries.
+
+    Failed connections, timeouts and retryable status codes (5xx/429) are retried with jittered exponential backoff, honouring any `Retry-After` header sent by the server.
+    All remote calls should go through `get_http_transport()` so connections are kept alive and reused.
+    """
+
+    def __init__(
+        self,
+        connect_timeout: float = HTTP_CONNECT_TIMEOUT_S,
+        read_timeout: float = HTTP_READ_TIMEOUT_S,
+        max_retries: int = HTTP_MAX_RETRIES,
+        backoff_base: float = HTTP_BACKOFF_BASE_S,
+        backoff_max: float = HTTP_BACKOFF_MAX_S,
+        pool_connections: int = HTTP_POOL_CONNECTIONS,
+        pool_maxsize: int = HTTP_POOL_MAXSIZE,
+    ):
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        import requests
+        from requests.adapters import HTTPAdapter
+
+        # Retries are handled in `request` so the adapter must not retry as well
+        adapter = HTTPAdapter(
+            pool_connections=pool_connections, pool_maxsize=pool_maxsize, max_retries=0
+        )
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    def request(
+        self, method: str, url: str, max_retries: int | None = None, **kwargs
+    ) -> "requests.Response":
+        """Send a request, retrying connection errors, timeouts and retryable status codes.
+
+        Args:
+            method (str): The HTTP method, i.e. "GET".
+            url (str): The URL to request.
+            max_retries (int | None): Overrides the transport's `max_retries` for this request, 0 sends it only once.
+            **kwargs: Passed on to `requests.Session.request`. A `timeout` defaults to the transport's (connect, read) timeouts.
+
+        Returns:
+            requests.Response: The final response, which may still have a retryable status code once all retries are used up.
+
+        Raises:
+            requests.RequestException: When the last attempt fails with a connection error or timeout.
+        """
+
+        import requests
+
+        kwargs.setdefault("timeout", self.timeout)
+        if max_retries is None:
+            max_retries = self.max_retries
+
+        attempt = 0
+        while True:
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= max_retries:
+                    raise
+                delay = self.backoff_delay(attempt)
+                print(f"{method} {url} failed ({e}), retrying in {delay:.1f}s")
+            else:
+                if (
+                    response.status_code not in HTTP_RETRY_STATUS_CODES
+                    or attempt >= max_retries
+                ):
+                    return response
+
+                retry_after = self.parse_retry_after(
+                    response.headers.get("Retry-After")
+                )
+                delay = (
+                    retry_after
+                    if retry_after is not None
+                    else self.backoff_delay(attempt)
+                )
+                delay = min(delay, self.backoff_max)
+                print(
+                    f"{method} {url} returned {response.status_code}, retrying in {delay:.1f}s"
+                )
+                response.close()
+
+            time.sleep(delay)
+            attempt += 1
+
+    def get(self, url: str, **kwargs) -> "requests.Response":
+        return self.request("GET", url, **kwargs)
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter, so many launchers don't retry in lockstep."""
+        return random.uniform(0, min(self.backoff_max, self.backoff_base * 2**attempt))
+
+    @staticmethod
+    def parse_retry_after(value: str | None) -> float | None:
+        """Parse a `Retry-After` header given either in seconds or as an HTTP date.
+
+        Returns:
+            float | None: Seconds to wait, or None if the header is missing or invalid.
+        """
+
+        if not value:
+            return None
+
+        value = value.strip()
+        if value.isdigit():
+            return float(value)
+
+        from email.utils import parsedate_to_datetime
+
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, retry_at.timestamp() - time.time())
+
+    def close(self):
+        self.session.close()
+
+
+#! --- Caches ---
+_http_cache_lock = threading.Lock()
+
+
+class HttpCache:
+    """On-disk cache of HTTP validators (ETag / Last-Modified) and response bodies keyed by URL.
+
+    Entries look like: {"etag": ..., "last_modified": ..., "body": ..., "fetched_at": ..., "verified_version": ...}
+    where `verified_version` is the local app version that was confirmed to be up to date against this body.
+    """
+
+    def __init__(self, cache_path: str):
+        self.cache_path = cache_path
+        self.entries: dict[str, dict] = read_json_file(cache_path)
+
+    def get(self, url: str) -> dict:
+        return self.entries.get(url, {})
+
+    @staticmethod
+    def is_fresh(entry: dict, ttl: float) -> bool:
+        fetched_at = entry.get("fetched_at", 0)
+        return 0 <= time.time() - fetched_at < ttl
+
+    @staticmethod
+    def conditional_headers(entry: dict) -> dict:
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url: str, body: str, etag: str | None, last_modified: str | None):
+        self.entries[url] = {
+            "etag": etag,
+            "last_modified": last_modified,
+            "body": body,
+            "fetched_at": time.time(),
+            "verified_version": None,
+        }
+        self.save(url)
+
+    def touch(self, url: str):
+        """Mark an entry as freshly revalidated, i.e. after a 304 response."""
+        self.entries[url]["fetched_at"] = time.time()
+        self.save(url)
+
+    def mark_verified(self, url: str, version: str):
+        if url not in self.entries:
+            return
+        self.entries[url]["verified_version"] = str(version)
+        self.save(url)
+
+    def save(self, url: str):
+        """Write a single entry, merging it into the file so apps sharing the cache don't overwrite each other."""
+        try:
+            with _http_cache_lock:
+                entries = read_json_file(self.cache_path)
+                entries[url] = self.entries[url]
+                write_json_atomic(self.cache_path, entries)
+            self.entries = entries
+        except OSError as e:
+            # The cache is an optimisation only, never fail a launch because of it
+            print(f"Failed to write HTTP cache '{self.cache_path}': {e}")
+
+
+class ContentStore:
+    """Content-addressed file store, files are stored once by their sha256 digest and shared by every app version.
+
+    Layout: `<store_dir>/ab/cdef...` for the digest "abcdef...".
+    """
+
+    def __init__(self, store_dir: str):
+        self.store_dir = store_dir
+
+    def get_path(self, digest: str) -> str:
+        return os.path.join(self.store_dir, digest[:2], digest[2:])
+
+    def has(self, digest: str) -> bool:
+        return os.path.exists(self.get_path(digest))
+
+    def add_stream(self, digest: str, chunks) -> int:
+        """Store the content of a stream of byte chunks, verifying it against the expected digest.
+
+        Args:
+            digest (str): The expected sha256 hex digest.
+            chunks (Iterable[bytes]): The content.
+
+        Returns:
+            int: Number of bytes stored.
+
+        Raises:
+            ValueError: When the content doesn't match the expected digest, nothing is stored in that case.
+        """
+
+        import hashlib
+
+        object_path = self.get_path(digest)
+        os.makedirs(os.path.dirname(object_path), exist_ok=True)
+        temp_path = f"{object_path}.{threading.get_ident()}.tmp"
+
+        content_hash = hashlib.sha256()
+        size = 0
+        try:
+            with open(temp_path, "wb") as f:
+                for chunk in chunks:
+                    content_hash.update(chunk)
+                    size += len(chunk)
+                    f.write(chunk)
+
+            if content_hash.hexdigest() != digest:
+                raise ValueError(
+                    f"Content hash mismatch, expected {digest} got {content_hash.hexdigest()}"
+                )
+            os.replace(temp_path, object_path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+
+        return size
+
+    def materialize(self, digest: str, dest_path: str):
+        """Copy a stored object to `dest_path`, replacing any existing file atomically."""
+        os.makedirs(os.path.dirname(dest_path) or ".", exist_ok=True)
+        temp_path = f"{dest_path}.{threading.get_ident()}.tmp"
+        shutil.copyfile(self.get_path(digest), temp_path)
+        os.replace(temp_path, dest_path)
+
+
+#! --- Build Fingerprint ---
+class BuildFingerprint:
+    """Content hash of everything that goes into a PyInstaller build, with a manifest of the last good build.
+
+    The fingerprint covers the app source tree (including its requirements files), the installed packages, the Python and PyInstaller versions, the platform and the PyInstaller arguments.
+    It only contains what affects the build output, so machines with the same setup get the same fingerprint and can share builds through a build cache.
+    File digests are cached in the manifest by [size, mtime_ns], so only files that changed since the last build are re-hashed.
+    """
+
+    def __init__(self, source_dir: str, manifest_path: str):
+        self.source_dir = source_dir
+        self.manifest_path = manifest_path
+        self.manifest = read_json_file(manifest_path)
+        self.file_digests: dict[str, list] = {}
+
+    def scan_source_files(self) -> dict[str, list]:
+        """Walk the source tree and return {relative path: [size, mtime_ns]} for every build input file."""
+
+        source_files = {}
+        pending_dirs = [("", self.source_dir)]
+        while pending_dirs:
+            rel_dir, dir_path = pending_dirs.pop()
+            with os.scandir(dir_path) as entries:
+                for entry in entries:
+                    rel_path = f"{rel_dir}{entry.name}"
+                    if entry.is_dir(follow_symlinks=False):
+                        if entry.name in FINGERPRINT_EXCLUDED_DIRS:
+                            continue
+                        if not rel_dir and entry.name in FINGERPRINT_EXCLUDED_ROOT_DIRS:
+                            continue
+                        pending_dirs.append((f"{rel_path}/", entry.path))
+                    elif entry.is_file():
+                        if rel_path == BUILD_MANIFEST_FILENAME:
+                            continue
+                        file_stat = entry.stat()
+                        source_files[rel_path] = [
+                            file_stat.st_size,
+                            file_stat.st_mtime_ns,
+                        ]
+
+        return source_files
+
+    def compute(self, build_args: list[str]) -> str:
+        """Compute the build fingerprint, hashing changed source files in parallel.
+
+        Args:
+            build_args (list[str]): The arguments passed to PyInstaller.
+
+        Returns:
+            str: Hex digest identifying the build inputs.
+        """
+
+        import hashlib
+        import platform
+
+        cached_digests = self.manifest.get("files", {})
+        self.file_digests = {}
+        changed_files = []
+        for rel_path, file_stat in self.scan_source_files().items():
+            cached = cached_digests.get(rel_path)
+            if cached and cached[:2] == file_stat:
+                self.file_digests[rel_path] = cached
+            else:
+                changed_files.append((rel_path, file_stat))
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        # Only files that changed since the last build are read
+        with ThreadPoolExecutor(max_workers=HASH_WORKERS) as executor:
+            digests = executor.map(
+                hash_file, [os.path.join(self.source_dir, p) for p, _ in changed_files]
+            )
+            for (rel_path, file_stat), digest in zip(changed_files, digests):
+                self.file_digests[rel_path] = [*file_stat, digest]
+
+        fingerprint = hashlib.sha256()
+        for rel_path in sorted(self.file_digests):
+            digest = self.file_digests[rel_path][2]
+            fingerprint.update(f"file {rel_path} {digest}\n".encode())
+        fingerprint.update(
+            f"python {platform.python_implementation()} {platform.python_version()}\n".encode()
+        )
+        fingerprint.update(
+            f"platform {get_platform_tag()} {' '.join(platform.libc_ver())}\n".encode()
+        )
+        fingerprint.update(f"packages {get_installed_packages_digest()}\n".encode())
+        fingerprint.update(
+            f"pyinstaller {get_package_version('pyinstaller')}\n".encode()
+        )
+        fingerprint.update(f"args {json.dumps(build_args)}\n".encode())
+        return fingerprint.hexdigest()
+
+    def record_build(self, fingerprint: str, executable: str):
+        self.manifest = {
+            "fingerprint": fingerprint,
+            "executable": executable,
+            "built_at": time.time(),
+            "files": self.file_digests,
+        }
+        write_json_atomic(self.manifest_path, self.manifest)
+
+
+#! --- Release Artifacts ---
+class HashingReader:
+    """File-like wrapper that hashes and counts everything read through it, so a stream can be verified while it is consumed."""
+
+    def __init__(self, raw, on_read: Callable[[int], None] | None = None):
+        import hashlib
+
+        self.raw = raw
+        self.content_hash = hashlib.sha256()
+        self.size = 0
+        self.on_read = on_read
+
+    def read(self, size: int = -1) -> bytes:
+        data = self.raw.read(size)
+        if data:
+            self.content_hash.update(data)
+            self.size += len(data)
+            if self.on_read:
+                self.on_read(self.size)
+        return data
+
+    def drain(self):
+        """Read the rest of the stream, i.e. the padding after the end of a tar archive, so the digest covers all of it."""
+        while self.read(ARTIFACT_CHUNK_SIZE):
+            pass
+
+    def hexdigest(self) -> str:
+        return self.content_hash.hexdigest()
+
+
+#! --- Range Downloads ---
+class RangeDownloader:
+    """Resumable download of a large file as byte ranges fetched concurrently over the pooled transport.
+
+    The file is preallocated as `<dest_path>.part` and every finished range is recorded in `<dest_path>.part.json`, so an interrupted download resumes with the missing ranges only.
+    A range that fails midway is retried from the last byte received, for as long as every attempt receives some bytes. The sha256 is computed incrementally over the contiguous finished prefix while the ranges land, so verifying the complete file costs nothing extra.
+    Servers that don't support ranges get a plain single stream download.
+    """
+
+    def __init__(
+        self,
+        transport: HttpTransport,
+        url: str,
+        dest_path: str,
+        size: int | None = None,
+        sha256: str | None = None,
+        part_size: int = DOWNLOAD_PART_SIZE,
+        max_workers: int = DOWNLOAD_WORKERS,
+        on_progress: Callable[[int, int, float], None] | None = None,
+        check_cancelled: Callable[[], None] | None = None,
+    ):
+        self.transport = transport
+        self.url = url
+        self.dest_path = dest_path
+        self.size = size
+        self.sha256 = sha256
+        self.part_size = part_size
+        self.max_workers = max_workers
+        self.on_progress = on_progress
+        self.check_cancelled = check_cancelled or (lambda: None)
+
+        self.part_path = f"{dest_path}.part"
+        self.state_path = f"{dest_path}.part.json"
+
+        self._lock = threading.Lock()
+        self._hash_lock = threading.Lock()
+        self._bytes_done = 0
+        self._start_time = time.perf_counter()
+        self._start_bytes = 0
+        self._last_progress = 0.0
+
+    @tracing.traced("range_download")
+    def download(self) -> str:
+        """Download the file to `dest_path`.
+
+        Returns:
+            str: `dest_path`.
+
+        Raises:
+            ValueError: When the server doesn't return the expected size or content.
+            requests.RequestException: When a range still fails after all retries.
+        """
+
+        import hashlib
+        from concurrent.futures import ThreadPoolExecutor
+
+        os.makedirs(os.path.dirname(self.dest_path) or ".", exist_ok=True)
+        size, etag, accepts_ranges = self.probe()
+        if self.size is not None and size is not None and size != self.size:
+            raise ValueError(f"Expected {self.size} bytes, the server has {size}")
+
+        if not accepts_ranges or size is None:
+            self.download_stream()
+            return self.finish()
+
+        state = self.load_state(size, etag)
+        parts = [
+            (start, min(start + self.part_size, size) - 1)
+            for start in range(0, size, self.part_size)
+        ]
+        done = set(state["done"])
+        self._bytes_done = self._start_bytes = sum(
+            end - start + 1 for i, (start, end) in enumerate(parts) if i in done
+        )
+        if done:
+            print(f"Resuming download, {len(done)}/{len(parts)} ranges already done.")
+
+        # The hash can only advance over the contiguous prefix of finished ranges
+        self._content_hash = hashlib.sha256()
+        self._hashed_parts = 0
+        self._done = done
+        self._parts = parts
+        self._etag = etag
+        self._state = state
+        self.advance_hash()
+
+        pending = [i for i in range(len(parts)) if i not in done]
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            for _ in executor.map(self.download_part, pending):
+                pass
+
+        self.advance_hash()
+        return self.finish()
+
+    def probe(self) -> tuple[int | None, str | None, bool]:
+        """Request the first byte to learn the size, the validator and whether ranges are supported."""
+
+        with self.transport.get(
+            self.url, headers={"Range": "bytes=0-0"}, stream=True
+        ) as response:
+            if response.status_code == 206:
+                content_range = response.headers.get("Content-Range", "")
+                total = content_range.rpartition("/")[2]
+                size = int(total) if total.isdigit() else None
+                return size, response.headers.get("ETag"), True
+
+            if response.status_code == 200:
+                length = response.headers.get("Content-Length")
+                return (
+                    (int(length) if length and length.isdigit() else None),
+                    None,
+                    False,
+                )
+
+            raise ValueError(
+                f"Failed to download '{self.url}': HTTP {response.status_code}"
+            )
+
+    def load_state(self, size: int, etag: str | None) -> dict:
+        """Load the saved ranges of an earlier attempt, starting over if the remote file or the part size changed."""
+
+        state = read_json_file(self.state_path)
+        if (
+            state.get("url") == self.url
+            and state.get("size") == size
+            and state.get("etag") == etag
+            and state.get("part_size") == self.part_size
+            and os.path.isfile(self.part_path)
+            and os.path.getsize(self.part_path) == size
+        ):
+            return state
+
+        # Preallocate, so every range can be written in place at its offset
+        with open(self.part_path, "wb") as f:
+            f.truncate(size)
+
+        state = {
+            "url": self.url,
+            "size": size,
+            "etag": etag,
+            "part_size": self.part_size,
+            "done": [],
+        }
+        write_json_atomic(self.state_path, state)
+        return state
+
+    def download_part(self, index: int):
+        import requests
+
+        start, end = self._parts[index]
+        offset = start
+        attempt = 0
+        with open(self.part_path, "r+b") as f:
+            while offset <= end:
+                self.check_cancelled()
+                headers = {"Range": f"bytes={offset}-{end}"}
+                if self._etag:
+                    headers["If-Range"] = self._etag
+
+                attempt_offset = offset
+                try:
+                    with self.transport.get(
+                        self.url, headers=headers, stream=True
+                    ) as response:
+                        if response.status_code != 206:
+                            raise ValueError(
+                                f"Range request failed: HTTP {response.status_code}, the remote file may have changed"
+                            )
+
+                        f.seek(offset)
+                        for chunk in response.iter_content(
+                            chunk_size=DOWNLOAD_CHUNK_SIZE
+                        ):
+                            chunk = chunk[: end - offset + 1]
+                            f.write(chunk)
+                            offset += len(chunk)
+                            self.add_progress(len(chunk))
+                            self.check_cancelled()
+
+                    if offset <= end:
+                        raise requests.ConnectionError(
+                            f"Connection closed at byte {offset} of range {start}-{end}"
+                        )
+                except requests.RequestException as e:
+                    # Keep what was received and ask for the rest of the range, only attempts
+                    # that received nothing count towards the retry limit
+                    if offset > attempt_offset:
+                        attempt = 0
+                    elif attempt >= self.transport.max_retries:
+                        raise
+                    delay = self.transport.backoff_delay(attempt)
+                    print(
+                        f"Range {start}-{end} interrupted ({e}), resuming in {delay:.1f}s"
+                    )
+                    time.sleep(delay)
+                    attempt += 1
+
+        with self._lock:
+            self._done.add(index)
+            self._state["done"] = sorted(self._done)
+            write_json_atomic(self.state_path, self._state)
+        self.advance_hash()
+
+    def advance_hash(self):
+        """Hash the finished ranges that directly follow the already hashed prefix, reading them back from the (cached) part file."""
+
+        with self._hash_lock:
+            with open(self.part_path, "rb") as f:
+                while True:
+                    with self._lock:
+                        if self._hashed_parts not in self._done:
+                            return
+                    start, end = self._parts[self._hashed_parts]
+                    f.seek(start)
+                    remaining = end - start + 1
+                    while remaining:
+                        data = f.read(min(HASH_CHUNK_SIZE, remaining))
+                        self._content_hash.update(data)
+                        remaining -= len(data)
+                    self._hashed_parts += 1
+
+    def download_stream(self):
+        """Fallback for servers without range support, a single stream that can't be resumed."""
+
+        import hashlib
+
+        self._content_hash = hashlib.sha256()
+        with self.transport.get(self.url, stream=True) as response:
+            if response.status_code != 200:
+                raise ValueError(
+                    f"Failed to download '{self.url}': HTTP {response.status_code}"
+                )
+
+            with open(self.part_path, "wb") as f:
+                for chunk in response.iter_content(chunk_size=HASH_CHUNK_SIZE):
+                    self._content_hash.update(chunk)
+                    f.write(chunk)
+                    self.add_progress(len(chunk))
+                    self.check_cancelled()
+
+    def add_progress(self, num_bytes: int):
+        with self._lock:
+            self._bytes_done += num_bytes
+            bytes_done = self._bytes_done
+            now = time.perf_counter()
+            if now - self._last_progress < DOWNLOAD_PROGRESS_INTERVAL_S:
+                return
+            self._last_progress = now
+
+        if self.on_progress:
+            elapsed = max(now - self._start_time, 1e-6)
+            rate = (bytes_done - self._start_bytes) / elapsed
+            self.on_progress(bytes_done, self.size or 0, rate)
+
+    def finish(self) -> str:
+        """Verify the complete file and move it into place."""
+
+        size = os.path.getsize(self.part_path)
+        digest = self._content_hash.hexdigest()
+        try:
+            if self.size is not None and size != self.size:
+                raise ValueError(f"Size mismatch, expected {self.size} got {size}")
+            if self.sha256 and digest != self.sha256:
+                raise ValueError(f"Hash mismatch, expected {self.sha256} got {digest}")
+        except ValueError:
+            # Corrupt content must not be resumed
+            self.discard()
+            raise
+
+        os.replace(self.part_path, self.dest_path)
+        if os.path.exists(self.state_path):
+            os.remove(self.state_path)
+        return self.dest_path
+
+    def discard(self):
+        for path in [self.part_path, self.state_path]:
+            if os.path.exists(path):
+                os.remove(path)
+
+
+#! --- Launch Policy ---
+class LaunchPolicy(NamedTuple):
+    """How a launch treats an installed build that may be out of date.
+
+    Attributes:
+        mode (str): One of the `LAUNCH_POLICY_*` constants.
+        max_stale_versions (int): Stale-while-revalidate only launches a build at most this many versions behind the last seen remote version.
+        max_stale_days (float): Stale-while-revalidate only launches without blocking while the remote was last checked within this many days.
+    """
+
+    mode: str = DEFAULT_LAUNCH_POLICY
+    max_stale_versions: int = DEFAULT_MAX_STALE_VERSIONS
+    max_stale_days: float = DEFAULT_MAX_STALE_DAYS
+
+
+#! --- Build Cache ---
+class BuildCacheClient:
+    """Client of a shared build cache (see build_cache_server.py).
+
+    Builds are stored as `<base_url>/builds/<fingerprint>`, a gzipped tar of the dist folder with its sha256 in the `X-Content-SHA256` header.
+    The uploader signs the fingerprint and sha256 with `key` (HMAC-SHA256) in the `X-Build-Signature` header. A download is only unpacked when
+    the signature matches the sha256 computed locally over the whole archive, so the server can't hand out a build no launcher uploaded.
+    Without a key the cache is not used at all, uploads also need the server's bearer `token`.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        transport: HttpTransport,
+        token: str | None = None,
+        key: str | None = None,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.transport = transport
+        self.token = token
+        self.key = key
+
+    def get_url(self, fingerprint: str) -> str:
+        return f"{self.base_url}{BUILD_CACHE_PATH}/{fingerprint}"
+
+    def sign(self, fingerprint: str, digest: str) -> str:
+        import hashlib
+        import hmac
+
+        message = f"{fingerprint}:{digest}".encode()
+        return hmac.new(self.key.encode(), message, hashlib.sha256).hexdigest()
+
+    def fetch(self, fingerprint: str, dest_dir: str, temp_dir: str) -> bool:
+        """Download the build of `fingerprint` to `temp_dir`, verify its signature and only then unpack it into the empty `dest_dir`.
+
+        Returns:
+            bool: True on a verified hit, False on a miss or any failure, in which case `dest_dir` is emptied again.
+        """
+
+        import hmac
+        import tarfile
+
+        if not self.key:
+            print(
+                f"No build cache key in {BUILD_CACHE_KEY_ENV_VAR} or --set-build-cache, not using the build cache."
+            )
+            return False
+
+        os.makedirs(temp_dir, exist_ok=True)
+        archive_path = os.path.join(
+            temp_dir, f"{fingerprint}.{threading.get_ident()}.download.tar.gz"
+        )
+        try:
+            with self.transport.get(self.get_url(fingerprint), stream=True) as response:
+                if response.status_code != 200:
+                    return False
+
+                signature = response.headers.get(BUILD_CACHE_SIGNATURE_HEADER, "")
+                response.raw.decode_content = True
+                reader = HashingReader(response.raw)
+                with open(archive_path, "wb") as f:
+                    shutil.copyfileobj(reader, f, ARTIFACT_CHUNK_SIZE)
+
+            # Only the locally computed digest counts, whatever digest the server claims
+            if not hmac.compare_digest(
+                signature.lower(), self.sign(fingerprint, reader.hexdigest())
+            ):
+                raise ValueError(f"Invalid signature for build {fingerprint[:12]}")
+
+            with tarfile.open(archive_path, "r:*") as archive:
+                extract_tar_archive(archive, dest_dir)
+        except Exception as e:
+            print(f"Build cache fetch failed: {e}")
+            shutil.rmtree(dest_dir, ignore_errors=True)
+            os.makedirs(dest_dir)
+            return False
+        finally:
+            if os.path.exists(archive_path):
+                os.remove(archive_path)
+
+        return True
+
+    def upload(self, fingerprint: str, dist_dir: str, temp_dir: str):
+        """Archive `dist_dir` and upload it as the build of `fingerprint`, failures are only printed."""
+
+        import tarfile
+
+        if not self.token or not self.key:
+            print(
+                f"No build cache token or key ({BUILD_CACHE_TOKEN_ENV_VAR}, {BUILD_CACHE_KEY_ENV_VAR}), not uploading the build."
+            )
+            return
+
+        os.makedirs(temp_dir, exist_ok=True)
+        archive_path = os.path.join(
+            temp_dir, f"{fingerprint}.{threading.get_ident()}.tar.gz"
+        )
+        try:
+            with tarfile.open(archive_path, "w:gz") as archive:
+                for name in sorted(os.listdir(dist_dir)):
+                    archive.add(os.path.join(dist_dir, name), arcname=name)
+
+            digest = hash_file(archive_path)
+            headers = {
+                "Authorization": f"Bearer {self.token}",
+                BUILD_CACHE_DIGEST_HEADER: digest,
+                BUILD_CACHE_SIGNATURE_HEADER: self.sign(fingerprint, digest),
+            }
+            # Not through `transport.request`, a retried request can't rewind the upload stream
+            with open(archive_path, "rb") as f:
+                response = self.transport.session.put(
+                    self.get_url(fingerprint),
+                    data=f,
+                    headers=headers,
+                    timeout=self.transport.timeout,
+                )
+            if response.status_code not in (200, 201, 204):
+                raise ValueError(f"HTTP {response.status_code}")
+            print(f"Uploaded build {fingerprint[:12]} to the build cache.")
+        except Exception as e:
+            print(f"Build cache upload failed: {e}")
+        finally:
+            if os.path.exists(archive_path):
+                os.remove(archive_path)
+
+
+#! --- Build Worker ---
+class BuildLimits(NamedTuple):
+    """Resource limits of the PyInstaller process.
+
+    Attributes:
+        timeout_s (float): Wall time after which the build is killed, 0 for no limit.
+        memory_mb (int): Address space limit in MiB, 0 for no limit. Linux only.
+        cpu_s (int): CPU time limit in seconds, 0 for no limit. Linux only.
+        niceness (int): Added to the build's niceness, on Windows any positive value selects the below normal priority class.
+    """
+
+    timeout_s: float = DEFAULT_BUILD_TIMEOUT_S
+    memory_mb: int = DEFAULT_BUILD_MEMORY_MB
+    cpu_s: int = DEFAULT_BUILD_CPU_S
+    niceness: int = DEFAULT_BUILD_NICENESS
+
+
+class PyInstallerProcess:
+    """Runs PyInstaller in its own process group, so a crash, `sys.exit` or runaway build never takes the launcher down.
+
+    Its log is parsed line by line into the stages of PYINSTALLER_STAGES. Cancelling the build or running out of time kills
+    the whole process group, including PyInstaller's own subprocesses, and removes the half written work dir.
+    """
+
+    def __init__(
+        self,
+        args: list[str],
+        work_path: str,
+        limits: BuildLimits = BuildLimits(),
+        on_stage: Callable[[str], None] | None = None,
+        is_cancelled: Callable[[], bool] | None = None,
+    ):
+        self.args = args
+        self.work_path = work_path
+        self.limits = limits
+        self.on_stage = on_stage
+        self.is_cancelled = is_cancelled
+        self.process: subprocess.Popen | None = None
+        self.stage: str | None = None
+        self.killed = False
+        self.timed_out = False
+        self.output_tail: deque[str] = deque(maxlen=BUILD_OUTPUT_TAIL_LINES)
+
+    def get_popen_kwargs(self) -> dict:
+        if sys.platform == "win32":
+            creationflags = subprocess.CREATE_NEW_PROCESS_GROUP
+            if self.limits.niceness > 0:
+                creationflags |= subprocess.BELOW_NORMAL_PRIORITY_CLASS
+            if self.limits.memory_mb or self.limits.cpu_s:
+                print("Build memory and CPU limits are not supported on Windows.")
+            return {"creationflags": creationflags}
+
+        # A new session makes PyInstaller the leader of a process group that can be killed as a whole.
+        # The limits are applied from here once it runs, code in a forked child of a threaded process can deadlock.
+        return {"start_new_session": True}
+
+    def run(self) -> int:
+        """Run the build to completion.
+
+        Returns:
+            int: The exit code of PyInstaller.
+
+        Raises:
+            PipelineCancelled: If the build was cancelled, the process is killed first.
+            TimeoutError: If the build took longer than `limits.timeout_s`, the process is killed first.
+        """
+
+        # Text mode uses universal newlines, so lines arrive one at a time
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "PyInstaller", *self.args],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            errors="replace",
+            **self.get_popen_kwargs(),
+        )
+        if sys.platform != "win32":
+            limit_build_process(self.process.pid, self.limits)
+
+        finished = threading.Event()
+        watchdog = threading.Thread(
+            target=self.watch, args=(finished,), name="build-watchdog", daemon=True
+        )
+        watchdog.start()
+        try:
+            for line in self.process.stdout:
+                self.handle_line(line.rstrip())
+            return_code = self.process.wait()
+        finally:
+            finished.set()
+            if self.process.poll() is None:
+                self.kill()
+            self.end_stage()
+
+        if self.killed:
+            # Only once the whole process group is gone, so nothing writes to it anymore
+            shutil.rmtree(self.work_path, ignore_errors=True)
+        if self.timed_out:
+            raise TimeoutError(
+                f"PyInstaller did not finish within {self.limits.timeout_s} s."
+            )
+        if self.killed:
+            raise PipelineCancelled()
+        return return_code
+
+    def watch(self, finished: threading.Event):
+        """Kill the build once it is cancelled or out of time, runs on its own thread since reading the log blocks."""
+
+        deadline = (
+            time.monotonic() + self.limits.timeout_s if self.limits.timeout_s else None
+        )
+        while not finished.wait(BUILD_WATCHDOG_INTERVAL_S):
+            if deadline and time.monotonic() > deadline:
+                self.timed_out = True
+                self.kill()
+                return
+            if self.is_cancelled and self.is_cancelled():
+                self.kill()
+                return
+
+    def kill(self):
+        if self.process is None or self.process.poll() is not None:
+            return
+
+        self.killed = True
+        if sys.platform == "win32":
+            subprocess.run(
+                ["taskkill", "/F", "/T", "/PID", str(self.process.pid)],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+            )
+        else:
+            import signal
+
+            try:
+                os.killpg(self.process.pid, signal.SIGKILL)
+            except ProcessLookupError:
+                pass
+        self.process.wait()
+
+    def handle_line(self, line: str):
+        if not line:
+            return
+
+        print(line)
+        self.output_tail.append(line)
+
+        log = PYINSTALLER_LOG_PATTERN.match(line)
+        stage = PYINSTALLER_STAGE_PATTERN.match(log["message"] if log else line)
+        if not stage or stage["stage"] == self.stage:
+            return
+
+        self.end_stage()
+        self.stage = stage["stage"]
+        tracing.begin(f"pyinstaller_{self.stage.lower()}")
+        if self.on_stage:
+            self.on_stage(self.stage)
+
+    def end_stage(self):
+        if self.stage:
+            tracing.end()
+            self.stage = None
+
+
+#! --- Incremental Builds ---
+class IncrementalBuild:
+    """A PyInstaller build split so that a release which only changes app code doesn't analyse its dependencies again.
+
+    PyInstaller re-runs its whole Analysis, the import graph and binaries of every dependency, as soon as any module it found changed.
+    Here the Analysis only sees a generated stub importing what the app imports from outside its source tree, and the generated spec
+    adds the app's own modules to the PYZ. While the stub is unchanged PyInstaller reuses the Analysis cached in the workpath and only
+    rebuilds the PYZ, EXE and COLLECT steps. A changed dependency set (imports, requirements files or installed packages) builds clean.
+    """
+
+    def __init__(self, source_dir: str, main_script: str, spec_dir: str, name: str):
+        self.source_dir = source_dir
+        self.main_script = main_script
+        self.spec_dir = spec_dir
+        self.name = name
+        self.app_modules: dict[str, str] = {}
+        self.external_imports: set[str] = set()
+        self.dependencies_digest = ""
+
+    @property
+    def dependencies_path(self) -> str:
+        return os.path.join(self.spec_dir, BUILD_DEPENDENCIES_FILENAME)
+
+    def find_app_module(self, module_name: str) -> str | None:
+        """Path of an app module by its dotted name, None when it isn't part of the app source."""
+        base_path = os.path.join(self.source_dir, *module_name.split("."))
+        for path in (f"{base_path}.py", os.path.join(base_path, "__init__.py")):
+            if os.path.isfile(path):
+                return path
+        return None
+
+    def scan(self):
+        """Follow the app's imports from its main script, sorting them into app modules and external import statements.
+
+        Raises:
+            SyntaxError: If an app module can't be parsed.
+        """
+
+        import ast
+
+        pending = [("", self.main_script)]
+        scanned = set()
+        while pending:
+            module_name, path = pending.pop()
+            if path in scanned:
+                continue
+            scanned.add(path)
+            if module_name:
+                self.app_modules[module_name] = path
+
+            with open(path, "rb") as f:
+                tree = ast.parse(f.read(), filename=path)
+
+            package = (
+                module_name
+                if path.endswith("__init__.py")
+                else module_name.rpartition(".")[0]
+            )
+            for node in ast.walk(tree):
+                if isinstance(node, ast.Import):
+                    for alias in node.names:
+                        self.add_import(alias.name, None, pending)
+                elif isinstance(node, ast.ImportFrom):
+                    names = [alias.name for alias in node.names]
+                    if not node.level:
+                        self.add_import(node.module, names, pending)
+                        continue
+
+                    # Relative imports always stay inside the app
+                    package_parts = package.split(".") if package else []
+                    if node.level - 1 > len(package_parts):
+                        continue
+                    base = package_parts[: len(package_parts) - node.level + 1]
+                    if node.module:
+                        base.append(node.module)
+                    if base:
+                        self.add_import(".".join(base), names, pending)
+
+    def add_import(self, module_name: str, names: list[str] | None, pending: list):
+        if module_name == "__future__":
+            return
+
+        if not self.find_app_module(module_name.split(".")[0]):
+            if names is None:
+                self.external_imports.add(f"import {module_name}")
+            else:
+                self.external_imports.add(
+                    f"from {module_name} import {', '.join(sorted(names))}"
+                )
+            return
+
+        # An app module, its parent packages and any submodules imported from it
+        parts = module_name.split(".")
+        candidates = [".".join(parts[:i]) for i in range(1, len(parts) + 1)]
+        candidates += [f"{module_name}.{name}" for name in names or [] if name != "*"]
+        for candidate in candidates:
+            path = self.find_app_module(candidate)
+            if path:
+                pending.append((candidate, path))
+
+    def get_dependencies_digest(self, stub: str) -> str:
+        import hashlib
+
+        fingerprint = hashlib.sha256(stub.encode())
+        for file_name in sorted(os.listdir(self.source_dir)):
+            if BUILD_REQUIREMENTS_PATTERN.match(file_name):
+                digest = hash_file(os.path.join(self.source_dir, file_name))
+                fingerprint.update(f"requirements {file_name} {digest}\n".encode())
+        fingerprint.update(f"python {sys.version}\n".encode())
+        fingerprint.update(f"packages {get_installed_packages_digest()}\n".encode())
+        fingerprint.update(
+            f"pyinstaller {get_package_version('pyinstaller')}\n".encode()
+        )
+        return fingerprint.hexdigest()
+
+    def prepare(self) -> tuple[str, bool]:
+        """Scan the app and write the dependency stub and the spec file.
+
+        Returns:
+            tuple[str, bool]: The spec file to pass to PyInstaller and whether the dependency set changed since the last build, in which case the build should be clean.
+        """
+
+        self.scan()
+        os.makedirs(self.spec_dir, exist_ok=True)
+
+        stub_path = os.path.join(self.spec_dir, f"{self.name}_dependencies.py")
+        stub = "# Generated by the application launcher, the app's imports from outside its source\n"
+        stub += "".join(f"{line}\n" for line in sorted(self.external_imports))
+        # Rewriting an unchanged stub would still invalidate the Analysis, PyInstaller compares mtimes
+        if read_text_file(stub_path) != stub:
+            with open(stub_path, "w") as f:
+                f.write(stub)
+
+        spec_path = os.path.join(self.spec_dir, f"{self.name}.spec")
+        with open(spec_path, "w") as f:
+            f.write(
+                INCREMENTAL_SPEC_TEMPLATE.format(
+                    app_modules=self.app_modules,
+                    stub_path=stub_path,
+                    source_dir=self.source_dir,
+                    script_name=os.path.splitext(os.path.basename(self.main_script))[0],
+                    main_script=self.main_script,
+                    name=self.name,
+                )
+            )
+
+        # PyInstaller only notices changed modules by whole second mtimes, so the app modules are always archived again.
+        # That is cheap next to the Analysis, which stays cached.
+        pyz_toc_path = os.path.join(self.spec_dir, self.name, PYINSTALLER_PYZ_TOC)
+        if os.path.exists(pyz_toc_path):
+            os.remove(pyz_toc_path)
+
+        self.dependencies_digest = self.get_dependencies_digest(stub)
+        recorded = read_json_file(self.dependencies_path).get("digest")
+        return spec_path, recorded != self.dependencies_digest
+
+    def record_dependencies(self):
+        """Record the dependency set of a successful build, a failed build is retried clean."""
+        write_json_atomic(
+            self.dependencies_path,
+            {
+                "digest": self.dependencies_digest,
+                "imports": sorted(self.external_imports),
+            },
+        )
+
+
+#! --- Wheelhouse ---
+class Wheelhouse:
+    """Flat folder of wheels that source environments are installed from, evicted least recently used first.
+
+    Wheel file names already hold the distribution name, version and platform tags, so the folder works as pip's `--find-links`.
+    Requirements are resolved against the wheelhouse alone first, an environment whose wheels are all here is created offline.
+    Otherwise pip downloads the requirements into the wheelhouse, skipping the files it already holds, and sdists are built
+    into wheels once. Either way the environment is installed from the wheelhouse only. The mtime of a wheel is its last use.
+    """
+
+    def __init__(self, wheels_dir: str, max_size: int = WHEELHOUSE_MAX_SIZE):
+        self.wheels_dir = wheels_dir
+        self.max_size = max_size
+
+    def install(
+        self,
+        interpreter: str,
+        requirements_path: str,
+        worker: BackgroundWorker | None = None,
+    ) -> bool:
+        """Install the requirements into the environment of `interpreter` from the wheelhouse, adding any missing wheels to it first.
+
+        Raises:
+            RuntimeError: If the requirements can't be downloaded, resolved or installed.
+
+        Returns:
+            bool: False when a requirement isn't an archive (a local folder or a VCS URL), nothing is installed then.
+        """
+
+        import tempfile
+
+        os.makedirs(self.wheels_dir, exist_ok=True)
+        with tempfile.TemporaryDirectory() as temp_dir:
+            report_path = os.path.join(temp_dir, "report.json")
+            items = self.resolve(interpreter, requirements_path, report_path, worker)
+            if items is None:
+                print("Requirements missing from the wheelhouse, downloading them.")
+                self.fetch(interpreter, requirements_path, temp_dir, worker)
+                items = self.resolve(
+                    interpreter, requirements_path, report_path, worker
+                )
+            if items is None:
+                raise RuntimeError(
+                    f"Failed to resolve the requirements from '{requirements_path}'."
+                )
+
+        if not all("archive_info" in item["download_info"] for item in items):
+            return False
+        wheel_paths = [
+            os.path.join(
+                self.wheels_dir, self.get_file_name(item["download_info"]["url"])
+            )
+            for item in items
+        ]
+        for wheel_path in wheel_paths:
+            os.utime(wheel_path)
+
+        # The resolution is complete, so pip doesn't have to look at dependencies again
+        return_code = run_command(
+            [
+                interpreter,
+                "-m",
+                "pip",
+                "install",
+                "--disable-pip-version-check",
+                "--no-input",
+                "--compile",
+                "--no-index",
+                "--no-deps",
+                *wheel_paths,
+            ],
+            worker=worker,
+            phase=PHASE_BUILD,
+        )
+        if return_code != 0:
+            raise RuntimeError(
+                f"Failed to install the requirements from '{requirements_path}'."
+            )
+
+        self.evict(keep=set(wheel_paths))
+        return True
+
+    def resolve(
+        self,
+        interpreter: str,
+        requirements_path: str,
+        report_path: str,
+        worker: BackgroundWorker | None = None,
+    ) -> list[dict] | None:
+        """Resolve the requirements against the wheelhouse alone with pip's installation report, without installing anything.
+
+        Returns:
+            list[dict] | None: The report's "install" items, None when pip couldn't resolve them.
+        """
+
+        return_code = run_command(
+            [
+                interpreter,
+                "-m",
+                "pip",
+                "install",
+                "--dry-run",
+                "--ignore-installed",
+                "--quiet",
+                "--disable-pip-version-check",
+                "--no-input",
+                "--report",
+                report_path,
+                "--no-index",
+                "--find-links",
+                self.wheels_dir,
+                "-r",
+                requirements_path,
+            ],
+            worker=worker,
+            phase=PHASE_BUILD,
+        )
+        if return_code != 0:
+            return None
+        return read_json_file(report_path).get("install", [])
+
+    def fetch(
+        self,
+        interpreter: str,
+        requirements_path: str,
+        temp_dir: str,
+        worker: BackgroundWorker | None = None,
+    ):
+        """Download the requirements and their dependencies into the wheelhouse with pip, then build the sdists into wheels.
+
+        pip resolves against the index and the wheelhouse together and doesn't download a file its destination already holds,
+        so every missing wheel is downloaded exactly once. A dry run resolve would download them too before pip 23.3.
+        Sharding the download across parallel `pip download --no-deps` runs needs such a resolve first to know the wheels,
+        and measured slower than this single pass in the wheelhouse benchmark.
+
+        Raises:
+            RuntimeError: If pip fails to download the requirements or to build an sdist.
+        """
+
+        return_code = run_command(
+            [
+                interpreter,
+                "-m",
+                "pip",
+                "download",
+                "--quiet",
+                "--disable-pip-version-check",
+                "--no-input",
+                "--dest",
+                self.wheels_dir,
+                "--find-links",
+                self.wheels_dir,
+                "-r",
+                requirements_path,
+            ],
+            worker=worker,
+            phase=PHASE_DOWNLOAD,
+        )
+        if return_code != 0:
+            raise RuntimeError(
+                f"Failed to download the requirements from '{requirements_path}'."
+            )
+
+        # Including sdists left behind by a failed build
+        for name in sorted(os.listdir(self.wheels_dir)):
+            if not name.endswith(".whl"):
+                self.build_wheel(
+                    os.path.join(self.wheels_dir, name), interpreter, temp_dir, worker
+                )
+
+    @staticmethod
+    def get_file_name(url: str) -> str:
+        from urllib.parse import unquote, urlsplit
+
+        file_name = unquote(os.path.basename(urlsplit(url).path))
+        if not file_name or not is_safe_relative_path(file_name):
+            raise ValueError(f"Invalid package URL: '{url}'")
+        return file_name
+
+    def build_wheel(
+        self,
+        sdist_path: str,
+        interpreter: str,
+        temp_dir: str,
+        worker: BackgroundWorker | None = None,
+    ) -> str:
+        """Build the wheel of a downloaded sdist and put it in the wheelhouse in its place, so it is only ever built once.
+
+        Raises:
+            RuntimeError: If pip fails to build the wheel.
+        """
+
+        build_dir = os.path.join(temp_dir, "wheels")
+        os.makedirs(build_dir, exist_ok=True)
+        built = set(os.listdir(build_dir))
+        return_code = run_command(
+            [
+                interpreter,
+                "-m",
+                "pip",
+                "wheel",
+                "--disable-pip-version-check",
+                "--no-input",
+                "--no-deps",
+                "--wheel-dir",
+                build_dir,
+                sdist_path,
+            ],
+            worker=worker,
+            phase=PHASE_BUILD,
+        )
+        new_wheels = [
+            name
+            for name in os.listdir(build_dir)
+            if name not in built and name.endswith(".whl")
+        ]
+        if return_code != 0 or len(new_wheels) != 1:
+            raise RuntimeError(
+                f"Failed to build a wheel of '{os.path.basename(sdist_path)}'."
+            )
+
+        wheel_path = os.path.join(self.wheels_dir, new_wheels[0])
+        shutil.move(os.path.join(build_dir, new_wheels[0]), wheel_path)
+        os.remove(sdist_path)
+        print(f"Built wheel '{new_wheels[0]}'")
+        return wheel_path
+
+    def evict(self, keep: set[str]):
+        """Remove the least recently used wheels until the wheelhouse fits in `max_size`, never those in `keep`."""
+
+        wheels = []
+        for name in os.listdir(self.wheels_dir):
+            if not name.endswith(".whl"):
+                continue
+            path = os.path.join(self.wheels_dir, name)
+            stat = os.stat(path)
+            wheels.append((stat.st_mtime, stat.st_size, path))
+
+        total_size = sum(size for _, size, _ in wheels)
+        for _, size, path in sorted(wheels):
+            if total_size <= self.max_size:
+                break
+            if path in keep:
+                continue
+            os.remove(path)
+            total_size -= size
+            print(f"Evicted wheel '{os.path.basename(path)}'")
+
+
+#! --- Source Environments ---
+class SourceEnvironments:
+    """Virtualenvs for launching apps from source, one per set of requirements and interpreter, kept least recently used.
+
+    An environment lives in `<envs_dir>/<key>/`. The key is a digest of the interpreter and the normalised requirements,
+    so every app and version with the same requirements shares one environment. An environment is only used once its
+    marker file exists, which is written last. The mtime of the marker is its last use. Environments are created in
+    place under a lock file, since a virtualenv can't be moved once made. Requirements are installed from the `wheelhouse` when
+    there is one.
+    """
+
+    def __init__(
+        self,
+        envs_dir: str,
+        wheelhouse: Wheelhouse | None = None,
+        max_envs: int = MAX_SOURCE_ENVS,
+    ):
+        self.envs_dir = envs_dir
+        self.wheelhouse = wheelhouse
+        self.max_envs = max_envs
+
+    def get_env_dir(self, key: str) -> str:
+        return os.path.join(self.envs_dir, key)
+
+    @staticmethod
+    def get_interpreter(env_dir: str) -> str:
+        # Apps are built with --windowed, so on Windows they run without a console as well
+        if sys.platform == "win32":
+            return os.path.join(env_dir, "Scripts", "pythonw.exe")
+        return os.path.join(env_dir, "bin", "python")
+
+    @staticmethod
+    def read_requirements(requirements_path: str) -> list[str]:
+        """The requirement lines of a requirements file and the files it includes, without comments, sorted.
+
+        Returns:
+            list[str]: Empty when the file doesn't exist, the app then only gets the standard library.
+        """
+
+        requirements = set()
+        pending = [requirements_path]
+        read_paths = set()
+        while pending:
+            path = os.path.abspath(pending.pop())
+            if path in read_paths:
+                continue
+            read_paths.add(path)
+
+            content = read_text_file(path) or ""
+            for line in content.splitlines():
+                line = re.sub(r"(^|\s)#.*$", "", line).strip()
+                if not line:
+                    continue
+                include = re.match(r"^(?:-r|--requirement)[\s=]+(.+)$", line)
+                if include:
+                    pending.append(os.path.join(os.path.dirname(path), include[1]))
+                    continue
+                requirements.add(line)
+        return sorted(requirements)
+
+    @staticmethod
+    def get_key(requirements: list[str]) -> str:
+        """Environment key of a set of requirements for the running interpreter, i.e. "py311-3f2a9c0d1e7b4a66"."""
+
+        import hashlib
+        import platform
+
+        identity = {
+            "python": [platform.python_implementation(), platform.python_version()],
+            "platform": get_platform_tag(),
+            "requirements": requirements,
+        }
+        digest = hashlib.sha256(json.dumps(identity).encode()).hexdigest()
+        return f"py{sys.version_info.major}{sys.version_info.minor}-{digest[:16]}"
+
+    def get_ready_interpreter(self, key: str) -> str | None:
+        """Interpreter of a completely created environment, marking it as recently used.
+
+        Returns:
+            str | None: None when the environment doesn't exist (yet).
+        """
+
+        env_dir = self.get_env_dir(key)
+        interpreter = self.get_interpreter(env_dir)
+        try:
+            os.utime(os.path.join(env_dir, ENV_MARKER_FILENAME))
+        except OSError:
+            return None
+        return interpreter if os.path.exists(interpreter) else None
+
+    def ensure(
+        self,
+        key: str,
+        requirements_path: str,
+        worker: BackgroundWorker | None = None,
+    ) -> str:
+        """Get the interpreter of an environment, creating it when there is none with this key.
+
+        Args:
+            key (str): Key from `get_key` of the requirements in `requirements_path`.
+            requirements_path (str): The requirements file to install, may not exist.
+            worker (BackgroundWorker | None, optional): Worker to run the commands on and to check for cancellation. Defaults to None.
+
+        Raises:
+            RuntimeError: If the virtualenv or its requirements couldn't be installed.
+
+        Returns:
+            str: Path to the environment's interpreter.
+        """
+
+        interpreter = self.get_ready_interpreter(key)
+        if interpreter:
+            return interpreter
+
+        env_dir = self.get_env_dir(key)
+        lock_path = f"{env_dir}.lock"
+        while not acquire_lock_file(lock_path, timeout=ENV_LOCK_TIMEOUT_S):
+            # Another launcher is creating the same environment
+            if worker:
+                worker.check_cancelled()
+            time.sleep(ENV_LOCK_POLL_INTERVAL_S)
+
+        try:
+            interpreter = self.get_ready_interpreter(key)
+            if interpreter:
+                return interpreter
+
+            # Anything here without a marker was left behind by a failed or cancelled attempt
+            shutil.rmtree(env_dir, ignore_errors=True)
+            try:
+                self.create(env_dir, requirements_path, worker)
+            except BaseException:
+                shutil.rmtree(env_dir, ignore_errors=True)
+                raise
+        finally:
+            os.remove(lock_path)
+
+        self.evict(keep=key)
+        return self.get_interpreter(env_dir)
+
+    def create(
+        self,
+        env_dir: str,
+        requirements_path: str,
+        worker: BackgroundWorker | None = None,
+    ):
+        import platform
+
+        print(f"Creating environment '{os.path.basename(env_dir)}'")
+        return_code = run_command(
+            [sys.executable, "-m", "venv", env_dir], worker=worker, phase=PHASE_BUILD
+        )
+        if return_code != 0:
+            raise RuntimeError(f"Failed to create the virtualenv '{env_dir}'.")
+
+        requirements = self.read_requirements(requirements_path)
+        interpreter = self.get_interpreter(env_dir)
+        if requirements and not (
+            self.wheelhouse
+            and self.wheelhouse.install(interpreter, requirements_path, worker)
+        ):
+            # pip compiles the installed packages to bytecode, so the first launch doesn't have to
+            return_code = run_command(
+                [
+                    interpreter,
+                    "-m",
+                    "pip",
+                    "install",
+                    "--disable-pip-version-check",
+                    "--no-input",
+                    "--compile",
+                    "-r",
+                    requirements_path,
+                ],
+                worker=worker,
+                phase=PHASE_BUILD,
+            )
+            if return_code != 0:
+                raise RuntimeError(
+                    f"Failed to install the requirements from '{requirements_path}'."
+                )
+
+        write_json_atomic(
+            os.path.join(env_dir, ENV_MARKER_FILENAME),
+            {
+                "python": platform.python_version(),
+                "requirements": requirements,
+                "created_at": time.time(),
+            },
+        )
+
+    def evict(self, keep: str):
+        """Remove the least recently used environments beyond `max_envs`, never `keep` or one that is being created."""
+
+        envs = []
+        for key in os.listdir(self.envs_dir):
+            marker_path = os.path.join(self.get_env_dir(key), ENV_MARKER_FILENAME)
+            if key == keep or not os.path.exists(marker_path):
+                continue
+            if os.path.exists(f"{self.get_env_dir(key)}.lock"):
+                continue
+            envs.append((os.path.getmtime(marker_path), key))
+
+        for _, key in sorted(envs)[: max(0, len(envs) + 1 - self.max_envs)]:
+            # The marker goes first, so a partly removed environment is never used
+            os.remove(os.path.join(self.get_env_dir(key), ENV_MARKER_FILENAME))
+            shutil.rmtree(self.get_env_dir(key), ignore_errors=True)
+            print(f"Evicted environment '{key}'")
+
+
+#! --- Install Slots ---
+class InstallSlots:
+    """Versioned install slots with an atomically swapped pointer to the current one.
+
+    Every build goes into its own slot directory, `<slots_dir>/<slot name>/`, and `slots.json` records the current and previous slot.
+    A slot built ahead of time (i.e. by the prefetch agent) is only staged, the next launch switches to it with `promote_staged`.
+    Switching or rolling back only rewrites `slots.json` (atomically), so a failed or interrupted build never leaves the app without a runnable version.
+    A rollback pins the slot it switches to, no rebuild or staged slot replaces it until the pin is cleared with `unpin`, i.e. when a newer version is published.
+    Files that are unchanged from the current slot are hardlinked, so keeping several versions costs little disk.
+    """
+
+    def __init__(self, slots_dir: str, max_slots: int = MAX_INSTALL_SLOTS):
+        self.slots_dir = slots_dir
+        self.index_path = os.path.join(slots_dir, SLOTS_INDEX_FILENAME)
+        self.max_slots = max_slots
+
+    def load_index(self) -> dict:
+        index = read_json_file(self.index_path)
+        index.setdefault("current", None)
+        index.setdefault("previous", None)
+        index.setdefault("staged", None)
+        index.setdefault("pinned", None)
+        index.setdefault("slots", {})
+        return index
+
+    def get_slot_dir(self, slot_name: str) -> str:
+        return os.path.join(self.slots_dir, slot_name)
+
+    def get_current_dir(self) -> str | None:
+        current = self.load_index()["current"]
+        if not current:
+            return None
+
+        slot_dir = self.get_slot_dir(current)
+        return slot_dir if os.path.isdir(slot_dir) else None
+
+    def get_pinned(self) -> str | None:
+        """The slot pinned by `rollback` while it is still the current slot, None when nothing is pinned."""
+        index = self.load_index()
+        pinned = index["pinned"]
+        if (
+            pinned
+            and pinned == index["current"]
+            and os.path.isdir(self.get_slot_dir(pinned))
+        ):
+            return pinned
+        return None
+
+    def unpin(self):
+        """Let rebuilds and staged slots replace a slot pinned by `rollback` again."""
+        index = self.load_index()
+        if index["pinned"]:
+            index["pinned"] = None
+            write_json_atomic(self.index_path, index)
+
+    def get_latest_version(self) -> str | None:
+        """Version of the staged slot, or of the current one when nothing is staged. None when unknown."""
+        index = self.load_index()
+        latest = index["staged"] or index["current"]
+        return index["slots"].get(latest, {}).get("version") if latest else None
+
+    def find_slot(self, fingerprint: str) -> str | None:
+        for slot_name, slot in self.load_index()["slots"].items():
+            if slot.get("fingerprint") == fingerprint and os.path.isdir(
+                self.get_slot_dir(slot_name)
+            ):
+                return slot_name
+        return None
+
+    def create_staging_dir(self, slot_name: str) -> str:
+        """Return an empty directory to build a slot into, it only becomes a slot once `commit` is called."""
+        staging_dir = os.path.join(self.slots_dir, f".staging-{slot_name}")
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        os.makedirs(staging_dir)
+        return staging_dir
+
+    def commit(self, slot_name: str, staging_dir: str, metadata: dict):
+        """Turn a finished staging directory into a slot, hardlinking files that are unchanged from the current slot."""
+
+        slot_dir = self.get_slot_dir(slot_name)
+        shutil.rmtree(slot_dir, ignore_errors=True)
+        os.replace(staging_dir, slot_dir)
+
+        current_dir = self.get_current_dir()
+        if current_dir and current_dir != slot_dir:
+            saved = hardlink_unchanged_files(
+                source_dir=current_dir, target_dir=slot_dir
+            )
+            if saved:
+                print(
+                    f"Hardlinked unchanged files into slot '{slot_name}', saved {format_bytes(saved)}."
+                )
+
+        index = self.load_index()
+        index["slots"][slot_name] = {**metadata, "built_at": time.time()}
+        write_json_atomic(self.index_path, index)
+
+    def activate(self, slot_name: str):
+        """Atomically make `slot_name` the current slot, keeping the old one as the rollback target."""
+
+        index = self.load_index()
+        if index["current"] != slot_name:
+            index["previous"] = index["current"]
+            index["current"] = slot_name
+            index["pinned"] = None
+            write_json_atomic(self.index_path, index)
+        self.prune()
+
+    def stage(self, slot_name: str):
+        """Mark `slot_name` to become current on the next launch, without touching the running version."""
+
+        index = self.load_index()
+        index["staged"] = None if slot_name == index["current"] else slot_name
+        write_json_atomic(self.index_path, index)
+        self.prune()
+
+    def promote_staged(self) -> str | None:
+        """Make the staged slot current, unless the current slot is pinned by a rollback.
+
+        Returns:
+            str | None: The promoted slot, None when nothing was staged or promoted.
+        """
+
+        index = self.load_index()
+        staged = index["staged"]
+        if not staged or self.get_pinned():
+            return None
+
+        index["staged"] = None
+        if os.path.isdir(self.get_slot_dir(staged)) and staged != index["current"]:
+            index["previous"] = index["current"]
+            index["current"] = staged
+        write_json_atomic(self.index_path, index)
+        return staged
+
+    def rollback(self) -> str | None:
+        """Switch back to the previous slot and pin it, so the version rolled back from isn't rebuilt or promoted again.
+
+        Returns:
+            str | None: The slot that is now current, None when there is nothing to roll back to.
+        """
+
+        index = self.load_index()
+        previous = index["previous"]
+        if not previous or not os.path.isdir(self.get_slot_dir(previous)):
+            return None
+
+        index["previous"], index["current"] = index["current"], previous
+        index["pinned"] = previous
+        index["staged"] = None
+        write_json_atomic(self.index_path, index)
+        return previous
+
+    def prune(self):
+        """Remove the oldest slots beyond `max_slots`, the current, previous and staged slots are always kept."""
+
+        index = self.load_index()
+        keep = {index["current"], index["previous"], index["staged"]}
+        by_age = sorted(
+            index["slots"], key=lambda name: index["slots"][name].get("built_at", 0)
+        )
+
+        removable = [name for name in by_age if name not in keep]
+        excess = len(index["slots"]) - self.max_slots
+        for slot_name in removable[: max(0, excess)]:
+            shutil.rmtree(self.get_slot_dir(slot_name), ignore_errors=True)
+            del index["slots"][slot_name]
+
+        write_json_atomic(self.index_path, index)
+
+
+#! --- Remote Source ---
+class RemoteSource(NamedTuple):
+    """Where remote config files and git data are fetched from, apps are still identified by their GitHub URL.
+
+    Attributes:
+        raw_base_url (str): Server of raw repo files, i.e. `config.json`. Defaults to raw.githubusercontent.com.
+        git_base_url (str | None): Server of git repos as `<git_base_url>/<user>/<project>.git`, None to use the GitHub URL itself.
+    """
+
+    raw_base_url: str = GITHUB_RAW_BASE_URL
+    git_base_url: str | None = None
+
+    @classmethod
+    def from_mirror(cls, mirror_url: str | None) -> "RemoteSource":
+        if not mirror_url:
+            return cls()
+        mirror_url = mirror_url.rstrip("/")
+        return cls(
+            raw_base_url=f"{mirror_url}{MIRROR_RAW_PATH}",
+            git_base_url=f"{mirror_url}{MIRROR_GIT_PATH}",
+        )
+
+
+#! --- Model ---
+class ApplicationModel:
+
+    def __init__(
+        self,
+        application_dir: str,
+        cache_dir: str | None = None,
+        config_cache_ttl: float = CONFIG_CACHE_TTL_S,
+        transport: HttpTransport | None = None,
+        clone_strategy: str = DEFAULT_CLONE_STRATEGY,
+        sparse_paths: list[str] | None = None,
+        name: str = DEFAULT_APP_NAME,
+        github_url: str | None = None,
+        raw_base_url: str = GITHUB_RAW_BASE_URL,
+        git_base_url: str | None = None,
+        build_cache_url: str | None = None,
+        build_cache_token: str | None = None,
+        build_cache_key: str | None = None,
+    ):
+
+        # Define default values
+        self.name = name
+        self.application_dir = application_dir
+        self.github_url = github_url
+        self.raw_base_url = raw_base_url
+        self.git_base_url = git_base_url
+        self.build_cache_url = build_cache_url
+        self.build_cache_token = build_cache_token
+        self.build_cache_key = build_cache_key
+        self.exec_path = None
+        self.interpreter: str | None = None
+        self.update_status = False
+        self.worker: BackgroundWorker | None = None
+        self.speculative_fetch: subprocess.Popen | None = None
+        self.speculative_fetch_started: float | None = None
+        self._transport = transport
+        self.clone_strategy = clone_strategy
+        self.sparse_paths = sparse_paths
+
+        # Remote config cache
+        if cache_dir is None:
+            cache_dir = os.path.join(os.path.dirname(application_dir), CACHE_DIR)
+        self.cache_dir = cache_dir
+        self.config_cache_ttl = config_cache_ttl
+        self.http_cache = HttpCache(os.path.join(cache_dir, HTTP_CACHE_FILENAME))
+        self.content_store = ContentStore(os.path.join(cache_dir, OBJECT_STORE_DIRNAME))
+        self.source_envs = SourceEnvironments(
+            os.path.join(cache_dir, ENVS_DIRNAME),
+            wheelhouse=Wheelhouse(os.path.join(cache_dir, WHEELHOUSE_DIRNAME)),
+        )
+
+        # Built versions live next to the app checkout, so a fresh clone never removes them
+        self.install_slots = InstallSlots(
+            os.path.join(
+                os.path.dirname(application_dir),
+                SLOTS_DIR,
+                os.path.basename(application_dir),
+            )
+        )
+        self.github_config_url = ""
+        self.remote_head_url = ""
+
+        # Record of the install read at startup, see `get_recorded_executable`
+        self.state = LauncherState(
+            LauncherState.get_state_path(cache_dir, application_dir)
+        )
+
+    @tracing.traced("update_pipeline")
+    def run_update_pipeline(
+        self, worker: BackgroundWorker | None = None, activate: bool = True
+    ) -> str:
+        """Check for updates, update and build the application when required and return the executable path.
+
+        This method does not touch any Tk widgets, so it is safe to run on a `BackgroundWorker` thread.
+
+        Args:
+            worker (BackgroundWorker | None, optional): The worker to report progress to and to check for cancellation. Defaults to None.
+            activate (bool, optional): Switch to a new build right away, otherwise it is staged for the next launch and a source app isn't pulled at all. Defaults to True.
+
+        Returns:
+            str: Path to the application executable.
+        """
+
+        self.worker = worker
+        self.report(PHASE_CHECK, message="Checking for updates...")
+
+        try:
+            # Check if app updates are required
+            with startup_profiler.phase("check_app_updates"):
+                self.update_status = self.check_app_updates()
+            self.check_cancelled()
+
+            if self.update_status and not activate and self.is_live_source_checkout():
+                # A source app runs from its checkout, pulling now would swap the code under the running app.
+                # Nothing is marked verified, so the next launch finds the update again and applies it.
+                print("Update found, it is applied on the next launch.")
+                return self.get_source_path()
+
+            if self.update_status:
+                with startup_profiler.phase("perform_app_updates"):
+                    self.perform_app_updates()
+        finally:
+            # Not needed when there is no update, or on any error
+            self.stop_speculative_fetch()
+
+        return self.build_if_required(activate=activate)
+
+    def build_if_required(self, activate: bool = True) -> str:
+        """Build the executable when an update was performed or when it is missing, and return its path.
+
+        Expects `update_status` to be set and any clone or pull to be done already.
+
+        Args:
+            activate (bool, optional): Switch to a new build right away, otherwise it is staged for the next launch. Defaults to True.
+
+        Returns:
+            str: Path to the application executable.
+        """
+
+        if activate:
+            self.install_slots.promote_staged()
+
+        if self.update_status:
+            self.refresh_local_config()
+            # A newer remote version ends a rollback
+            self.install_slots.unpin()
+
+        if self.get_launch_mode() == LAUNCH_MODE_SOURCE:
+            # The checkout itself is launched, only its environment may be missing
+            with startup_profiler.phase("prepare_source_environment"):
+                self.prepare_source_environment()
+        else:
+            self.interpreter = None
+            if self.update_status:
+                with startup_profiler.phase("build_application_executable"):
+                    self.build_application_executable(activate=activate)
+            else:
+                # If no updates are required, check if executable or dist folder exists
+                # Only remake executable if either dont exist, or if an earlier update was pulled but never built
+                self.exec_path = self.get_executable_path()
+                if not os.path.exists(self.exec_path) or self.is_build_outdated():
+                    with startup_profiler.phase("build_application_executable"):
+                        self.build_application_executable(activate=activate)
+
+            # Get executable path
+            self.exec_path = self.get_executable_path()
+
+        self.mark_github_config_verified()
+        self.mark_remote_head_verified()
+        self.save_state()
+        return self.exec_path
+
+    def is_build_outdated(self) -> bool:
+        """Whether the installed build is of another version than the checkout, i.e. an update was pulled but never built.
+
+        A slot pinned by a rollback is older than the checkout on purpose, it is never outdated.
+        """
+
+        if self.get_launch_mode() == LAUNCH_MODE_SOURCE:
+            return False
+        built_version = self.install_slots.get_latest_version()
+        local_version = getattr(self, "local_version", None)
+        return (
+            built_version is not None
+            and str(built_version) != str(local_version)
+            and not self.install_slots.get_pinned()
+        )
+
+    @property
+    def transport(self) -> HttpTransport:
+        # Created on first use, a fresh cache hit never needs the HTTP stack
+        if self._transport is None:
+            self._transport = get_http_transport()
+        return self._transport
+
+    @tracing.traced("fast_path_check")
+    def get_up_to_date_executable(self) -> str | None:
+        """Headless check whether the app can be launched without any clone, pull or build.
+
+        Uses the launcher state record when it is valid and fresh, otherwise the local config and the cached remote config check,
+        so while the cache is fresh no network request is made. A stale cache costs a single probe of the remote with `REMOTE_PROBE_TIMEOUT_S`,
+        when it fails the launcher window takes over instead of retrying without anything on screen.
+
+        Returns:
+            str | None: The executable path when the app is up to date and built, otherwise None.
+        """
+
+        exec_path = self.get_recorded_executable()
+        if exec_path:
+            return exec_path
+
+        if self.check_app_updates(probe=True):
+            # A speculative fetch keeps running for the update pipeline
+            return None
+        self.stop_speculative_fetch()
+
+        # Switch to a version that was prepared in the background since the last launch
+        self.install_slots.promote_staged()
+        if self.is_build_outdated():
+            return None
+
+        exec_path = self.get_installed_executable()
+        if not exec_path:
+            return None
+
+        self.exec_path = exec_path
+        self.save_state()
+        return exec_path
+
+    def get_state_sources(self) -> dict[str, str]:
+        """The files the launcher state record is derived from, any change to them invalidates it."""
+        return {
+            "config": os.path.join(self.application_dir, DEFAULT_CONFIG_FILENAME),
+            "slots": self.install_slots.index_path,
+        }
+
+    def get_recorded_executable(self) -> str | None:
+        """Get the executable from the launcher state record, without reading the app folder, its config or the caches.
+
+        Returns:
+            str | None: The executable path when the record is valid, its remote check is younger than `config_cache_ttl` and the executable exists, otherwise None.
+        """
+
+        with tracing.span("state_read"):
+            record = self.state.load()
+            if not self.state.is_valid(record, self.get_state_sources()):
+                return None
+            if not self.state.is_fresh(record, self.config_cache_ttl):
+                return None
+
+            exec_path = record.get("executable")
+            if not exec_path or not os.path.exists(exec_path):
+                return None
+            # Source launches also need their environment, which may have been evicted
+            interpreter = record.get("interpreter")
+            if interpreter and not os.path.exists(interpreter):
+                return None
+
+        self.exec_path = exec_path
+        self.interpreter = interpreter
+        return exec_path
+
+    def save_state(self):
+        """Record the verified install, so the next launch can skip deriving it again while the remote check is fresh."""
+
+        local_version = getattr(self, "local_version", None)
+        remote_url = self.remote_head_url or self.github_config_url
+        entry = self.http_cache.get(remote_url) if remote_url else {}
+        # Only a remote check that confirmed this version can be reused
+        verified = bool(entry) and entry.get("verified_version") == str(local_version)
+
+        index = self.install_slots.load_index()
+        if index["staged"]:
+            # The next launch has to switch to the staged slot first
+            self.state.clear()
+            return
+        current_slot = index["slots"].get(index["current"], {})
+
+        self.state.save(
+            self.get_state_sources(),
+            github_url=getattr(self, "local_github_url", None) or self.github_url,
+            installed_version=local_version,
+            commit=entry.get("body") if self.remote_head_url else None,
+            fingerprint=current_slot.get("fingerprint"),
+            executable=self.exec_path,
+            interpreter=self.interpreter,
+            remote_checked_at=entry.get("fetched_at") if verified else None,
+            etag=entry.get("etag"),
+        )
+
+    def get_launch_policy(
+        self,
+        mode: str | None = None,
+        max_stale_versions: int | None = None,
+        max_stale_days: float | None = None,
+    ) -> LaunchPolicy:
+        """Get the launch policy, where arguments override the app's `config.json` which overrides the defaults."""
+
+        config = self.get_local_config(dir_path=self.application_dir)
+        config_policy = config.get("launch_policy", {})
+        if isinstance(config_policy, str):
+            config_policy = {"mode": config_policy}
+        if not isinstance(config_policy, dict):
+            config_policy = {}
+
+        policy = LaunchPolicy(
+            mode=mode or config_policy.get("mode", DEFAULT_LAUNCH_POLICY),
+            max_stale_versions=(
+                max_stale_versions
+                if max_stale_versions is not None
+                else config_policy.get("max_stale_versions", DEFAULT_MAX_STALE_VERSIONS)
+            ),
+            max_stale_days=(
+                max_stale_days
+                if max_stale_days is not None
+                else config_policy.get("max_stale_days", DEFAULT_MAX_STALE_DAYS)
+            ),
+        )
+
+        if policy.mode not in LAUNCH_POLICIES:
+            print(
+                f"Unknown launch policy '{policy.mode}', using '{DEFAULT_LAUNCH_POLICY}'."
+            )
+            policy = policy._replace(mode=DEFAULT_LAUNCH_POLICY)
+        return policy
+
+    @tracing.traced("stale_check")
+    def get_stale_executable(self, policy: LaunchPolicy) -> tuple[str | None, bool]:
+        """Stale-while-revalidate check whether the installed build may be launched right away, without any network request.
+
+        The installed build is refused when it is more than `max_stale_versions` behind the last seen remote config, when the remote was last checked more than `max_stale_days` ago, or when the last seen remote config is a newer version with `"security_update": true`.
+
+        Args:
+            policy (LaunchPolicy): The launch policy.
+
+        Returns:
+            tuple[str | None, bool]: (executable path or None, whether the remote should be revalidated in the background).
+        """
+
+        # Even a stale launch starts the newest build there is, a staged one included
+        self.install_slots.promote_staged()
+
+        self.local_config = self.get_local_config(dir_path=self.application_dir)
+        if not self.config_has_required_fields(config=self.local_config):
+            return None, True
+        self.assign_config_fields(config=self.local_config, prefix="local_")
+
+        exec_path = self.get_installed_executable()
+        if not exec_path:
+            return None, True
+
+        gh_url = getattr(self, "local_github_url", None) or self.github_url
+        config_url = self.get_github_config_url(gh_url, raw_base_url=self.raw_base_url)
+        entry = self.http_cache.get(config_url) if config_url else {}
+        if not entry:
+            # Never checked the remote, nothing to judge the staleness by
+            return None, True
+
+        checked_days_ago = (time.time() - entry.get("fetched_at", 0)) / (24 * 60 * 60)
+        if checked_days_ago > policy.max_stale_days:
+            print(
+                f"Remote last checked {checked_days_ago:.1f} days ago, updating first."
+            )
+            return None, True
+
+        remote_config = self.parse_config_body(entry.get("body", ""))
+        installed_version = self.install_slots.get_latest_version()
+        if installed_version is None:
+            installed_version = self.local_version
+        try:
+            versions_behind = int(remote_config.get("version", 0)) - int(
+                installed_version
+            )
+        except (TypeError, ValueError):
+            return None, True
+
+        if versions_behind > 0 and remote_config.get(SECURITY_UPDATE_FIELD):
+            print("Security update available, updating first.")
+            return None, True
+
+        if versions_behind > policy.max_stale_versions:
+            print(
+                f"Installed build is {versions_behind} versions behind, updating first."
+            )
+            return None, True
+
+        revalidate = versions_behind > 0 or not self.http_cache.is_fresh(
+            entry, self.config_cache_ttl
+        )
+        return exec_path, revalidate
+
+    def report(self, phase: str, percent: float | None = None, message: str = ""):
+        if self.worker:
+            self.worker.report(phase, percent=percent, message=message)
+
+    def check_cancelled(self):
+        if self.worker:
+            self.worker.check_cancelled()
+
+    def mark_github_config_verified(self):
+        """Record that the local install is up to date with the cached remote config.
+
+        The next launch can then skip parsing and comparing the remote config while it is fresh or unmodified (304).
+        """
+
+        if not self.github_config_url:
+            return
+
+        self.refresh_local_config()
+        if self.compare_app_version():
+            return
+
+        self.http_cache.mark_verified(
+            self.github_config_url, getattr(self, "local_version", "")
+        )
+
+    def mark_remote_head_verified(self):
+        """Record that the local install is built from the current remote head, for the `commit` change detection.
+
+        A git checkout records its own HEAD, the commit that was actually built, which also covers a first clone that never ran `check_remote_head`.
+        """
+
+        if self.get_change_detection() != CHANGE_DETECTION_COMMIT:
+            return
+
+        github_url = getattr(self, "local_github_url", None) or self.github_url
+        if github_url and self.get_update_mode() == UPDATE_MODE_GIT:
+            local_head = get_local_head(self.application_dir)
+            self.remote_head_url = self.get_git_url(github_url)
+            if (
+                local_head
+                and self.http_cache.get(self.remote_head_url).get("body") != local_head
+            ):
+                self.http_cache.store(
+                    self.remote_head_url, body=local_head, etag=None, last_modified=None
+                )
+
+        if not self.remote_head_url:
+            return
+
+        self.http_cache.mark_verified(
+            self.remote_head_url, getattr(self, "local_version", "")
+        )
+
+    def refresh_local_config(self):
+        """Re-read the local `config.json` after a clone or pull, so a fresh checkout also has its `local_*` fields."""
+        self.local_config = self.get_local_config(dir_path=self.application_dir)
+        self.assign_config_fields(config=self.local_config, prefix="local_")
+
+    def use_slot(self, slot_name: str, activate: bool = True):
+        if activate:
+            self.install_slots.activate(slot_name)
+        else:
+            self.install_slots.stage(slot_name)
+
+    @tracing.traced("build")
+    def build_application_executable(self, activate: bool = True):
+        print(f"Building executable!")
+        self.check_cancelled()
+        self.report(PHASE_BUILD, message="Building executable...")
+
+        # Application folder
+        if not os.path.exists(self.application_dir):
+            os.mkdir(self.application_dir)
+
+        # Application file
+        local_app_file = getattr(self, "local_app_file", None)
+        if not local_app_file:
+            raise AttributeError(f"The attribute 'local_app_file' does not exist.")
+
+        # Use the prebuilt bundle for this platform when the app publishes one
+        artifact = self.get_release_artifact()
+        if artifact and self.install_release_artifact(artifact, activate=activate):
+            return
+
+        self.make_app_file = os.path.join(self.application_dir, local_app_file)
+        if not os.path.exists(self.make_app_file):
+            raise FileNotFoundError(
+                f"App file named '{local_app_file}' does not exist in folder: {self.application_dir}"
+            )
+
+        # Skip PyInstaller if the exact same inputs were already built, switching to that slot if needed
+        build_fingerprint = BuildFingerprint(
+            source_dir=self.application_dir,
+            manifest_path=os.path.join(self.application_dir, BUILD_MANIFEST_FILENAME),
+        )
+        build_mode = self.get_build_mode()
+        build_args = [local_app_file, *PYINSTALLER_BUILD_OPTIONS]
+        if build_mode != BUILD_MODE_FULL:
+            build_args.append(f"build_mode={build_mode}")
+        fingerprint = build_fingerprint.compute(build_args=build_args)
+        built_slot = self.install_slots.find_slot(fingerprint)
+        if built_slot:
+            print(f"Build inputs unchanged ({fingerprint[:12]}), skipping PyInstaller.")
+            self.use_slot(built_slot, activate=activate)
+            return
+
+        # Make executable in a new, inactive slot
+        version = getattr(self, "local_version", None) or 0
+        slot_name = f"v{version}-{fingerprint[:12]}"
+        self.dist_path = self.install_slots.create_staging_dir(slot_name)
+        self.build_path = os.path.join(self.application_dir, "build")
+        metadata = {"version": version, "fingerprint": fingerprint}
+
+        # Another machine with the same build inputs may have built it already
+        build_cache = (
+            BuildCacheClient(
+                self.build_cache_url,
+                self.transport,
+                token=self.build_cache_token,
+                key=self.build_cache_key,
+            )
+            if self.build_cache_url
+            else None
+        )
+        if build_cache:
+            with tracing.span("build_cache_fetch"):
+                cache_hit = build_cache.fetch(
+                    fingerprint,
+                    self.dist_path,
+                    os.path.join(self.cache_dir, DOWNLOADS_DIRNAME),
+                )
+            if cache_hit and os.path.exists(
+                self.get_executable_path(dist_dir=self.dist_path)
+            ):
+                print(f"Build {fingerprint[:12]} found in the build cache.")
+                self.install_slots.commit(slot_name, self.dist_path, metadata=metadata)
+                self.use_slot(slot_name, activate=activate)
+                build_fingerprint.record_build(
+                    fingerprint, executable=self.get_executable_path()
+                )
+                return
+
+        pi_command = [
+            self.make_app_file,
+            *PYINSTALLER_BUILD_OPTIONS,
+            "--distpath",
+            self.dist_path,
+            "--workpath",
+            self.build_path,
+            "-y",
+        ]
+
+        incremental_build = None
+        if build_mode == BUILD_MODE_INCREMENTAL:
+            incremental_build = IncrementalBuild(
+                source_dir=self.application_dir,
+                main_script=self.make_app_file,
+                spec_dir=self.build_path,
+                name=os.path.splitext(local_app_file)[0],
+            )
+            try:
+                spec_path, clean = incremental_build.prepare()
+            except (OSError, SyntaxError, ValueError) as e:
+                print(f"Incremental build not possible, building in full: {e}")
+                incremental_build = None
+            else:
+                print(
+                    "Dependencies changed, building clean."
+                    if clean
+                    else "Dependencies unchanged, reusing the cached analysis."
+                )
+                pi_command = [
+                    spec_path,
+                    "--distpath",
+                    self.dist_path,
+                    "--workpath",
+                    self.build_path,
+                    "-y",
+                    *(["--clean"] if clean else []),
+                ]
+
+        def on_stage(stage: str):
+            percent = PYINSTALLER_STAGES.index(stage) / len(PYINSTALLER_STAGES) * 100
+            self.report(
+                PHASE_BUILD,
+                percent=percent,
+                message=f"Building executable ({stage})...",
+            )
+
+        build = PyInstallerProcess(
+            pi_command,
+            work_path=self.build_path,
+            limits=self.get_build_limits(),
+            on_stage=on_stage,
+            is_cancelled=lambda: bool(self.worker and self.worker.cancelled),
+        )
+        try:
+            with tracing.span("pyinstaller"):
+                return_code = build.run()
+        except (PipelineCancelled, TimeoutError):
+            shutil.rmtree(self.dist_path, ignore_errors=True)
+            raise
+        self.check_cancelled()
+
+        if return_code != 0:
+            raise RuntimeError(
+                f"PyInstaller failed with exit code {return_code}:\n"
+                + "\n".join(build.output_tail)
+            )
+
+        if not os.path.exists(self.get_executable_path(dist_dir=self.dist_path)):
+            raise FileNotFoundError(
+                f"PyInstaller did not create an executable for '{local_app_file}'."
+            )
+        if incremental_build:
+            incremental_build.record_dependencies()
+
+        # Only switch the current slot once the new build is complete
+        self.install_slots.commit(slot_name, self.dist_path, metadata=metadata)
+        self.use_slot(slot_name, activate=activate)
+        build_fingerprint.record_build(
+            fingerprint, executable=self.get_executable_path()
+        )
+
+        # Share the build, the app can be launched meanwhile since the slot never changes once committed.
+        # Not a daemon thread, so the launcher process finishes the upload before it exits.
+        if build_cache:
+            threading.Thread(
+                target=build_cache.upload,
+                args=(
+                    fingerprint,
+                    self.install_slots.get_slot_dir(slot_name),
+                    os.path.join(self.cache_dir, DOWNLOADS_DIRNAME),
+                ),
+                name="build-cache-upload",
+            ).start()
+
+    def get_launch_mode(self) -> str:
+        launch_mode = getattr(self, "local_config", {}).get(
+            "launch_mode", DEFAULT_LAUNCH_MODE
+        )
+        if launch_mode not in LAUNCH_MODES:
+            print(
+                f"Unknown launch mode '{launch_mode}', using '{DEFAULT_LAUNCH_MODE}'."
+            )
+            return DEFAULT_LAUNCH_MODE
+        return launch_mode
+
+    def is_live_source_checkout(self) -> bool:
+        """Whether the app is installed and launched from its checkout, which an update changes in place."""
+        local_app_file = getattr(self, "local_app_file", None)
+        return (
+            self.get_launch_mode() == LAUNCH_MODE_SOURCE
+            and bool(local_app_file)
+            and os.path.exists(os.path.join(self.application_dir, local_app_file))
+        )
+
+    def get_requirements_path(self) -> str:
+        requirements = getattr(self, "local_config", {}).get(
+            "requirements", DEFAULT_REQUIREMENTS_FILENAME
+        )
+        if not isinstance(requirements, str) or not is_safe_relative_path(requirements):
+            print(
+                f"Invalid requirements file '{requirements}', using '{DEFAULT_REQUIREMENTS_FILENAME}'."
+            )
+            requirements = DEFAULT_REQUIREMENTS_FILENAME
+        return os.path.join(self.application_dir, requirements)
+
+    def get_source_path(self) -> str:
+        local_app_file = getattr(self, "local_app_file", None)
+        if not local_app_file:
+            raise ValueError(f"Invalid application filename provided: {local_app_file}")
+        return os.path.join(self.application_dir, local_app_file)
+
+    def get_installed_executable(self) -> str | None:
+        """Get the path to launch the installed app with, without building or creating anything.
+
+        In the `source` launch mode this is the app file, run by `interpreter`, the interpreter of its environment.
+
+        Returns:
+            str | None: The path, None when the app isn't built or its environment doesn't exist.
+        """
+
+        if self.get_launch_mode() == LAUNCH_MODE_SOURCE:
+            try:
+                source_path = self.get_source_path()
+            except ValueError:
+                return None
+
+            requirements = self.source_envs.read_requirements(
+                self.get_requirements_path()
+            )
+            self.interpreter = self.source_envs.get_ready_interpreter(
+                self.source_envs.get_key(requirements)
+            )
+            if not self.interpreter or not os.path.exists(source_path):
+                return None
+            return source_path
+
+        self.interpreter = None
+        try:
+            exec_path = self.get_executable_path()
+        except ValueError:
+            return None
+        return exec_path if os.path.exists(exec_path) else None
+
+    @tracing.traced("source_environment")
+    def prepare_source_environment(self):
+        """Get the virtualenv of the app's requirements, creating it when needed, and precompile the app, in place of a build."""
+
+        self.check_cancelled()
+        self.report(PHASE_BUILD, message="Preparing environment...")
+
+        source_path = self.get_source_path()
+        if not os.path.exists(source_path):
+            raise FileNotFoundError(
+                f"App file named '{self.local_app_file}' does not exist in folder: {self.application_dir}"
+            )
+
+        requirements_path = self.get_requirements_path()
+        key = self.source_envs.get_key(
+            self.source_envs.read_requirements(requirements_path)
+        )
+        self.interpreter = self.source_envs.ensure(
+            key, requirements_path, worker=self.worker
+        )
+
+        # Bytecode for the environment's interpreter, a module that fails to compile is simply compiled again when imported
+        run_command(
+            [
+                self.interpreter,
+                "-m",
+                "compileall",
+                "-q",
+                "-x",
+                SOURCE_COMPILE_EXCLUDE_PATTERN,
+                self.application_dir,
+            ],
+            worker=self.worker,
+            phase=PHASE_BUILD,
+        )
+        self.exec_path = source_path
+
+    def get_build_mode(self) -> str:
+        build_mode = getattr(self, "local_config", {}).get(
+            "build_mode", DEFAULT_BUILD_MODE
+        )
+        if build_mode not in BUILD_MODES:
+            print(f"Unknown build mode '{build_mode}', using '{BUILD_MODE_FULL}'.")
+            return BUILD_MODE_FULL
+        return build_mode
+
+    def get_build_limits(self) -> BuildLimits:
+        """Get the PyInstaller process limits, where "build_limits" in the app's `config.json` overrides the defaults."""
+
+        config_limits = getattr(self, "local_config", {}).get("build_limits", {})
+        if not isinstance(config_limits, dict):
+            config_limits = {}
+
+        limits = BuildLimits()
+        for field in BuildLimits._fields:
+            value = config_limits.get(field)
+            if value is None:
+                continue
+            if not isinstance(value, (int, float)) or value < 0:
+                print(f"Ignoring invalid build limit '{field}': {value}")
+                continue
+            limits = limits._replace(**{field: value})
+        return limits
+
+    def get_release_artifact(self) -> dict | None:
+        """Get the prebuilt bundle advertised for this platform in the app's `config.json`.
+
+        config.json: {"artifacts": {"linux-x86_64": {"url": ..., "size": ..., "sha256": ...}}}, the bundle is a tar archive (optionally gzip, bz2 or xz compressed) of the PyInstaller dist folder.
+
+        Returns:
+            dict | None: The artifact, None when there is no valid artifact for this platform.
+        """
+
+        artifacts = {}
+        for config in [
+            getattr(self, "local_config", {}),
+            getattr(self, "github_config", {}),
+        ]:
+            artifacts = config.get("artifacts", artifacts)
+
+        if not isinstance(artifacts, dict):
+            return None
+
+        platform_tag = get_platform_tag()
+        artifact = artifacts.get(platform_tag)
+        if artifact is None:
+            return None
+
+        if (
+            not isinstance(artifact, dict)
+            or not str(artifact.get("url", "")).startswith(("https://", "http://"))
+            or not isinstance(artifact.get("size"), int)
+            or not re.fullmatch(r"[0-9a-f]{64}", str(artifact.get("sha256")))
+        ):
+            print(f"Ignoring invalid artifact for '{platform_tag}': {artifact}")
+            return None
+
+        return artifact
+
+    @tracing.traced("artifact_install")
+    def install_release_artifact(self, artifact: dict, activate: bool = True) -> bool:
+        """Download a prebuilt bundle, verify it and unpack it into a new install slot.
+
+        Small archives are unpacked straight from the response stream while they are hashed, so they are never held in memory or written to disk as a whole.
+        Archives of at least DOWNLOAD_RANGE_MIN_SIZE are downloaded with a resumable `RangeDownloader` first.
+        The slot only becomes current once the whole download matched its size and sha256.
+
+        Args:
+            artifact (dict): The artifact from `get_release_artifact`.
+            activate (bool, optional): Switch to the new slot right away, otherwise it is staged for the next launch. Defaults to True.
+
+        Returns:
+            bool: True when installed, False when the artifact could not be used and the app must be built locally.
+        """
+
+        import tarfile
+
+        fingerprint = f"artifact-{artifact['sha256']}"
+        installed_slot = self.install_slots.find_slot(fingerprint)
+        if installed_slot:
+            print(f"Prebuilt artifact {artifact['sha256'][:12]} already installed.")
+            self.use_slot(installed_slot, activate=activate)
+            return True
+
+        # The "data" filter rejects absolute paths, links out of the target and device files
+        if not hasattr(tarfile, "data_filter"):
+            print(
+                "Safe tar extraction is not supported by this Python, building locally."
+            )
+            return False
+
+        version = getattr(self, "local_version", None) or 0
+        slot_name = f"v{version}-{artifact['sha256'][:12]}"
+        staging_dir = self.install_slots.create_staging_dir(slot_name)
+        total_bytes = artifact["size"] or 1
+        last_percent = [-1]
+
+        def on_read(size: int):
+            self.check_cancelled()
+            percent = min(100, 100 * size // total_bytes)
+            if percent != last_percent[0]:
+                last_percent[0] = percent
+                if self.worker:
+                    self.worker.report(
+                        PHASE_DOWNLOAD,
+                        percent=percent,
+                        bytes_transferred=size,
+                        message="Downloading prebuilt application...",
+                    )
+
+        def on_progress(bytes_done: int, total: int, bytes_per_second: float):
+            if self.worker:
+                self.worker.report(
+                    PHASE_DOWNLOAD,
+                    percent=min(100, 100 * bytes_done / total_bytes),
+                    bytes_transferred=bytes_done,
+                    message="Downloading prebuilt application...",
+                    bytes_per_second=bytes_per_second,
+                )
+
+        print(f"Downloading prebuilt artifact: {artifact['url']}")
+        try:
+            if artifact["size"] >= DOWNLOAD_RANGE_MIN_SIZE:
+                # Large bundles are fetched as parallel ranges that resume after an interruption
+                archive_path = os.path.join(
+                    self.cache_dir, DOWNLOADS_DIRNAME, artifact["sha256"]
+                )
+                RangeDownloader(
+                    self.transport,
+                    artifact["url"],
+                    archive_path,
+                    size=artifact["size"],
+                    sha256=artifact["sha256"],
+                    on_progress=on_progress,
+                    check_cancelled=self.check_cancelled,
+                ).download()
+
+                with tarfile.open(archive_path, mode="r:*") as archive:
+                    archive.extractall(staging_dir, filter="data")
+                os.remove(archive_path)
+            else:
+                self.unpack_release_artifact_stream(artifact, staging_dir, on_read)
+
+            if not os.path.exists(self.get_executable_path(dist_dir=staging_dir)):
+                raise ValueError("The archive does not contain the app executable.")
+        except PipelineCancelled:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            raise
+        except Exception as e:
+            shutil.rmtree(staging_dir, ignore_errors=True)
+            print(f"Prebuilt artifact failed, building locally: {e}")
+            return False
+
+        self.install_slots.commit(
+            slot_name,
+            staging_dir,
+            metadata={
+                "version": version,
+                "fingerprint": fingerprint,
+                "artifact_url": artifact["url"],
+            },
+        )
+        self.use_slot(slot_name, activate=activate)
+        return True
+
+    def unpack_release_artifact_stream(
+        self, artifact: dict, staging_dir: str, on_read: Callable[[int], None]
+    ):
+        """Unpack a tar archive straight from the response stream while verifying its size and sha256."""
+
+        with self.transport.get(artifact["url"], stream=True) as response:
+            if response.status_code != 200:
+                raise ValueError(f"HTTP {response.status_code}")
+            reader = unpack_tar_stream(response, staging_dir, on_read=on_read)
+
+        if reader.size != artifact["size"]:
+            raise ValueError(
+                f"Size mismatch, expected {artifact['size']} got {reader.size}"
+            )
+        if reader.hexdigest() != artifact["sha256"]:
+            raise ValueError(
+                f"Hash mismatch, expected {artifact['sha256']} got {reader.hexdigest()}"
+            )
+
+    @tracing.traced("perform_app_updates")
+    def perform_app_updates(self):
+
+        save_dir = self.application_dir
+        app_url = self.get_git_url(
+            getattr(self, "local_github_url", None) or self.github_url
+        )
+        clone_options = self.get_clone_options()
+        self.check_cancelled()
+
+        # Check if application directory exist:
+        if not os.path.exists(save_dir):
+            print(f"1. Clone from Github.")
+            os.makedirs(save_dir)
+            #! New view
+            self._clone_github_repo(
+                url=app_url, save_dir=save_dir, worker=self.worker, **clone_options
+            )
+            return
+
+        app_dir_empty = not os.listdir(save_dir)
+        if app_dir_empty:
+            print(f"2. Clone from Github.")
+            #! New view
+            self._clone_github_repo(
+                url=app_url, save_dir=save_dir, worker=self.worker, **clone_options
+            )
+            return
+
+        if self.get_update_mode() == UPDATE_MODE_MANIFEST:
+            try:
+                print(f"3. Delta update from manifest.")
+                self.perform_manifest_update(
+                    url=getattr(self, "local_github_url", None) or self.github_url
+                )
+                return
+            except PipelineCancelled:
+                raise
+            except Exception as e:
+                print(f"Manifest update failed, falling back to git: {e}")
+
+        app_git_filepath = os.path.join(save_dir, ".git")
+        if os.path.exists(app_git_filepath):
+            if self.wait_speculative_fetch():
+                print(f"3. Reset to the speculatively fetched commit.")
+                self._reset_github_repo(save_dir=save_dir, worker=self.worker)
+                return
+
+            print(f"3. Pull from Github.")
+            self._pull_github_repo(url=app_url, save_dir=save_dir, worker=self.worker)
+            return
+
+        # Start from scratch
+        print("4. Delete all and start from scratch.")
+        shutil.rmtree(save_dir, ignore_errors=True)
+        os.mkdir(save_dir)
+        #! New view
+        self._clone_github_repo(
+            url=app_url, save_dir=save_dir, worker=self.worker, **clone_options
+        )
+        return
+
+    @tracing.traced("speculative_fetch_start")
+    def start_speculative_fetch(self):
+        """Start fetching the app repo in the background when it is enabled by the local config, so the fetch overlaps the remote config download.
+
+        Only existing git checkouts are fetched, clones and manifest updates can't be started before the remote config is known.
+        """
+
+        if self.speculative_fetch is not None:
+            return
+
+        local_config = getattr(self, "local_config", None) or {}
+        if not local_config.get("speculative_fetch", DEFAULT_SPECULATIVE_FETCH):
+            return
+        if local_config.get("update_mode", UPDATE_MODE_GIT) != UPDATE_MODE_GIT:
+            return
+        if not os.path.exists(os.path.join(self.application_dir, ".git")):
+            return
+
+        github_url = getattr(self, "local_github_url", None) or self.github_url
+        if not github_url:
+            return
+
+        command = self.get_fetch_command(
+            url=self.get_git_url(github_url), save_dir=self.application_dir
+        )
+        try:
+            self.speculative_fetch = subprocess.Popen(
+                command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL
+            )
+            # The fetch runs alongside the config check, its span ends when it is waited for or stopped
+            self.speculative_fetch_started = tracing.timestamp()
+        except OSError as e:
+            print(f"Failed to start speculative fetch: {e}")
+
+    @tracing.traced("speculative_fetch_wait")
+    def wait_speculative_fetch(self) -> bool:
+        """Wait for the speculative fetch to finish.
+
+        Returns:
+            bool: True when a speculative fetch succeeded and origin/<branch> is up to date, False when there was none or it failed.
+        """
+
+        process = self.speculative_fetch
+        if process is None:
+            return False
+
+        while True:
+            try:
+                return_code = process.wait(timeout=0.1)
+                break
+            except subprocess.TimeoutExpired:
+                self.check_cancelled()
+
+        self.speculative_fetch = None
+        tracing.complete(
+            "speculative_fetch", self.speculative_fetch_started, return_code=return_code
+        )
+        if return_code != 0:
+            print(f"Speculative fetch failed with code {return_code}.")
+        return return_code == 0
+
+    def stop_speculative_fetch(self):
+        """Stop a speculative fetch that is no longer needed, git removes its lock files on SIGTERM."""
+
+        process = self.speculative_fetch
+        self.speculative_fetch = None
+        if process is None:
+            return
+        if process.poll() is not None:
+            tracing.complete(
+                "speculative_fetch",
+                self.speculative_fetch_started,
+                return_code=process.returncode,
+            )
+            return
+
+        process.terminate()
+        try:
+            process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            process.kill()
+            process.wait()
+        tracing.complete(
+            "speculative_fetch", self.speculative_fetch_started, stopped=True
+        )
+
+    def get_git_url(self, github_url: str) -> str:
+        """Get the URL to clone and fetch a GitHub project from, which is the project's repo on the mirror when one is configured."""
+
+        if not self.git_base_url or not validate_github_url(github_url):
+            return github_url
+
+        username, project_name = github_url.rstrip("/").split("/")[-2:]
+        project_name = project_name.removesuffix(".git")
+        return f"{self.git_base_url.rstrip('/')}/{username}/{project_name}.git"
+
+    def get_update_mode(self) -> str:
+        configs = [
+            getattr(self, "local_config", {}),
+            getattr(self, "github_config", {}),
+        ]
+        update_mode = UPDATE_MODE_GIT
+        for config in configs:
+            update_mode = config.get("update_mode", update_mode)
+        return update_mode
+
+    @tracing.traced("manifest_update")
+    def perform_manifest_update(self, url: str):
+        """Update the app by downloading only the files that changed according to the remote file manifest.
+
+        The remote publishes `manifest.json` next to `config.json`: {"files": [{"path": ..., "size": ..., "sha256": ...}]}.
+        Files are diffed against the local tree, missing content is downloaded in parallel into the content-addressed store and then copied into place. Files removed since the last applied manifest are deleted.
+
+        Args:
+            url (str): The Github project URL.
+
+        Raises:
+            ValueError: When the manifest is missing, invalid or a download doesn't match its hash.
+        """
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        manifest_url = self.get_github_config_url(
+            url, DEFAULT_MANIFEST_FILENAME, raw_base_url=self.raw_base_url
+        )
+        if not manifest_url:
+            raise ValueError(f"Invalid GitHub URL: '{url}'")
+
+        response = self.transport.get(
+            manifest_url, headers={"Accept": "application/json"}
+        )
+        if response.status_code != 200:
+            raise ValueError(
+                f"Failed to download manifest: HTTP {response.status_code}"
+            )
+        manifest = self.parse_config_body(response.text)
+        files = self.validate_manifest_files(manifest)
+
+        # Diff the manifest against the local tree
+        changed_files = [f for f in files if not self.is_local_file_current(f)]
+        missing_digests = {
+            f["sha256"]: f["path"]
+            for f in changed_files
+            if not self.content_store.has(f["sha256"])
+        }
+        print(
+            f"Manifest: {len(changed_files)} of {len(files)} files changed, {len(missing_digests)} to download."
+        )
+
+        downloaded = [0, 0]  # files, bytes
+        lock = threading.Lock()
+        total_bytes = (
+            sum(f["size"] for f in files if f["sha256"] in missing_digests) or 1
+        )
+
+        def download(item: tuple[str, str]):
+            digest, path = item
+            self.check_cancelled()
+            blob_url = self.get_github_config_url(
+                url, path, raw_base_url=self.raw_base_url
+            )
+            with self.transport.get(blob_url, stream=True) as blob_response:
+                if blob_response.status_code != 200:
+                    raise ValueError(
+                        f"Failed to download '{path}': HTTP {blob_response.status_code}"
+                    )
+                size = self.content_store.add_stream(
+                    digest, blob_response.iter_content(chunk_size=HASH_CHUNK_SIZE)
+                )
+
+            with lock:
+                downloaded[0] += 1
+                downloaded[1] += size
+                if self.worker:
+                    self.worker.report(
+                        PHASE_PULL,
+                        percent=min(100, 100 * downloaded[1] / total_bytes),
+                        bytes_transferred=downloaded[1],
+                        message=f"Downloaded {downloaded[0]}/{len(missing_digests)} files",
+                    )
+
+        with ThreadPoolExecutor(max_workers=MANIFEST_DOWNLOAD_WORKERS) as executor:
+            list(executor.map(download, missing_digests.items()))
+
+        # Everything is downloaded and verified, only now touch the working tree
+        for file in changed_files:
+            dest_path = os.path.join(self.application_dir, *file["path"].split("/"))
+            self.content_store.materialize(file["sha256"], dest_path)
+
+        applied_manifest_path = os.path.join(
+            self.application_dir, APPLIED_MANIFEST_FILENAME
+        )
+        new_paths = {f["path"] for f in files}
+        for old_file in read_json_file(applied_manifest_path).get("files", []):
+            old_path = old_file.get("path", "")
+            if old_path not in new_paths and is_safe_relative_path(old_path):
+                old_file_path = os.path.join(self.application_dir, *old_path.split("/"))
+                if os.path.isfile(old_file_path):
+                    os.remove(old_file_path)
+
+        write_json_atomic(applied_manifest_path, {"files": files})
+
+    @staticmethod
+    def validate_manifest_files(manifest: dict) -> list[dict]:
+        files = manifest.get("files")
+        if not isinstance(files, list) or not files:
+            raise ValueError("Manifest has no files.")
+
+        for file in files:
+            if not isinstance(file, dict) or not all(
+                field in file for field in ["path", "size", "sha256"]
+            ):
+                raise ValueError(f"Invalid manifest entry: {file}")
+            if not is_safe_relative_path(file["path"]):
+                raise ValueError(f"Unsafe manifest path: '{file['path']}'")
+            if not re.fullmatch(r"[0-9a-f]{64}", str(file["sha256"])):
+                raise ValueError(f"Invalid sha256 for '{file['path']}'")
+
+        return files
+
+    def is_local_file_current(self, file: dict) -> bool:
+        local_path = os.path.join(self.application_dir, *file["path"].split("/"))
+        if (
+            not os.path.isfile(local_path)
+            or os.path.getsize(local_path) != file["size"]
+        ):
+            return False
+        return hash_file(local_path) == file["sha256"]
+
+    def get_clone_options(self) -> dict:
+        """Get the clone strategy and sparse paths, where the app's `config.json` may override the launcher defaults.
+
+        Returns:
+            dict: Keyword arguments for `_clone_github_repo`, i.e. {"strategy": "shallow", "sparse_paths": ["src"]}
+        """
+
+        configs = [
+            getattr(self, "github_config", {}),
+            getattr(self, "local_config", {}),
+        ]
+        strategy = self.clone_strategy
+        sparse_paths = self.sparse_paths
+
+        for config in reversed(configs):
+            strategy = config.get("clone_strategy", strategy)
+            sparse_paths = config.get("sparse_paths", sparse_paths)
+
+        if strategy not in CLONE_STRATEGIES:
+            print(
+                f"Unknown clone strategy '{strategy}', using '{CLONE_STRATEGY_FULL}'."
+            )
+            strategy = CLONE_STRATEGY_FULL
+
+        return {"strategy": strategy, "sparse_paths": sparse_paths}
+
+    @staticmethod
+    def get_clone_args(
+        strategy: str = DEFAULT_CLONE_STRATEGY, sparse_paths: list[str] | None = None
+    ) -> list[str]:
+        """Static method which returns the extra `git clone` arguments for a clone strategy.
+
+        Args:
+            strategy (str, optional): One of CLONE_STRATEGIES which defaults to DEFAULT_CLONE_STRATEGY.
+            sparse_paths (list[str] | None, optional): Directories to limit the checkout to. Files in the repo root are always checked out. Defaults to None (everything).
+
+        Returns:
+            list[str]: The arguments to add to `git clone`.
+        """
+
+        clone_args = ["--single-branch", "--branch", DEFAULT_BRANCH]
+
+        match strategy:
+            case "shallow":
+                clone_args += ["--depth", "1"]
+            case "blobless":
+                clone_args += ["--filter=blob:none"]
+            case _:
+                clone_args = []
+
+        if sparse_paths:
+            clone_args += ["--sparse"]
+
+        return clone_args
+
+    @staticmethod
+    @tracing.traced("git_clone")
+    def _clone_github_repo(
+        url: str,
+        save_dir: str,
+        worker: BackgroundWorker | None = None,
+        strategy: str = DEFAULT_CLONE_STRATEGY,
+        sparse_paths: list[str] | None = None,
+    ):
+        clone_args = ApplicationModel.get_clone_args(strategy, sparse_paths)
+
+        try:
+            run_command(
+                ["git", "clone", "--progress", *clone_args, url, save_dir],
+                worker,
+                PHASE_CLONE,
+            )
+
+            if sparse_paths:
+                # Cone mode: the root files plus the listed directories
+                run_command(
+                    [
+                        "git",
+                        "-C",
+                        save_dir,
+                        "sparse-checkout",
+                        "set",
+                        "--",
+                        *sparse_paths,
+                    ],
+                    worker,
+                    PHASE_CLONE,
+                )
+        except PipelineCancelled:
+            # A half cloned repo would be mistaken for a valid one on the next launch
+            shutil.rmtree(save_dir, ignore_errors=True)
+            raise
+
+    @staticmethod
+    @tracing.traced("git_pull")
+    def _pull_github_repo(
+        url: str, save_dir: str, worker: BackgroundWorker | None = None
+    ):
+        run_command(
+            ApplicationModel.get_fetch_command(url=url, save_dir=save_dir),
+            worker,
+            PHASE_PULL,
+        )
+        ApplicationModel._reset_github_repo(save_dir=save_dir, worker=worker)
+
+    @staticmethod
+    def _reset_github_repo(save_dir: str, worker: BackgroundWorker | None = None):
+        run_command(
+            ["git", "-C", save_dir, "reset", "--hard", f"origin/{DEFAULT_BRANCH}"],
+            worker,
+            PHASE_PULL,
+        )
+
+    @staticmethod
+    def get_fetch_command(url: str, save_dir: str) -> list[str]:
+        """Static method which returns the `git fetch` command updating origin/<branch> of a checkout, without touching its working tree."""
+
+        # Fetch from `url` rather than origin, so a checkout follows a change of remote source (i.e. to a mirror)
+        refspec = f"+refs/heads/{DEFAULT_BRANCH}:refs/remotes/origin/{DEFAULT_BRANCH}"
+        if is_shallow_repo(save_dir):
+            # Only fetch the new tip so the repo stays shallow, a reset is all that is needed after that
+            return [
+                "git",
+                "-C",
+                save_dir,
+                "fetch",
+                "--progress",
+                "--depth",
+                "1",
+                url,
+                refspec,
+            ]
+        return ["git", "-C", save_dir, "fetch", "--progress", url, refspec]
+
+    @tracing.traced("check_app_updates")
+    def check_app_updates(self, probe: bool = False) -> bool:
+        """Check whether the application needs to be updated based on the conditions set in this method.
+
+        Args:
+            probe (bool, optional): Check the remote once with `REMOTE_PROBE_TIMEOUT_S` and no retries, an unreachable remote then counts as requiring an update. Defaults to False.
+
+        Returns:
+            bool: Returns a boolean value indicating whether the application needs to be updates (git clone or git pull).
+            True = Does require an update
+            False = Does not require an update
+        """
+
+        # 1. App dir doesn't exist:
+        if not os.path.isdir(self.application_dir):
+            os.makedirs(self.application_dir)
+            return True  # ! Needs update -> clone fresh: New View
+
+        # 2. App dir empty:
+        app_dir_files = os.listdir(self.application_dir)
+        if not app_dir_files:
+            return True  # ! Needs update -> clone fresh: New View
+
+        # 3. No config in app dir
+        if DEFAULT_CONFIG_FILENAME not in app_dir_files:
+            return True  # ! Needs update -> clone fresh: New View
+
+        # ? Config exists -> get field values
+        # 4. Config file is empty or error reading
+        with tracing.span("config_read"):
+            self.local_config = self.get_local_config(dir_path=self.application_dir)
+        if not self.local_config:
+            return True  # ! Needs update -> clone fresh: New View
+
+        # ? Get fields from config
+        # 5. missing required fields from config (version, app_file, github_url)
+        if not self.config_has_required_fields(config=self.local_config):
+            return True  # ! Needs update -> clone fresh: New View
+
+        # Assign local required fields to class
+        self.assign_config_fields(config=self.local_config, prefix="local_")
+
+        # ? Get config from github
+        # 6. Failed to download config file
+        # 7. Download config file is empty
+        gh_url = getattr(self, f"local_github_url", None) or self.github_url
+        if not gh_url:
+            return True
+
+        # ? Compare the remote head commit instead of the remote config version
+        if self.get_change_detection() == CHANGE_DETECTION_COMMIT:
+            head_changed = self.check_remote_head(url=gh_url, probe=probe)
+            if head_changed is not None:
+                return head_changed
+
+        with tracing.span("remote_fetch"):
+            self.github_config, config_unchanged = self.get_cached_github_config(
+                url=gh_url, probe=probe
+            )
+        if config_unchanged:
+            # Remote config is the one already verified against this install
+            return False
+
+        if not self.github_config:
+            #! Failed to download JSON or JSON empty
+            print(f"github_config failed to load or is empty: {self.github_config = }")
+            return True
+
+        # 8. Config file is missing required fields
+        if not self.config_has_required_fields(config=self.github_config):
+            # ! Needs update -> clone fresh
+            print(
+                f"github_config missing fields to load or is empty: {self.github_config = }"
+            )
+            return True
+
+        # Assign github required fields to class
+        self.assign_config_fields(config=self.github_config, prefix="github_")
+
+        # ? Compare versions for update
+        with tracing.span("version_compare"):
+            return self.compare_app_version()
+
+    @staticmethod
+    def get_local_config(
+        dir_path: str, config_filename: str = DEFAULT_CONFIG_FILENAME
+    ) -> dict:
+        """Static method which reads and returns the local `config.json` file as a dictionary.
+
+        Args:
+            dir_path (str): Folder path where the `config.json` file resides locally.
+            config_filename (str, optional): The name of the `config.json` file which defaults to "config.json".
+
+        Returns:
+            dict: Returns a dictionary containing all fields read from JSON file. Returns empty dict if unable to read or when any other errors occur.
+        """
+
+        config_path = os.path.join(dir_path, config_filename)
+        if not os.path.exists(config_path):
+            return {}
+
+        try:
+            with open(config_path, "r") as f:
+                return json.load(f)
+        except json.JSONDecodeError:
+            return {}
+        return {}
+
+    @staticmethod
+    def config_has_required_fields(
+        config: dict, fields: list[str] = REQUIRED_CONFIG_FIELDS
+    ) -> bool:
+        """Static method which check that provided config dict contains all required attributes/fields.
+
+        Args:
+            config (dict): Contents of `config.json` read into a non-empty dictionary.
+            fields (list[str], optional): The list of fields/attributes expected to appear in the supplied dict which defaults to REQUIRED_CONFIG_FIELDS if no field list is supplied.
+
+        Returns:
+            bool: The returned boolean indicates whether all the required fields appear in the supplied dict. The following conditions determine the returned bool:
+                - Returns `True` when all required fields/attributes appear in supplied dict.
+                - Returns `False` when supplied dict is empty as assumed that there should be a non-empty dict.
+                - Returns `True` when the required fields list is empty as assuming all fields are accounted for.
+        """
+
+        # Empty config dict or empty fields
+        if not config:
+            return False
+
+        if not fields:
+            return True
+
+        return all(field in config for field in fields)
+
+    def assign_config_fields(
+        self,
+        config: dict,
+        prefix: str = "local_",
+        fields: list[str] = REQUIRED_CONFIG_FIELDS,
+    ):
+        """Assign local class attributes values from the supplied config dictionary and fields list.
+
+        Args:
+            config (dict): A dictionary containing fields extracted from a `config.json` file.
+            prefix (str, optional): Provides the prefix for local class attribute names which defaults to "local_".
+            fields (list[str], optional): List of fields which exist in the which defaults to REQUIRED_CONFIG_FIELDS.
+        """
+
+        available_fields = [f for f in fields if f in config]
+        for field in available_fields:
+            provided_config_field = config.get(field, None)
+            class_attr = f"{prefix}{field}"  # i.e version becomes f"local_version
+            setattr(self, class_attr, provided_config_field)
+
+    def compare_app_version(self) -> bool:
+        """Comparing the local app version to the version of the app on the remote version.
+
+        Returns:
+            bool: True if the app requires an update and False if the local app version is up to date. Currently the version check is just comparing int and see if the following is true: (local_version < github_version)
+        """
+        # Currently the version check is just comparing int and see if:
+        # local_version < github_version
+        local_version = getattr(self, "local_version", None)
+        github_version = getattr(self, "github_version", None)
+
+        if not local_version:
+            return True
+
+        if not github_version:
+            return True
+
+        if int(local_version) < int(github_version):
+            return True
+
+        return False
+
+    def get_change_detection(self) -> str:
+        change_detection = getattr(self, "local_config", {}).get(
+            "change_detection", DEFAULT_CHANGE_DETECTION
+        )
+        if change_detection not in CHANGE_DETECTION_MODES:
+            print(
+                f"Unknown change detection '{change_detection}', using '{CHANGE_DETECTION_VERSION}'."
+            )
+            return CHANGE_DETECTION_VERSION
+        return change_detection
+
+    @tracing.traced("remote_head_check")
+    def check_remote_head(self, url: str, probe: bool = False) -> bool | None:
+        """Compare the tip commit of the remote branch with the one the local install was built from.
+
+        The head is recorded in the HTTP cache under the git URL, with the commit as its body. While the entry is fresh and verified no request is made at all,
+        otherwise a single `git ls-remote` replaces the config download and version comparison.
+
+        Args:
+            url (str): The Github project URL, or any URL or path git can fetch from (i.e. a local bare repo).
+            probe (bool, optional): Give `git ls-remote` only `REMOTE_PROBE_TIMEOUT_S`. Defaults to False.
+
+        Returns:
+            bool | None: True when the remote head changed or the install isn't verified against it yet, False when it is up to date,
+            None when the remote head couldn't be read, in which case the remote config is checked instead.
+        """
+
+        git_url = self.get_git_url(url)
+        self.remote_head_url = git_url
+        entry = self.http_cache.get(git_url)
+        local_version = getattr(self, "local_version", None)
+        verified = bool(entry) and entry.get("verified_version") == str(local_version)
+
+        # A head verified for this version within the TTL skips `git ls-remote`
+        if verified and self.http_cache.is_fresh(entry, self.config_cache_ttl):
+            return False
+
+        remote_head = get_remote_head(
+            git_url,
+            timeout=REMOTE_PROBE_TIMEOUT_S if probe else GIT_LS_REMOTE_TIMEOUT_S,
+        )
+        if not remote_head:
+            self.remote_head_url = ""
+            return None
+
+        if entry.get("body") != remote_head:
+            self.http_cache.store(
+                git_url, body=remote_head, etag=None, last_modified=None
+            )
+            return True
+
+        self.http_cache.touch(git_url)
+        # Same head but never verified, i.e. an earlier update of this commit failed to build
+        return not verified
+
+    def get_cached_github_config(
+        self, url: str, probe: bool = False
+    ) -> tuple[dict, bool]:
+        """Get the remote `config.json` through the on-disk HTTP cache using conditional requests.
+
+        A cache entry younger than `config_cache_ttl` is used without any network round trip, otherwise the request is sent with `If-None-Match`/`If-Modified-Since` so an unchanged config costs a 304.
+
+        Args:
+            url (str): The Github project URL where the desired `config.json` file resides.
+            probe (bool, optional): Send the request once with `REMOTE_PROBE_TIMEOUT_S` instead of the transport's timeouts and retries. Defaults to False.
+
+        Returns:
+            tuple[dict, bool]: Returns (config, unchanged). `unchanged` is True when the remote config is the same one that was previously verified against the local app version, in which case JSON parsing is skipped and the config dict is empty.
+        """
+
+        config_url = self.get_github_config_url(url, raw_base_url=self.raw_base_url)
+        self.github_config_url = config_url
+        if not config_url:
+            return {}, False
+
+        entry = self.http_cache.get(config_url)
+        local_version = getattr(self, "local_version", None)
+        verified = bool(entry) and entry.get("verified_version") == str(local_version)
+
+        # Within the TTL the cached config is used as is, without any request
+        if entry and self.http_cache.is_fresh(entry, self.config_cache_ttl):
+            if verified:
+                return {}, True
+            return self.parse_config_body(entry.get("body", "")), False
+
+        # The config needs a network round trip, overlap it with the git fetch an update would need
+        self.start_speculative_fetch()
+
+        headers = {"Accept": "application/json"}
+        headers.update(self.http_cache.conditional_headers(entry))
+
+        if probe:
+            request_options = {
+                "timeout": (REMOTE_PROBE_TIMEOUT_S, REMOTE_PROBE_TIMEOUT_S),
+                "max_retries": 0,
+            }
+        else:
+            request_options = {}
+
+        try:
+            response = self.transport.get(
+                config_url, headers=headers, **request_options
+            )
+        except Exception as e:
+            print(f"Failed to check the remote config '{config_url}': {e}")
+            return {}, False
+
+        if response.status_code == 304 and entry:
+            self.http_cache.touch(config_url)
+            if verified:
+                return {}, True
+            return self.parse_config_body(entry.get("body", "")), False
+
+        if response.status_code != 200:
+            return {}, False
+
+        config = self.parse_config_body(response.text)
+        if config:
+            self.http_cache.store(
+                config_url,
+                body=response.text,
+                etag=response.headers.get("ETag"),
+                last_modified=response.headers.get("Last-Modified"),
+            )
+        return config, False
+
+    @staticmethod
+    def parse_config_body(body: str) -> dict:
+        try:
+            config = json.loads(body)
+        except json.JSONDecodeError:
+            return {}
+        return config if isinstance(config, dict) else {}
+
+    @staticmethod
+    def get_github_config_url(
+        url: str,
+        config_filename: str = DEFAULT_CONFIG_FILENAME,
+        raw_base_url: str = GITHUB_RAW_BASE_URL,
+    ) -> str:
+        """Static method which returns the raw URL of a file, i.e. `config.json`, for the supplied Github Project URL.
+
+        Args:
+            url (str): The Github project URL, i.e. "https://github.com/username/project_name"
+            config_filename (str, optional): The path of the file in the repo which defaults to "config.json".
+            raw_base_url (str, optional): The server serving raw repo files which defaults to GITHUB_RAW_BASE_URL.
+
+        Returns:
+            str: Returns the raw URL of the file. Returns an empty string if the Github Project URL is invalid.
+        """
+
+        # Validate Github URL:
+        # TODO possibly add more validations
+        if not validate_github_url(url):
+            # if not "github.com/" in url:
+            return ""
+
+        # Get the config.json URL
+        split_url = url.rstrip("/").split("/")
+        if len(split_url) < 2:
+            return ""
+
+        from urllib.parse import quote
+
+        username, project_name = split_url[-2:]
+        return f"{raw_base_url.rstrip('/')}/{username}/{project_name}/refs/heads/{DEFAULT_BRANCH}/{quote(config_filename)}"
+
+    # --------------------------------------------------------------------------------------------------------
+
+    # def check_app_updates(self):
+
+    #     if self.github_version > self.local_version:
+    #         print(f"needed to update functions")
+    #         # Clone or Pull github
+    #         print("getting app")
+    #         # self.get_github_app()
+
+    #         # validate application files
+    #         # ...
+
+    #         # Build executable with pyinstaller
+    #         # self.build_app_executable()
+
+    #         return
+
+    #     # No need to update
+    #     self.dist_dir = os.path.join(self.application_dir, "dist")
+    #     if not os.path.exists(self.dist_dir):
+    #         print(f"Error #10: Dist folder doesn't exist.")
+    #         # ! make executable
+
+    #         pyinstaller_command = ...
+
+    #         self.make_app_path = os.path.join(self.application_dir, self.app_file)
+    #         # print(rf"pyinstaller {self.make_app_path} --onedir --windowed")
+    #         PyInstaller.__main__.run(
+    #             [
+    #                 self.make_app_path,
+    #                 "--onedir",
+    #                 "--windowed",
+    #                 "--distpath",
+    #                 f"{os.path.join(self.application_dir, "dist")}",
+    #                 "--workpath",
+    #                 f"{os.path.join(self.application_dir, "build")}",
+    #                 "-y",
+    #             ]
+    #         )
+    #         # subprocess.call(rf"Pyinstaller {self.make_app_path} --onedir --windowed")
+
+    #     exec_dir = os.path.join(self.dist_dir, "app")
+    #     if not os.path.exists(exec_dir):
+    #         print(f"Error #11: Application executable doesn't exist.")
+    #         # ! make executable
+
+    #         self.make_app_path = os.path.join(self.application_dir, self.app_file)
+    #         # print(rf"pyinstaller {self.make_app_path} --onedir --windowed")
+    #         PyInstaller.__main__.run(
+    #             [
+    #                 self.make_app_path,
+    #                 "--onedir",
+    #                 "--windowed",
+    #                 "--distpath",
+    #                 f"{os.path.join(self.application_dir, "dist")}",
+    #                 "--workpath",
+    #                 f"{os.path.join(self.application_dir, "build")}",
+    #                 "-y",
+    #             ]
+    #         )
+
+    #     # Launch app and close launcher
+    #     print(f"Success #12: Launching app.")
+    #     self.exec_path = self.get_executable_path(self.application_dir, self.app_file)
+
+    # --------------------------------------------------------------------------------------------------------
+
+    # @staticmethod
+    # def get_executable_path(application_dir: str, app_filename: str) -> str:
+    def get_executable_path(self, dist_dir: str | None = None) -> str:
+
+        import platform
+
+        # Define variables
+        application_dir = self.application_dir
+        app_filename = getattr(self, "local_app_file", None)
+
+        if not app_filename:
+            raise ValueError(f"Invalid application filename provided: {app_filename}")
+        app_name = app_filename.split(".")[0]  # remove .py
+
+        # Get executable name with extension based on platform
+        sys_platform = platform.system()
+        match sys_platform:
+            case "Windows":
+                executable_name = f"{app_name}.exe"
+            case _:
+                executable_name = f"{app_name}"
+
+        # The current install slot, or the 'dist' folder of builds made before install slots
+        if dist_dir is None:
+            dist_dir = self.install_slots.get_current_dir() or os.path.join(
+                application_dir, "dist"
+            )
+
+        # Return executable path: #! may not exist
+        return os.path.join(dist_dir, app_name, executable_name)
+
+
+#! --- Application Registry ---
+class ApplicationRegistry:
+    """The applications managed by this launcher, stored in `apps.json` next to APPLICATION_DIR.
+
+    Every app has its own directory (and so its own `config.json`, checkout and build). The default app always lives in APPLICATION_DIR, registered apps live in APPS_DIR.
+    """
+
+    def __init__(self, root_dir: str):
+        self.root_dir = root_dir
+        self.registry_path = os.path.join(root_dir, REGISTRY_FILENAME)
+        self.secrets_path = os.path.join(root_dir, BUILD_CACHE_SECRETS_FILENAME)
+        self.cache_dir = os.path.join(root_dir, CACHE_DIR)
+        registry = read_json_file(self.registry_path)
+        secrets = read_json_file(self.secrets_path)
+        self.apps: dict[str, dict] = {DEFAULT_APP_NAME: {"github_url": None}}
+        self.apps.update(registry.get("apps", {}))
+        self.mirror_url: str | None = registry.get("mirror_url")
+        self.remote = RemoteSource.from_mirror(self.mirror_url)
+        self.build_cache_url: str | None = registry.get("build_cache_url")
+        # Older launchers saved the secrets in apps.json, the next save moves them out
+        self.build_cache_token: str | None = secrets.get(
+            "build_cache_token"
+        ) or registry.get("build_cache_token")
+        self.build_cache_key: str | None = secrets.get(
+            "build_cache_key"
+        ) or registry.get("build_cache_key")
+
+    def register(self, name: str, github_url: str):
+        if not APP_NAME_PATTERN.match(name):
+            raise ValueError(f"Invalid application name: '{name}'")
+
+        if not validate_github_url(github_url):
+            raise ValueError(f"Invalid GitHub URL: '{github_url}'")
+
+        self.apps[name] = {"github_url": github_url}
+        self.save()
+
+    def unregister(self, name: str):
+        self.apps.pop(name, None)
+        self.save()
+
+    def set_mirror(self, mirror_url: str | None):
+        """Fetch configs and git data of all apps from a LAN mirror (see mirror_server.py), None to go back to GitHub."""
+
+        if mirror_url and not mirror_url.startswith(("http://", "https://")):
+            raise ValueError(f"Invalid mirror URL: '{mirror_url}'")
+
+        self.mirror_url = mirror_url or None
+        self.remote = RemoteSource.from_mirror(self.mirror_url)
+        self.save()
+
+    def set_build_cache(
+        self,
+        build_cache_url: str | None,
+        token: str | None = None,
+        key: str | None = None,
+    ):
+        """Share builds through a build cache server (see build_cache_server.py), None to always build locally.
+
+        Args:
+            build_cache_url (str | None): The URL of the build cache server.
+            token (str | None, optional): The bearer token the server requires for uploads. Defaults to None (keep the current one).
+            key (str | None, optional): The key builds are signed and verified with, the same on every launcher sharing the cache. Defaults to None (keep the current one).
+        """
+
+        if build_cache_url and not build_cache_url.startswith(("http://", "https://")):
+            raise ValueError(f"Invalid build cache URL: '{build_cache_url}'")
+
+        self.build_cache_url = build_cache_url or None
+        if token is not None:
+            self.build_cache_token = token or None
+        if key is not None:
+            self.build_cache_key = key or None
+        if not self.build_cache_url:
+            self.build_cache_token = self.build_cache_key = None
+        self.save()
+
+    def save(self):
+        registry = {"apps": self.apps}
+        if self.mirror_url:
+            registry["mirror_url"] = self.mirror_url
+        if self.build_cache_url:
+            registry["build_cache_url"] = self.build_cache_url
+        write_json_atomic(self.registry_path, registry)
+
+        secrets = {}
+        if self.build_cache_token:
+            secrets["build_cache_token"] = self.build_cache_token
+        if self.build_cache_key:
+            secrets["build_cache_key"] = self.build_cache_key
+        if secrets:
+            write_json_atomic(self.secrets_path, secrets, mode=SECRETS_FILE_MODE)
+        elif os.path.exists(self.secrets_path):
+            os.remove(self.secrets_path)
+
+    def get_application_dir(self, name: str) -> str:
+        if name == DEFAULT_APP_NAME:
+            return os.path.join(self.root_dir, APPLICATION_DIR)
+        return os.path.join(self.root_dir, APPS_DIR, name)
+
+    def get_model(self, name: str) -> ApplicationModel:
+        if name not in self.apps:
+            raise KeyError(f"Application '{name}' is not registered.")
+
+        return ApplicationModel(
+            application_dir=self.get_application_dir(name),
+            cache_dir=self.cache_dir,
+            name=name,
+            github_url=self.apps[name].get("github_url"),
+            raw_base_url=self.remote.raw_base_url,
+            git_base_url=self.remote.git_base_url,
+            build_cache_url=self.build_cache_url,
+            build_cache_token=os.environ.get(BUILD_CACHE_TOKEN_ENV_VAR)
+            or self.build_cache_token,
+            build_cache_key=os.environ.get(BUILD_CACHE_KEY_ENV_VAR)
+            or self.build_cache_key,
+        )
+
+    def get_models(self) -> list[ApplicationModel]:
+        """Return the models of all apps, skipping apps that are neither installed nor have a GitHub URL."""
+        return [
+            self.get_model(name)
+            for name, app in self.apps.items()
+            if app.get("github_url") or os.path.isdir(self.get_application_dir(name))
+        ]
+
+    @staticmethod
+    def check_all_app_updates(
+        models: list[ApplicationModel],
+        max_workers: int = MAX_CONCURRENT_UPDATE_CHECKS,
+    ) -> dict[str, bool | Exception]:
+        """Run `check_app_updates` for all apps concurrently, so the whole suite is checked in about the time of the slowest check.
+
+        Args:
+            models (list[ApplicationModel]): The apps to check.
+            max_workers (int, optional): Maximum number of concurrent checks which defaults to MAX_CONCURRENT_UPDATE_CHECKS.
+
+        Returns:
+            dict[str, bool | Exception]: The update status per app name, or the exception raised while checking it.
+        """
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        def check(model: ApplicationModel) -> bool | Exception:
+            try:
+                return model.check_app_updates()
+            except Exception as e:
+                return e
+
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            results = list(executor.map(check, models))
+
+        return {model.name: result for model, result in zip(models, results)}
+
+    def refresh_all_apps(
+        self, max_workers: int = MAX_CONCURRENT_UPDATE_CHECKS, activate: bool = True
+    ):
+        """Check every registered app for updates in parallel, then update and build the ones that need it.
+
+        Clones and pulls run concurrently. Builds run one at a time since PyInstaller is not thread safe.
+
+        Args:
+            max_workers (int, optional): Maximum number of concurrent checks and updates. Defaults to MAX_CONCURRENT_UPDATE_CHECKS.
+            activate (bool, optional): Switch to new builds right away, otherwise they are staged for the next launch. Defaults to True.
+        """
+
+        from concurrent.futures import ThreadPoolExecutor
+
+        models = self.get_models()
+        results = self.check_all_app_updates(models, max_workers=max_workers)
+
+        for name, result in results.items():
+            status = "update required" if result is True else "up to date"
+            if isinstance(result, Exception):
+                status = f"check failed ({result})"
+            print(f"{name}: {status}")
+
+        def update(model: ApplicationModel) -> Exception | None:
+            try:
+                model.perform_app_updates()
+            except Exception as e:
+                print(f"{model.name}: update failed ({e})")
+                return e
+
+        # Clones and pulls only wait on the network and git, so run them concurrently
+        outdated = [model for model in models if results[model.name] is True]
+        with ThreadPoolExecutor(max_workers=max(1, max_workers)) as executor:
+            for model, error in zip(outdated, executor.map(update, outdated)):
+                if error:
+                    results[model.name] = error
+
+        for model in models:
+            model.stop_speculative_fetch()
+            if isinstance(results[model.name], Exception):
+                continue
+
+            model.update_status = results[model.name]
+            try:
+                model.build_if_required(activate=activate)
+            except Exception as e:
+                print(f"{model.name}: build failed ({e})")
+
+
+#! --- Main Logic ---
+
+
+def validate_github_url(url: str) -> bool:
+
+    # Check if url is not empty
+    if not url:
+        print(f"Invalid empty URL provided.")
+        return False
+
+    # Match Github URL to this pattern
+    # https://github.com/username/projectname
+    github_url_pattern = re.compile(
+        r"^https:\/\/github\.com\/[A-Za-z0-9_.-]+\/[A-Za-z0-9_.-]+(\/)?$"
+    )
+
+    if github_url_pattern.match(url):
+        return True
+    else:
+        return False
+
+
+_http_transport: HttpTransport | None = None
+_http_transport_lock = threading.Lock()
+
+
+def get_http_transport() -> HttpTransport:
+    """Return the process wide `HttpTransport`, creating it on first use."""
+    global _http_transport
+
+    with _http_transport_lock:
+        if _http_transport is None:
+            _http_transport = HttpTransport()
+        return _http_transport
+
+
+def get_platform_tag() -> str:
+    """Platform key of prebuilt artifacts, i.e "linux-x86_64", "win32-amd64" or "darwin-arm64"."""
+
+    import platform
+
+    return f"{sys.platform}-{platform.machine().lower()}"
+
+
+def parse_git_progress(line: str) -> tuple[str, float, int | None] | None:
+    """Parse a git `--progress` line into its stage, percentage and transferred bytes.
+
+    Args:
+        line (str): A single line of git output, i.e. "Receiving objects:  45% (450/1000), 1.20 MiB | 1.10 MiB/s".
+
+    Returns:
+        tuple[str, float, int | None] | None: Returns (stage, percent, bytes) or None when the line is not a progress line. Bytes is None when git didn't report a size.
+    """
+
+    match = GIT_PROGRESS_PATTERN.match(line)
+    if not match:
+        return None
+
+    size = None
+    if match.group("size"):
+        size = int(float(match.group("size")) * BYTE_UNITS[match.group("unit")])
+
+    return match.group("stage").strip(), float(match.group("percent")), size
+
+
+def format_bytes(num_bytes: int) -> str:
+    size = float(num_bytes)
+    for unit in ["B", "KiB", "MiB"]:
+        if size < 1024:
+            return f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} GiB"
+
+
+def hash_file(path: str, chunk_size: int = HASH_CHUNK_SIZE) -> str:
+    """Return the sha256 hex digest of a file, streaming it in chunks."""
+
+    import hashlib
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def get_package_version(package_name: str) -> str:
+    from importlib import metadata
+
+    try:
+        return metadata.version(package_name)
+    except metadata.PackageNotFoundError:
+        return ""
+
+
+def read_text_file(path: str) -> str | None:
+    try:
+        with open(path, "r") as f:
+            return f.read()
+    except OSError:
+        return None
+
+
+def read_json_file(path: str) -> dict:
+    """Read a JSON object from disk, returning an empty dict if it is missing or unreadable."""
+    try:
+        with open(path, "r") as f:
+            data = json.load(f)
+    except (json.JSONDecodeError, OSError):
+        return {}
+    return data if isinstance(data, dict) else {}
+
+
+def write_json_atomic(path: str, data: dict, mode: int | None = None):
+    """Write a JSON object by replacing the file atomically, so a crash never leaves a half written file.
+
+    With `mode` the file is created with these permissions, so its content is never readable by anyone else, not even briefly.
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.tmp"
+    if mode is None:
+        f = open(temp_path, "w")
+    else:
+        fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, mode)
+        # A leftover temp file keeps its old permissions
+        os.chmod(temp_path, mode)
+        f = os.fdopen(fd, "w")
+    with f:
+        json.dump(data, f)
+    os.replace(temp_path, path)
+
+
+def run_command(
+    command: list[str], worker: BackgroundWorker | None = None, phase: str = ""
+) -> int:
+    """Run a command through the worker (streaming progress, cancellable) or directly when there is no worker."""
+    with tracing.span("subprocess", command=" ".join(command)):
+        if worker:
+            return worker.run_command(command, phase)
+        return subprocess.call(command)
+
+
+def unpack_tar_stream(
+    response: "requests.Response",
+    dest_dir: str,
+    on_read: Callable[[int], None] | None = None,
+) -> HashingReader:
+    """Unpack a (compressed) tar archive straight from a streamed response, hashing it on the way.
+
+    Returns:
+        HashingReader: Has the size and sha256 of the whole response body, to be verified by the caller.
+    """
+
+    import tarfile
+
+    response.raw.decode_content = True
+    reader = HashingReader(response.raw, on_read=on_read)
+    with tarfile.open(fileobj=reader, mode="r|*") as archive:
+        extract_tar_archive(archive, dest_dir)
+    reader.drain()
+    return reader
+
+
+def extract_tar_archive(archive: "tarfile.TarFile", dest_dir: str):
+    """Extract every member of `archive` into `dest_dir`, refusing members that would end up outside of it.
+
+    Uses tarfile's `data` filter where Python has it (3.12, and the security releases of 3.8 to 3.11), otherwise checks every member itself.
+    """
+
+    import tarfile
+
+    if hasattr(tarfile, "data_filter"):
+        archive.extractall(dest_dir, filter="data")
+        return
+
+    dest_dir = os.path.realpath(dest_dir)
+
+    def is_inside(path: str) -> bool:
+        path = os.path.realpath(path)
+        return path == dest_dir or path.startswith(dest_dir + os.sep)
+
+    # Checked one member at a time, so a link extracted earlier is followed by realpath
+    for member in archive:
+        parts = member.name.replace("\\", "/").split("/")
+        if (
+            os.path.isabs(member.name)
+            or ".." in parts
+            or not is_inside(os.path.join(dest_dir, member.name))
+        ):
+            raise ValueError(f"Unsafe path in archive: {member.name}")
+        if member.issym():
+            link_target = os.path.join(
+                dest_dir, os.path.dirname(member.name), member.linkname
+            )
+        elif member.islnk():
+            link_target = os.path.join(dest_dir, member.linkname)
+        elif member.isfile() or member.isdir():
+            link_target = None
+        else:
+            raise ValueError(f"Unsupported member type in archive: {member.name}")
+        if link_target and (
+            os.path.isabs(member.linkname) or not is_inside(link_target)
+        ):
+            raise ValueError(
+                f"Link outside of the archive: {member.name} -> {member.linkname}"
+            )
+        archive.extract(member, dest_dir)
+
+
+def get_installed_packages_digest() -> str:
+    """Digest of the names and versions of all installed packages, the dependencies a build can pick up."""
+
+    import hashlib
+
+    from importlib import metadata
+
+    packages = sorted(
+        f"{dist.metadata['Name']}=={dist.version}" for dist in metadata.distributions()
+    )
+    return hashlib.sha256("\n".join(packages).encode()).hexdigest()
+
+
+def limit_build_process(pid: int, limits: BuildLimits):
+    """Apply the build limits to the running build process (POSIX only), memory and CPU limits need `resource.prlimit` (Linux)."""
+
+    import resource
+
+    try:
+        if limits.memory_mb or limits.cpu_s:
+            if hasattr(resource, "prlimit"):
+                if limits.memory_mb:
+                    memory = int(limits.memory_mb * 1024 * 1024)
+                    resource.prlimit(pid, resource.RLIMIT_AS, (memory, memory))
+                if limits.cpu_s:
+                    cpu_s = int(limits.cpu_s)
+                    resource.prlimit(pid, resource.RLIMIT_CPU, (cpu_s, cpu_s))
+            else:
+                print("Build memory and CPU limits are only supported on Linux.")
+        if limits.niceness:
+            niceness = os.getpriority(os.PRIO_PROCESS, pid) + int(limits.niceness)
+            os.setpriority(os.PRIO_PROCESS, pid, niceness)
+    except ProcessLookupError:
+        # The build already exited, its exit code tells what happened
+        pass
+
+
+def hardlink_unchanged_files(source_dir: str, target_dir: str) -> int:
+    """Replace files in `target_dir` that are identical to the same path in `source_dir` with hardlinks.
+
+    Returns:
+        int: Number of bytes saved. Nothing is linked when hardlinks are not supported.
+    """
+
+    saved = 0
+    for dir_path, _, filenames in os.walk(target_dir):
+        for filename in filenames:
+            target_path = os.path.join(dir_path, filename)
+            source_path = os.path.join(
+                source_dir, os.path.relpath(target_path, target_dir)
+            )
+            if os.path.islink(target_path) or not os.path.isfile(source_path):
+                continue
+
+            size = os.path.getsize(target_path)
+            if os.path.samefile(source_path, target_path):
+                continue
+            if size != os.path.getsize(source_path):
+                continue
+            if hash_file(source_path) != hash_file(target_path):
+                continue
+
+            temp_path = f"{target_path}.link.tmp"
+            try:
+                os.link(source_path, temp_path)
+                os.replace(temp_path, target_path)
+            except OSError:
+                if os.path.exists(temp_path):
+                    os.remove(temp_path)
+                return saved
+            saved += size
+
+    return saved
+
+
+def lower_process_priority():
+    """Run this process (and the git and build subprocesses it starts) at low CPU and IO priority."""
+
+    if sys.platform == "win32":
+        import ctypes
+
+        IDLE_PRIORITY_CLASS = 0x40
+        kernel32 = ctypes.windll.kernel32
+        kernel32.SetPriorityClass(kernel32.GetCurrentProcess(), IDLE_PRIORITY_CLASS)
+        return
+
+    os.nice(AGENT_NICENESS)
+
+    # Idle IO scheduling class, only available on Linux
+    if shutil.which("ionice"):
+        subprocess.run(
+            ["ionice", "-c", "3", "-p", str(os.getpid())],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+        )
+
+
+def run_agent(
+    registry: "ApplicationRegistry",
+    interval: float = AGENT_INTERVAL_S,
+    jitter: float = AGENT_JITTER,
+    max_workers: int = MAX_CONCURRENT_UPDATE_CHECKS,
+    once: bool = False,
+):
+    """Keep every registered app updated and built between launches.
+
+    Updates are pulled and built into a staged install slot at low priority, the next interactive launch only switches to it.
+
+    Args:
+        registry (ApplicationRegistry): The registered applications.
+        interval (float, optional): Seconds between update rounds. Defaults to AGENT_INTERVAL_S.
+        jitter (float, optional): Random +/- fraction of the interval, so many machines don't hit the remote in lockstep. Defaults to AGENT_JITTER.
+        max_workers (int, optional): Maximum number of concurrent update checks. Defaults to MAX_CONCURRENT_UPDATE_CHECKS.
+        once (bool, optional): Run a single round and return. Defaults to False.
+    """
+
+    lower_process_priority()
+    while True:
+        print(f"Agent: checking {len(registry.apps)} application(s) for updates.")
+        try:
+            registry.refresh_all_apps(max_workers=max_workers, activate=False)
+        except Exception as e:
+            print(f"Agent: update round failed ({e})")
+
+        if once:
+            return
+
+        delay = interval * random.uniform(1 - jitter, 1 + jitter)
+        print(f"Agent: next check in {delay / 60:.1f} min.")
+        time.sleep(delay)
+
+
+def acquire_lock_file(
+    lock_path: str, timeout: float = REVALIDATE_LOCK_TIMEOUT_S
+) -> bool:
+    """Create `lock_path` exclusively with the PID of this process in it, so only one process works on an app at a time.
+
+    A lock whose process is gone was left behind by a crash and is taken over, however long the holder has been working.
+    Only a lock without a readable PID, i.e. one whose holder crashed before writing it, is taken over by age, once it is older than `timeout`.
+
+    Returns:
+        bool: True when the lock was acquired, release it with `os.remove(lock_path)`.
+    """
+
+    os.makedirs(os.path.dirname(lock_path) or ".", exist_ok=True)
+    for _ in range(2):
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                with open(lock_path) as f:
+                    holder = f.read().strip()
+                if holder.isdigit():
+                    if is_process_running(int(holder)):
+                        return False
+                elif time.time() - os.path.getmtime(lock_path) < timeout:
+                    return False
+                os.remove(lock_path)
+            except FileNotFoundError:
+                pass
+            continue
+
+        with os.fdopen(fd, "w") as f:
+            f.write(str(os.getpid()))
+        return True
+    return False
+
+
+def is_process_running(pid: int) -> bool:
+    """Whether a process with this PID exists, a process we may not signal counts as running."""
+
+    if sys.platform == "win32":
+        import ctypes
+
+        # os.kill would terminate the process on Windows, ask for its exit code instead
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return False
+        try:
+            exit_code = ctypes.c_ulong()
+            if not kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)):
+                return True
+            return exit_code.value == STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def start_detached_revalidation(app_name: str):
+    """Start `app.py --revalidate` in a detached process that outlives this launcher."""
+
+    if getattr(sys, "frozen", False):
+        command = [sys.executable]
+    else:
+        command = [sys.executable, os.path.join(get_root_dir(), ENTRY_SCRIPT)]
+    command += ["--app", app_name, "--revalidate"]
+
+    kwargs = {}
+    if sys.platform == "win32":
+        kwargs["creationflags"] = (
+            subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP
+        )
+    else:
+        kwargs["start_new_session"] = True
+
+    # The launch that started it owns the profile and trace files
+    env = {
+        key: value
+        for key, value in os.environ.items()
+        if key not in (startup_profiler.PROFILE_ENV_VAR, tracing.TRACE_ENV_VAR)
+    }
+
+    subprocess.Popen(
+        command,
+        env=env,
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        close_fds=True,
+        **kwargs,
+    )
+
+
+def revalidate_app(registry: "ApplicationRegistry", app_name: str):
+    """Check the remote and prepare any update for the next launch, at low priority.
+
+    Runs in the detached process started by a stale-while-revalidate launch, the new build is staged and never replaces the running one.
+    """
+
+    lock_path = os.path.join(registry.cache_dir, f"revalidate-{app_name}.lock")
+    if not acquire_lock_file(lock_path):
+        print(f"'{app_name}' is already being revalidated.")
+        return
+
+    try:
+        lower_process_priority()
+        registry.get_model(app_name).run_update_pipeline(activate=False)
+    finally:
+        os.remove(lock_path)
+
+
+def is_safe_relative_path(path: str) -> bool:
+    """Check a '/' separated path from a remote manifest stays inside the app directory."""
+    if not path or path.startswith("/") or "\\" in path or ":" in path:
+        return False
+    return all(part not in ("", ".", "..") for part in path.split("/"))
+
+
+@tracing.traced("git_ls_remote")
+def get_remote_head(
+    url: str, branch: str = DEFAULT_BRANCH, timeout: float = GIT_LS_REMOTE_TIMEOUT_S
+) -> str | None:
+    """Get the commit at the tip of a remote branch with `git ls-remote`, None when the remote can't be reached."""
+
+    ref = f"refs/heads/{branch}"
+    try:
+        result = subprocess.run(
+            ["git", "ls-remote", url, ref],
+            capture_output=True,
+            text=True,
+            timeout=timeout,
+            # Fail instead of waiting on a credential prompt nobody sees
+            env={**os.environ, "GIT_TERMINAL_PROMPT": "0"},
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        print(f"git ls-remote failed: {e}")
+        return None
+
+    if result.returncode != 0:
+        print(f"git ls-remote failed: {result.stderr.strip()}")
+        return None
+
+    for line in result.stdout.splitlines():
+        commit, _, line_ref = line.partition("\t")
+        if line_ref == ref:
+            return commit
+    return None
+
+
+@tracing.traced("git_local_head")
+def get_local_head(repo_dir: str) -> str | None:
+    if not os.path.isdir(os.path.join(repo_dir, ".git")):
+        return None
+    result = subprocess.run(
+        ["git", "-C", repo_dir, "rev-parse", "HEAD"],
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout.strip() if result.returncode == 0 else None
+
+
+@tracing.traced("git_is_shallow")
+def is_shallow_repo(repo_dir: str) -> bool:
+    result = subprocess.run(
+        ["git", "-C", repo_dir, "rev-parse", "--is-shallow-repository"],
+        capture_output=True,
+        text=True,
+    )
+    return result.stdout.strip() == "true"
+
+
+def get_root_dir() -> str:
+    return os.path.dirname(os.path.abspath(__file__))
+
+
+@tracing.traced("launch")
+def launch_app_from_path(exec_path: str, interpreter: str | None = None):
+    """Launch an executable, or with `interpreter` the app file of a source launch."""
+    subprocess.Popen([interpreter, exec_path] if interpreter else [exec_path])
+
+
+def app_launcher(
+    app_name: str = DEFAULT_APP_NAME,
+    policy_mode: str | None = None,
+    max_stale_versions: int | None = None,
+    max_stale_days: float | None = None,
+):
+    model = ApplicationRegistry(get_root_dir()).get_model(app_name)
+
+    # Stale-while-revalidate: launch the installed build now and update for the next launch in the background
+    policy = model.get_launch_policy(
+        mode=policy_mode,
+        max_stale_versions=max_stale_versions,
+        max_stale_days=max_stale_days,
+    )
+    if policy.mode == LAUNCH_POLICY_STALE_WHILE_REVALIDATE:
+        with startup_profiler.phase("stale_check"):
+            exec_path, revalidate = model.get_stale_executable(policy)
+        if exec_path:
+            if revalidate:
+                start_detached_revalidation(app_name)
+            with startup_profiler.phase("launch"):
+                launch_app_from_path(exec_path, interpreter=model.interpreter)
+            return
+
+    # Fast path: launch the app straight away, without a window, when it is already up to date
+    with startup_profiler.phase("fast_path_check"):
+        exec_path = model.get_up_to_date_executable()
+    if exec_path:
+        with startup_profiler.phase("launch"):
+            launch_app_from_path(exec_path, interpreter=model.interpreter)
+        return
+
+    # Init Application Launcher, only needed when there is real work to do
+    with startup_profiler.phase("launcher_window"), tracing.span("launcher_window"):
+        from launcher_window import ApplicationController
+
+        app = ApplicationController(model=model)
+        app.mainloop()
+
+    # Quitting cancels in-flight work, give the worker a moment to clean up
+    if app.cancelled:
+        app.worker.join(WORKER_SHUTDOWN_TIMEOUT_S)
+        return
+
+    if app.worker_error:
+        raise app.worker_error
+
+    # Extract execution path and launch new application
+    #! NOTE: The code below only runs once the application above is closed.
+    exec_path = getattr(app, "exec_path", None)
+
+    # print(f"{'-'*20}\n{exec_path = }\n{'-'*20}\n")
+
+    if not exec_path:
+        raise Exception(f"Failed to launch app")
+    else:
+        app.quit()
+        launch_app_from_path(exec_path, interpreter=model.interpreter)
+
+
+def parse_args(args: list[str] | None = None):
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Application launcher.")
+    parser.add_argument(
+        "--app",
+        default=DEFAULT_APP_NAME,
+        help="Name of the registered application to launch.",
+    )
+    parser.add_argument(
+        "--register",
+        nargs=2,
+        metavar=("NAME", "GITHUB_URL"),
+        help="Register an application with the launcher.",
+    )
+    parser.add_argument(
+        "--refresh-all",
+        action="store_true",
+        help="Check all registered applications for updates in parallel and update them, without launching.",
+    )
+    parser.add_argument(
+        "--set-mirror",
+        metavar="MIRROR_URL",
+        help="Fetch all apps from a LAN mirror (see mirror_server.py), an empty string goes back to GitHub.",
+    )
+    parser.add_argument(
+        "--set-build-cache",
+        metavar="BUILD_CACHE_URL",
+        help="Share builds through a build cache server (see build_cache_server.py), an empty string turns it off.",
+    )
+    parser.add_argument(
+        "--build-cache-token",
+        metavar="TOKEN",
+        help=f"With --set-build-cache, the bearer token the server requires for uploads. Overridden by {BUILD_CACHE_TOKEN_ENV_VAR}.",
+    )
+    parser.add_argument(
+        "--build-cache-key",
+        metavar="KEY",
+        help=f"With --set-build-cache, the key builds are signed and verified with, the same on every launcher. Overridden by {BUILD_CACHE_KEY_ENV_VAR}.",
+    )
+    parser.add_argument(
+        "--rollback",
+        action="store_true",
+        help="Switch the application back to its previously installed version, without launching.",
+    )
+    parser.add_argument(
+        "--unpin",
+        action="store_true",
+        help="Undo the pin of a --rollback, so the application updates to its latest version again on the next launch.",
+    )
+    parser.add_argument(
+        "--agent",
+        action="store_true",
+        help="Run in the background, preparing updates of all registered applications for their next launch.",
+    )
+    parser.add_argument(
+        "--agent-interval",
+        type=float,
+        default=AGENT_INTERVAL_S,
+        help="Seconds between the agent's update checks.",
+    )
+    parser.add_argument(
+        "--agent-jitter",
+        type=float,
+        default=AGENT_JITTER,
+        help="Random +/- fraction applied to the agent interval.",
+    )
+    parser.add_argument(
+        "--once",
+        action="store_true",
+        help="Run a single agent round and exit.",
+    )
+    parser.add_argument(
+        "--policy",
+        choices=LAUNCH_POLICIES,
+        help="Launch policy, defaults to the app's config.json or 'blocking'.",
+    )
+    parser.add_argument(
+        "--max-stale-versions",
+        type=int,
+        help="Stale-while-revalidate: update first when the installed build is more versions behind.",
+    )
+    parser.add_argument(
+        "--max-stale-days",
+        type=float,
+        help="Stale-while-revalidate: update first when the remote was last checked longer ago.",
+    )
+    parser.add_argument(
+        "--revalidate",
+        action="store_true",
+        help=argparse.SUPPRESS,
+    )
+    parser.add_argument(
+        "--trace",
+        metavar="PATH",
+        help=f"Write a Chrome trace of the launcher's phases to PATH, like setting {tracing.TRACE_ENV_VAR}.",
+    )
+    parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=MAX_CONCURRENT_UPDATE_CHECKS,
+        help="Maximum number of concurrent update checks.",
+    )
+    return parser.parse_args(args)
+
+
+def main():
+    args = parse_args()
+    if args.trace:
+        tracing.start(args.trace)
+    registry = ApplicationRegistry(get_root_dir())
+
+    if args.register:
+        name, github_url = args.register
+        registry.register(name, github_url)
+        print(f"Registered '{name}': {github_url}")
+        return
+
+    if args.set_mirror is not None:
+        registry.set_mirror(args.set_mirror)
+        print(f"Remote source: {registry.mirror_url or 'GitHub'}")
+        return
+
+    if args.set_build_cache is not None:
+        registry.set_build_cache(
+            args.set_build_cache,
+            token=args.build_cache_token,
+            key=args.build_cache_key,
+        )
+        print(f"Build cache: {registry.build_cache_url or 'off'}")
+        return
+
+    if args.refresh_all:
+        registry.refresh_all_apps(max_workers=args.max_concurrency)
+        return
+
+    if args.agent:
+        run_agent(
+            registry,
+            interval=args.agent_interval,
+            jitter=args.agent_jitter,
+            max_workers=args.max_concurrency,
+            once=args.once,
+        )
+        return
+
+    if args.rollback:
+        slot_name = registry.get_model(args.app).install_slots.rollback()
+        if slot_name is None:
+            raise SystemExit(f"No previous version of '{args.app}' to roll back to.")
+        print(
+            f"Rolled back '{args.app}' to {slot_name}, updates are paused until a newer version is published or --unpin."
+        )
+        return
+
+    if args.unpin:
+        model = registry.get_model(args.app)
+        model.install_slots.unpin()
+        # The pinned build may be recorded as up to date
+        model.state.clear()
+        print(f"Unpinned '{args.app}'.")
+        return
+
+    if args.revalidate:
+        revalidate_app(registry, args.app)
+        return
+
+    app_launcher(
+        app_name=args.app,
+        policy_mode=args.policy,
+        max_stale_versions=args.max_stale_versions,
+        max_stale_days=args.max_stale_days,
+    )
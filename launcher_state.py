@@ -0,0 +1,132 @@
+import json
+import os
+import time
+
+
+# One small record per installed app, read at startup instead of probing the app folder, its config and the install slots.
+# Stored in `<cache dir>/state/<app folder name>.json`, replaced atomically so a crash leaves either the old or the new record.
+STATE_DIRNAME = "state"
+STATE_SCHEMA_VERSION = 1
+
+# Fields of a record, every one of them is optional
+STATE_FIELDS = [
+    "github_url",
+    "installed_version",
+    "commit",
+    "fingerprint",
+    "executable",
+    "interpreter",
+    "remote_checked_at",
+    "etag",
+]
+
+
+class LauncherState:
+    """Persistent, crash-safe record of an installed app.
+
+    A record is only trusted while the files it was derived from are unchanged. Their signatures (mtime and size) are stored
+    with it, so validating a record costs a `stat` per file instead of reading and parsing them. A missing, corrupt or
+    outdated record is simply treated as absent, the caller then derives the state from scratch and saves a new record.
+    """
+
+    def __init__(self, state_path: str):
+        self.state_path = state_path
+
+    @staticmethod
+    def get_state_path(cache_dir: str, application_dir: str, variant: str = "") -> str:
+        """Path of the record of an app.
+
+        An entry point that signs its record with other sources needs its own `variant`, otherwise each entry point
+        invalidates and overwrites the record of the other.
+        """
+        name = os.path.basename(application_dir)
+        if variant:
+            name = f"{name}.{variant}"
+        return os.path.join(cache_dir, STATE_DIRNAME, f"{name}.json")
+
+    @staticmethod
+    def get_signature(path: str) -> list[int] | None:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return [stat.st_mtime_ns, stat.st_size]
+
+    def load(self) -> dict:
+        """Read the record, an empty dict when there is none or it can't be read."""
+        try:
+            with open(self.state_path, "r") as f:
+                record = json.load(f)
+        except (json.JSONDecodeError, OSError):
+            return {}
+
+        if not isinstance(record, dict) or record.get("schema") != STATE_SCHEMA_VERSION:
+            return {}
+        return record
+
+    def is_valid(self, record: dict, sources: dict[str, str]) -> bool:
+        """Check a record against the current signatures of the files it was derived from.
+
+        Args:
+            record (dict): A record returned by `load`.
+            sources (dict[str, str]): The files the record depends on by name, i.e. {"config": ".../config.json"}.
+
+        Returns:
+            bool: True when every source is unchanged (or still missing) since the record was saved.
+        """
+
+        if not record:
+            return False
+
+        signatures = record.get("signatures", {})
+        return all(
+            name in signatures and signatures[name] == self.get_signature(path)
+            for name, path in sources.items()
+        )
+
+    @staticmethod
+    def is_fresh(record: dict, ttl: float) -> bool:
+        """Whether the last remote check of a record is recent enough to skip checking the remote again."""
+        remote_checked_at = record.get("remote_checked_at") or 0
+        return 0 <= time.time() - remote_checked_at < ttl
+
+    def save(self, sources: dict[str, str], **fields) -> dict:
+        """Replace the record, signing it with the current signatures of `sources`.
+
+        Args:
+            sources (dict[str, str]): The files the record depends on by name, see `is_valid`.
+            **fields: Values of STATE_FIELDS, others are ignored.
+
+        Returns:
+            dict: The saved record.
+        """
+
+        record = {
+            "schema": STATE_SCHEMA_VERSION,
+            **{name: fields.get(name) for name in STATE_FIELDS},
+            "signatures": {
+                name: self.get_signature(path) for name, path in sources.items()
+            },
+            "saved_at": time.time(),
+        }
+
+        try:
+            os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+            temp_path = f"{self.state_path}.{os.getpid()}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump(record, f, separators=(",", ":"))
+                # The record must be on disk before it replaces the old one, or a power loss can leave an empty file
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(temp_path, self.state_path)
+        except OSError as e:
+            # Without a record the next launch derives the state from scratch, a failed write only costs it time
+            print(f"Failed to write launcher state '{self.state_path}': {e}")
+
+        return record
+
+    def clear(self):
+        try:
+            os.remove(self.state_path)
+        except FileNotFoundError:
+            pass
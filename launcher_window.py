@@ -0,0 +1,251 @@
+"""The Tk launcher window, shown while an application is cloned, updated or built.
+
+Importing tkinter is only paid for when the window is actually needed, an up to date launch never imports this module.
+"""
+
+import os
+import queue
+import tkinter as tk
+from tkinter import ttk, messagebox
+
+from launcher import (
+    APPLICATION_DIR,
+    FINAL_PHASES,
+    PHASE_CANCELLED,
+    PHASE_DONE,
+    PHASE_ERROR,
+    WORKER_POLL_INTERVAL_MS,
+    ApplicationModel,
+    BackgroundWorker,
+    ProgressEvent,
+    format_bytes,
+    get_root_dir,
+    validate_github_url,
+)
+
+
+#! --- VIEWS ---
+class HasApplicationView(tk.Frame):
+
+    def __init__(self, controller):
+        super().__init__(controller)
+        self.controller = controller
+
+        # define defaults and load widgets
+        text_label = tk.Label(self, text="Has application URL")
+        text_label.pack(padx=20, pady=10)
+
+        quit_button = tk.Button(self, text="Quit", command=self.controller.destroy)
+        quit_button.pack(padx=20, pady=10)
+
+
+class DoesNotHaveApplicationView(tk.Frame):
+
+    def __init__(self, controller):
+        super().__init__(controller)
+        self.controller = controller
+
+        # define defaults
+        self.default_project_url = ""
+        self.project_url = tk.StringVar(value=self.default_project_url)
+
+        # Load widgets
+        # Text label
+        text_label = tk.Label(self, text="Please provide application's GitHub URL:")
+        text_label.pack(padx=20, pady=10)
+
+        # Add user entry widget
+        self.user_entry = tk.Entry(self, textvariable=self.project_url)
+        self.user_entry.pack()
+
+        # Define a callback for when the user hits return.
+        self.user_entry.bind("<Key-Return>", self.get_github_project)
+
+        quit_button = tk.Button(self, text="Quit", command=self.controller.destroy)
+        quit_button.pack(padx=20, pady=10)
+
+        self.user_entry.focus()
+
+    def get_github_project(self, event=None):
+
+        url = self.project_url.get()
+
+        if not validate_github_url(url):
+            messagebox.showwarning(
+                parent=self.controller,
+                title="Invalid URL",
+                message="The provided URL is not a valid GitHub project URL.",
+            )
+            # self.project_url.set(self.default_project_url)
+            return
+
+        print(f"Getting Application project from: {self.project_url.get()}")
+
+        # Download Github to '.app' folder
+
+        # Check if
+
+    # @staticmethod
+    # def _validate_github_url(url: str) -> bool:
+    #     github_url_pattern = re.compile(
+    #         r"^https:\/\/github\.com\/[A-Za-z0-9_.-]+\/[A-Za-z0-9_.-]+(\/)?$"
+    #     )
+    #     # https://github.com/username/projectname
+
+    #     if github_url_pattern.match(url):
+    #         return True
+    #     else:
+    #         return False
+
+
+class LoadingScreenView(tk.Frame):
+
+    def __init__(self, controller):
+        super().__init__(controller)
+
+        self.controller = controller
+
+        application_title = self.winfo_toplevel().title()
+
+        self.loading_title = tk.Label(
+            master=controller,
+            text=f"Launching '{application_title}' application",
+        )
+        self.loading_title.pack(pady=20)
+
+        self.loading_bar = ttk.Progressbar(
+            master=controller, mode="indeterminate", maximum=100
+        )
+        self.loading_bar.pack()
+
+        self.status_text = tk.StringVar(value="Checking for updates...")
+        self.status_label = tk.Label(master=controller, textvariable=self.status_text)
+        self.status_label.pack(pady=5)
+
+        self.quit_button = tk.Button(
+            master=self, text="Quit", command=self.controller.cancel_and_quit
+        )
+        self.quit_button.pack(padx=20, pady=10)
+
+        self.loading_bar.start()
+
+    def update_progress(self, event: ProgressEvent):
+        """Update the loading bar from a worker event.
+
+        The bar is determinate while the event carries a percentage and falls back to indeterminate when it doesn't.
+        """
+
+        if event.message:
+            status = f"{event.phase.capitalize()}: {event.message}"
+            if event.bytes_transferred and event.bytes_per_second:
+                status += f" ({format_bytes(event.bytes_transferred)}, {format_bytes(event.bytes_per_second)}/s)"
+            elif event.bytes_transferred:
+                status += f" ({format_bytes(event.bytes_transferred)})"
+            self.status_text.set(status)
+
+        mode = str(self.loading_bar.cget("mode"))
+        if event.percent is None:
+            if mode != "indeterminate":
+                self.loading_bar.configure(mode="indeterminate", value=0)
+                self.loading_bar.start()
+            return
+
+        if mode != "determinate":
+            self.loading_bar.stop()
+            self.loading_bar.configure(mode="determinate")
+        self.loading_bar.configure(value=event.percent)
+
+    def stop_loading_callback(self):
+        self.loading_bar.stop()
+
+
+#! --- Controller ---
+class ApplicationController(tk.Tk):
+
+    def __init__(self, model: ApplicationModel | None = None):
+        super().__init__()
+
+        # Define default values
+        self.root_dir = get_root_dir()
+        self.application_dir = os.path.join(self.root_dir, APPLICATION_DIR)
+        self.exec_path = None
+        self.update_status = False
+        self.cancelled = False
+        self.worker_error: Exception | None = None
+        self.model = model or ApplicationModel(application_dir=self.application_dir)
+
+        # Window properties
+        self.set_window_properties()
+        self.protocol("WM_DELETE_WINDOW", self.cancel_and_quit)
+
+        # Store pages # todo store pages in page list
+        ...
+
+        # Set main page #todo assign mainpage name here
+        self.set_main_page()
+
+        # Check for updates, update and build on a background worker so the window stays responsive
+        self.worker = BackgroundWorker(target=self.model.run_update_pipeline)
+        self.worker.start()
+        self.after(WORKER_POLL_INTERVAL_MS, self.poll_worker_events)
+
+    def poll_worker_events(self):
+        """Drain all pending worker events on the Tk main thread and reschedule until a final event arrives."""
+
+        while True:
+            try:
+                event = self.worker.events.get_nowait()
+            except queue.Empty:
+                break
+
+            self.handle_progress_event(event)
+            if event.phase in FINAL_PHASES:
+                return
+
+        self.after(WORKER_POLL_INTERVAL_MS, self.poll_worker_events)
+
+    def handle_progress_event(self, event: ProgressEvent):
+
+        if event.phase == PHASE_DONE:
+            # Get executable path and close launcher
+            self.main_page.stop_loading_callback()
+            self.update_status = self.model.update_status
+            self.exec_path = self.worker.result
+            self.destroy()
+            return
+
+        if event.phase == PHASE_ERROR:
+            self.main_page.stop_loading_callback()
+            self.worker_error = self.worker.error
+            messagebox.showerror(
+                parent=self, title="Failed to update application", message=event.message
+            )
+            self.destroy()
+            return
+
+        if event.phase == PHASE_CANCELLED:
+            self.destroy()
+            return
+
+        self.main_page.update_progress(event)
+
+    def cancel_and_quit(self):
+        """Cancel any in-flight work (killing running git subprocesses) and close the launcher."""
+        self.cancelled = True
+        self.worker.cancel()
+        self.destroy()
+
+    def set_window_properties(self):
+        # TODO add in config capabilities
+        self.title("Application Launcher")
+        self.geometry("600x200")
+        self.eval("tk::PlaceWindow . center")
+        self.focus_force()
+
+    def set_main_page(self):
+        # TODO add in ability to pass in View
+        self.main_page = LoadingScreenView(controller=self)
+        self.main_page.pack(side="top", fill="both", expand=True)
+        self.main_page.grid_rowconfigure(0, weight=1)
+        self.main_page.grid_columnconfigure(0, weight=1)
+        self.main_page.tkraise()
@@ -0,0 +1,441 @@
+import argparse
+import hashlib
+import json
+import os
+import re
+import shutil
+import subprocess
+import threading
+import time
+import urllib.error
+import urllib.request
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+# LAN caching mirror of the launcher's remotes, so an office fetches from GitHub once instead of once per machine.
+# Start it with `python mirror_server.py` and point the launchers at it with `python app.py --set-mirror http://<host>:8080`
+# GET /raw/<user>/<project>/<path>  -> cached proxy of raw.githubusercontent.com, revalidated upstream with ETags
+# GET/POST /git/<user>/<project>.git/... -> git smart-HTTP served by `git http-backend` from a local mirror clone
+DEFAULT_HOST = "0.0.0.0"
+DEFAULT_PORT = 8080
+DEFAULT_CACHE_DIR = ".mirror_cache"
+UPSTREAM_RAW_URL = "https://raw.githubusercontent.com"
+UPSTREAM_GIT_URL = "https://github.com"
+RAW_PREFIX = "/raw/"
+GIT_PREFIX = "/git/"
+
+# Serve cached files and mirrors without asking upstream for this long, after that revalidate
+RAW_REVALIDATE_S = 30
+GIT_REFRESH_S = 30
+UPSTREAM_TIMEOUT_S = 15
+COPY_CHUNK_SIZE = 64 * 1024
+
+# A user or repo name, never "." or ".." which would leave the mirrors folder
+NAME_PATTERN = re.compile(r"^(?!\.+$)[A-Za-z0-9_.-]+$")
+
+
+#! --- Raw File Cache ---
+class RawCache:
+    """Proxy cache of raw repo files, revalidated upstream with `If-None-Match`/`If-Modified-Since`.
+
+    Each file is stored as `<sha256 of path>.body` with a `.json` entry holding its validators. Concurrent requests for the same
+    file wait on a single upstream request, and the cached copy is served when upstream is unreachable.
+    """
+
+    def __init__(self, cache_dir: str, upstream_url: str, revalidate_after: float):
+        self.cache_dir = cache_dir
+        self.upstream_url = upstream_url.rstrip("/")
+        self.revalidate_after = revalidate_after
+
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def get_lock(self, path: str) -> threading.Lock:
+        with self._locks_lock:
+            return self._locks.setdefault(path, threading.Lock())
+
+    def get_entry_paths(self, path: str) -> tuple[str, str]:
+        key = hashlib.sha256(path.encode()).hexdigest()
+        return (
+            os.path.join(self.cache_dir, f"{key}.json"),
+            os.path.join(self.cache_dir, f"{key}.body"),
+        )
+
+    def load(self, path: str) -> tuple[dict, bytes | None]:
+        entry_path, body_path = self.get_entry_paths(path)
+        try:
+            with open(entry_path) as f:
+                entry = json.load(f)
+            with open(body_path, "rb") as f:
+                return entry, f.read()
+        except (OSError, json.JSONDecodeError):
+            return {}, None
+
+    def store(self, path: str, entry: dict, body: bytes | None = None):
+        entry_path, body_path = self.get_entry_paths(path)
+        if body is not None:
+            write_atomic(body_path, body)
+        write_atomic(entry_path, json.dumps(entry).encode())
+
+    def get(self, path: str) -> tuple[int, bytes, str | None]:
+        """Get a raw file, i.e. "user/project/refs/heads/master/config.json".
+
+        Returns:
+            tuple[int, bytes, str | None]: (HTTP status, body, ETag).
+        """
+
+        with self.get_lock(path):
+            entry, body = self.load(path)
+            if (
+                body is not None
+                and time.time() - entry["checked_at"] < self.revalidate_after
+            ):
+                return 200, body, entry["etag"]
+
+            headers = {}
+            if body is not None and entry.get("upstream_etag"):
+                headers["If-None-Match"] = entry["upstream_etag"]
+            if body is not None and entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+
+            request = urllib.request.Request(
+                f"{self.upstream_url}/{path}", headers=headers
+            )
+            try:
+                with urllib.request.urlopen(
+                    request, timeout=UPSTREAM_TIMEOUT_S
+                ) as response:
+                    new_body = response.read()
+                    upstream_etag = response.headers.get("ETag")
+                    last_modified = response.headers.get("Last-Modified")
+            except urllib.error.HTTPError as e:
+                if e.code == 304 and body is not None:
+                    entry["checked_at"] = time.time()
+                    self.store(path, entry)
+                    return 200, body, entry["etag"]
+                if e.code == 404:
+                    return 404, b"", None
+                if body is not None:
+                    print(
+                        f"Upstream returned {e.code} for '{path}', serving cached copy."
+                    )
+                    return 200, body, entry["etag"]
+                return 502, b"", None
+            except OSError as e:
+                if body is not None:
+                    print(
+                        f"Upstream unreachable for '{path}' ({e}), serving cached copy."
+                    )
+                    return 200, body, entry["etag"]
+                return 502, b"", None
+
+            # Clients always get an ETag, even when upstream sent none
+            etag = f'"{hashlib.sha256(new_body).hexdigest()}"'
+            entry = {
+                "etag": etag,
+                "upstream_etag": upstream_etag,
+                "last_modified": last_modified,
+                "checked_at": time.time(),
+            }
+            self.store(path, entry, new_body)
+            return 200, new_body, etag
+
+
+#! --- Git Mirrors ---
+class GitMirrors:
+    """Mirror clones (`git clone --mirror`) of upstream repos, refreshed when a client starts a fetch and the mirror is older than `refresh_after`."""
+
+    def __init__(self, mirrors_dir: str, upstream_url: str, refresh_after: float):
+        self.mirrors_dir = mirrors_dir
+        self.upstream_url = upstream_url.rstrip("/")
+        self.refresh_after = refresh_after
+
+        self._refreshed_at: dict[str, float] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self._locks_lock = threading.Lock()
+        os.makedirs(mirrors_dir, exist_ok=True)
+
+    def get_repo_dir(self, username: str, project_name: str) -> str:
+        return os.path.join(self.mirrors_dir, username, f"{project_name}.git")
+
+    def refresh(self, username: str, project_name: str):
+        """Create or update the mirror of a repo.
+
+        Raises:
+            RuntimeError: When the mirror doesn't exist and can't be cloned. A failed update keeps serving the existing mirror.
+        """
+
+        repo_dir = self.get_repo_dir(username, project_name)
+        with self._locks_lock:
+            lock = self._locks.setdefault(repo_dir, threading.Lock())
+
+        with lock:
+            if time.time() - self._refreshed_at.get(repo_dir, 0) < self.refresh_after:
+                return
+
+            upstream_url = f"{self.upstream_url}/{username}/{project_name}"
+            if not os.path.isdir(repo_dir):
+                temp_dir = f"{repo_dir}.tmp"
+                shutil.rmtree(temp_dir, ignore_errors=True)
+                result = subprocess.run(
+                    ["git", "clone", "--quiet", "--mirror", upstream_url, temp_dir],
+                    capture_output=True,
+                    text=True,
+                )
+                if result.returncode != 0:
+                    shutil.rmtree(temp_dir, ignore_errors=True)
+                    raise RuntimeError(
+                        f"Failed to mirror '{upstream_url}': {result.stderr.strip()}"
+                    )
+
+                # Allow the launcher's blobless clones (--filter=blob:none)
+                subprocess.run(
+                    [
+                        "git",
+                        "--git-dir",
+                        temp_dir,
+                        "config",
+                        "uploadpack.allowFilter",
+                        "true",
+                    ],
+                    check=True,
+                )
+                os.replace(temp_dir, repo_dir)
+            else:
+                result = subprocess.run(
+                    ["git", "--git-dir", repo_dir, "remote", "update", "--prune"],
+                    capture_output=True,
+                    text=True,
+                )
+                if result.returncode != 0:
+                    print(
+                        f"Failed to update mirror of '{upstream_url}', serving it as is: {result.stderr.strip()}"
+                    )
+
+            self._refreshed_at[repo_dir] = time.time()
+
+
+#! --- HTTP Handler ---
+class MirrorRequestHandler(BaseHTTPRequestHandler):
+    raw_cache: RawCache
+    git_mirrors: GitMirrors
+
+    def do_GET(self):
+        if self.path.startswith(RAW_PREFIX):
+            self.handle_raw()
+        elif self.path.startswith(GIT_PREFIX):
+            self.handle_git()
+        else:
+            self.send_error(404)
+
+    def do_POST(self):
+        if self.path.startswith(GIT_PREFIX):
+            self.handle_git()
+        else:
+            self.send_error(404)
+
+    def handle_raw(self):
+        path = self.path[len(RAW_PREFIX) :].split("?")[0]
+        if ".." in path.split("/") or len(path.split("/")) < 3:
+            self.send_error(400)
+            return
+
+        status, body, etag = self.raw_cache.get(path)
+        if status != 200:
+            self.send_error(status)
+            return
+
+        if etag and self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+
+        self.send_response(200)
+        self.send_header("Content-Type", "application/octet-stream")
+        self.send_header("Content-Length", str(len(body)))
+        if etag:
+            self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def handle_git(self):
+        path, _, query = self.path[len(GIT_PREFIX) :].partition("?")
+        parts = path.split("/", 2)
+        if len(parts) < 3:
+            self.send_error(400)
+            return
+
+        username, project_name, rest = parts
+        project_name = project_name.removesuffix(".git")
+        if not NAME_PATTERN.match(username) or not NAME_PATTERN.match(project_name):
+            self.send_error(400)
+            return
+
+        # The mirror is read only
+        if "git-receive-pack" in query or rest == "git-receive-pack":
+            self.send_error(403, "Pushing to the mirror is not supported")
+            return
+
+        # Every fetch starts with the ref advertisement, the right moment to bring the mirror up to date
+        if rest == "info/refs":
+            try:
+                self.git_mirrors.refresh(username, project_name)
+            except RuntimeError as e:
+                print(e)
+                self.send_error(502)
+                return
+
+        self.run_http_backend(username, project_name, rest, query)
+
+    def read_body(self) -> bytes:
+        # Git sends large requests with chunked transfer encoding
+        if self.headers.get("Transfer-Encoding", "").lower() == "chunked":
+            body = bytearray()
+            while True:
+                size = int(self.rfile.readline().split(b";")[0].strip(), 16)
+                if size == 0:
+                    self.rfile.readline()
+                    return bytes(body)
+                body += self.rfile.read(size)
+                self.rfile.readline()
+
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def run_http_backend(self, username: str, project_name: str, rest: str, query: str):
+        body = self.read_body()
+        env = {
+            **os.environ,
+            "GIT_PROJECT_ROOT": self.git_mirrors.mirrors_dir,
+            "GIT_HTTP_EXPORT_ALL": "1",
+            "GATEWAY_INTERFACE": "CGI/1.1",
+            "REQUEST_METHOD": self.command,
+            "PATH_INFO": f"/{username}/{project_name}.git/{rest}",
+            "QUERY_STRING": query,
+            "CONTENT_TYPE": self.headers.get("Content-Type", ""),
+            "CONTENT_LENGTH": str(len(body)),
+            "REMOTE_ADDR": self.client_address[0],
+        }
+        if self.headers.get("Git-Protocol"):
+            env["GIT_PROTOCOL"] = self.headers["Git-Protocol"]
+        if self.headers.get("Content-Encoding"):
+            env["HTTP_CONTENT_ENCODING"] = self.headers["Content-Encoding"]
+
+        process = subprocess.Popen(
+            ["git", "http-backend"],
+            env=env,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+
+        # Feed the request on its own thread, so a large response can't block on an unread request
+        def write_body():
+            try:
+                process.stdin.write(body)
+            except BrokenPipeError:
+                pass
+            finally:
+                process.stdin.close()
+
+        writer = threading.Thread(target=write_body, daemon=True)
+        writer.start()
+
+        # CGI response: headers, a blank line, then the body which is streamed through
+        status = 200
+        headers = []
+        for line in iter(process.stdout.readline, b""):
+            line = line.decode("latin-1").rstrip("\r\n")
+            if not line:
+                break
+            name, _, value = line.partition(":")
+            if name.lower() == "status":
+                status = int(value.strip().split(" ")[0])
+            else:
+                headers.append((name, value.strip()))
+
+        self.send_response(status)
+        for name, value in headers:
+            self.send_header(name, value)
+        self.send_header("Connection", "close")
+        self.end_headers()
+        shutil.copyfileobj(process.stdout, self.wfile, COPY_CHUNK_SIZE)
+
+        writer.join()
+        process.wait()
+        self.close_connection = True
+
+
+#! --- Main Logic ---
+def write_atomic(path: str, data: bytes):
+    temp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(temp_path, "wb") as f:
+        f.write(data)
+    os.replace(temp_path, path)
+
+
+def create_server(
+    host: str = DEFAULT_HOST,
+    port: int = DEFAULT_PORT,
+    cache_dir: str = DEFAULT_CACHE_DIR,
+    upstream_raw_url: str = UPSTREAM_RAW_URL,
+    upstream_git_url: str = UPSTREAM_GIT_URL,
+    raw_revalidate: float = RAW_REVALIDATE_S,
+    git_refresh: float = GIT_REFRESH_S,
+) -> ThreadingHTTPServer:
+    class Handler(MirrorRequestHandler):
+        raw_cache = RawCache(
+            os.path.join(cache_dir, "raw"), upstream_raw_url, raw_revalidate
+        )
+        git_mirrors = GitMirrors(
+            os.path.join(cache_dir, "git"), upstream_git_url, git_refresh
+        )
+
+    return ThreadingHTTPServer((host, port), Handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="LAN caching mirror for the application launcher."
+    )
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--cache-dir", default=DEFAULT_CACHE_DIR)
+    parser.add_argument("--upstream-raw-url", default=UPSTREAM_RAW_URL)
+    parser.add_argument("--upstream-git-url", default=UPSTREAM_GIT_URL)
+    parser.add_argument(
+        "--raw-revalidate",
+        type=float,
+        default=RAW_REVALIDATE_S,
+        help="Seconds a cached raw file is served before it is revalidated upstream.",
+    )
+    parser.add_argument(
+        "--git-refresh",
+        type=float,
+        default=GIT_REFRESH_S,
+        help="Seconds a git mirror is served before it is updated from upstream.",
+    )
+    args = parser.parse_args()
+
+    server = create_server(
+        host=args.host,
+        port=args.port,
+        cache_dir=args.cache_dir,
+        upstream_raw_url=args.upstream_raw_url,
+        upstream_git_url=args.upstream_git_url,
+        raw_revalidate=args.raw_revalidate,
+        git_refresh=args.git_refresh,
+    )
+    print(f"Mirror serving on http://{args.host}:{args.port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+import atexit
+import builtins
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+
+# Set to a file path to record the launcher's import and phase timings, i.e.
+# LAUNCHER_PROFILE=startup_profile.json python app.py
+PROFILE_ENV_VAR = "LAUNCHER_PROFILE"
+
+_profiler: "StartupProfiler | None" = None
+
+
+class StartupProfiler:
+    """Records the wall time of every module import and of named launcher phases, and writes them to a JSON file.
+
+    Imports are timed by wrapping `builtins.__import__`. Every import statement goes through it, so the self time of a
+    module is its total import time minus the time spent importing its own dependencies.
+    """
+
+    def __init__(self, output_path: str):
+        self.output_path = output_path
+        self.start_time = time.perf_counter()
+        self.imports: list[dict] = []
+        self.phases: list[dict] = []
+
+        self._original_import = builtins.__import__
+        self._local = threading.local()
+        self._lock = threading.Lock()
+
+    def install(self):
+        builtins.__import__ = self._timed_import
+        atexit.register(self.write)
+
+    def uninstall(self):
+        builtins.__import__ = self._original_import
+
+    def _timed_import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        module_name = name
+        if level and globals:
+            # Resolve relative imports, i.e. "from .sessions import Session"
+            package = globals.get("__package__") or ""
+            base = package.rsplit(".", level - 1)[0] if level > 1 else package
+            module_name = f"{base}.{name}" if name else base
+
+        # Already imported modules cost nothing worth recording
+        if module_name in sys.modules:
+            return self._original_import(name, globals, locals, fromlist, level)
+
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+
+        stack.append(0.0)
+        start = time.perf_counter()
+        try:
+            return self._original_import(name, globals, locals, fromlist, level)
+        finally:
+            elapsed = time.perf_counter() - start
+            children = stack.pop()
+            if stack:
+                stack[-1] += elapsed
+
+            with self._lock:
+                self.imports.append(
+                    {
+                        "module": module_name,
+                        "self_ms": round((elapsed - children) * 1000, 3),
+                        "cumulative_ms": round(elapsed * 1000, 3),
+                        "depth": len(stack),
+                    }
+                )
+
+    @contextmanager
+    def phase(self, name: str):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            end = time.perf_counter()
+            with self._lock:
+                self.phases.append(
+                    {
+                        "name": name,
+                        "start_ms": round((start - self.start_time) * 1000, 3),
+                        "duration_ms": round((end - start) * 1000, 3),
+                    }
+                )
+
+    def write(self):
+        imports = sorted(self.imports, key=lambda i: i["self_ms"], reverse=True)
+        profile = {
+            "total_ms": round((time.perf_counter() - self.start_time) * 1000, 3),
+            "import_ms": round(sum(i["self_ms"] for i in imports), 3),
+            "phases": self.phases,
+            "imports": imports,
+        }
+
+        try:
+            with open(self.output_path, "w") as f:
+                json.dump(profile, f, indent=2)
+        except OSError as e:
+            print(f"Failed to write startup profile '{self.output_path}': {e}")
+
+
+def start(output_path: str) -> StartupProfiler:
+    global _profiler
+
+    if _profiler is None:
+        _profiler = StartupProfiler(output_path)
+        _profiler.install()
+    return _profiler
+
+
+def start_from_env() -> StartupProfiler | None:
+    output_path = os.environ.get(PROFILE_ENV_VAR)
+    if not output_path:
+        return None
+    return start(output_path)
+
+
+@contextmanager
+def phase(name: str):
+    """Time a named launcher phase, this is a no-op unless profiling is enabled."""
+    if _profiler is None:
+        yield
+        return
+
+    with _profiler.phase(name):
+        yield
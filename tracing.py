@@ -0,0 +1,168 @@
+import atexit
+import functools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+
+# Set to a file path to record a trace of the launcher's phases, i.e.
+# LAUNCHER_TRACE=launcher_trace.json python app.py
+# Open the file in chrome://tracing or https://ui.perfetto.dev
+TRACE_ENV_VAR = "LAUNCHER_TRACE"
+
+_tracer: "Tracer | None" = None
+
+
+class Tracer:
+    """Records spans as Chrome trace events and writes them to a JSON file at exit.
+
+    Spans are "complete" (X) events, begin/end (B/E) pairs are used for stages that are only known from log output, i.e. PyInstaller's.
+    Every thread gets its own track named after the thread.
+    """
+
+    def __init__(self, output_path: str):
+        self.output_path = output_path
+        self.start_time = time.perf_counter()
+        self.pid = os.getpid()
+        self.events: list[dict] = []
+        self.thread_names: dict[int, str] = {}
+
+        self._lock = threading.Lock()
+
+    def install(self):
+        atexit.register(self.write)
+
+    def timestamp(self) -> float:
+        """Microseconds since the tracer started."""
+        return round((time.perf_counter() - self.start_time) * 1_000_000, 3)
+
+    def add_event(self, event: dict):
+        thread = threading.current_thread()
+        event.update(pid=self.pid, tid=thread.ident)
+        with self._lock:
+            self.thread_names.setdefault(thread.ident, thread.name)
+            self.events.append(event)
+
+    @contextmanager
+    def span(self, name: str, **args):
+        start = self.timestamp()
+        try:
+            yield
+        finally:
+            self.complete(name, start, **args)
+
+    def complete(self, name: str, start: float, **args):
+        """Record a span from `start`, a `timestamp()`, until now. For work that outlives a call, i.e. a background subprocess."""
+        event = {
+            "name": name,
+            "cat": "launcher",
+            "ph": "X",
+            "ts": start,
+            "dur": round(self.timestamp() - start, 3),
+        }
+        if args:
+            event["args"] = args
+        self.add_event(event)
+
+    def begin(self, name: str, **args):
+        self.add_event(
+            {
+                "name": name,
+                "cat": "launcher",
+                "ph": "B",
+                "ts": self.timestamp(),
+                "args": args,
+            }
+        )
+
+    def end(self):
+        self.add_event({"ph": "E", "ts": self.timestamp()})
+
+    def write(self):
+        with self._lock:
+            metadata = [
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": self.pid,
+                    "tid": tid,
+                    "args": {"name": name},
+                }
+                for tid, name in self.thread_names.items()
+            ]
+            trace = {"traceEvents": metadata + self.events, "displayTimeUnit": "ms"}
+
+        try:
+            with open(self.output_path, "w") as f:
+                json.dump(trace, f)
+        except OSError as e:
+            print(f"Failed to write trace '{self.output_path}': {e}")
+
+
+def start(output_path: str) -> Tracer:
+    global _tracer
+
+    if _tracer is None:
+        _tracer = Tracer(output_path)
+        _tracer.install()
+    return _tracer
+
+
+def start_from_env() -> Tracer | None:
+    output_path = os.environ.get(TRACE_ENV_VAR)
+    if not output_path:
+        return None
+    return start(output_path)
+
+
+def is_enabled() -> bool:
+    return _tracer is not None
+
+
+@contextmanager
+def span(name: str, **args):
+    """Trace a named span, this is a no-op unless tracing is enabled."""
+    if _tracer is None:
+        yield
+        return
+
+    with _tracer.span(name, **args):
+        yield
+
+
+def traced(name: str):
+    """Decorator tracing every call of a function as a span, with tracing disabled it costs a single check per call."""
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _tracer is None:
+                return func(*args, **kwargs)
+            with _tracer.span(name):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def timestamp() -> float | None:
+    """Start of a span recorded later with `complete`, None while tracing is disabled."""
+    return _tracer.timestamp() if _tracer is not None else None
+
+
+def complete(name: str, start: float | None, **args):
+    if _tracer is not None and start is not None:
+        _tracer.complete(name, start, **args)
+
+
+def begin(name: str, **args):
+    if _tracer is not None:
+        _tracer.begin(name, **args)
+
+
+def end():
+    if _tracer is not None:
+        _tracer.end()